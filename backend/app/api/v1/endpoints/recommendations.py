@@ -1,17 +1,35 @@
 # backend/app/api/v1/endpoints/recommendations.py
+import hmac
 import time 
-import numpy as np
-import pandas as pd
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
-from fastapi import APIRouter, HTTPException, Query, Response
-from app.services.recommender import RecommenderService
-from app.services.text_analysis import TextAnalysisService
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from app.services.registry import services
 from app.core.config import settings
+from app.core.executors import cpu_executor
+from app.core.admission import admission_controller, client_rate_limiter
+from app.core.serialization import FastJSONResponse, dumps
+from app.core.http_cache import cache_headers, etag_matches, not_modified
+from app.core.timing import span, stage_stats
 
-router = APIRouter()
-recommender_service = RecommenderService()
-text_analysis_service = TextAnalysisService()
+def require_services():
+    """503 until the app's lifespan has built the services"""
+    if not services.ready:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Service {services.state}",
+            headers={"Retry-After": "5"}
+        )
+
+def require_admin_token(x_admin_token: Optional[str] = Header(default=None)):
+    """403 unless the request carries ADMIN_TOKEN; admin endpoints are off while it is unset"""
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (ADMIN_TOKEN not set)")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token.encode(), settings.ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+router = APIRouter(dependencies=[Depends(require_services)], default_response_class=FastJSONResponse)
 
 class MoodAnalysisRequest(BaseModel):
     text: str
@@ -21,59 +39,55 @@ class MoodAnalysisRequest(BaseModel):
 # ================================================================
 
 @router.get("/moods", response_model=List[Dict[str, Any]])
-async def get_moods():
-    """Get available mood categories"""
-    return recommender_service.get_available_moods()
+async def get_moods(request: Request):
+    """Get available mood categories (ETag-cached, 304 on If-None-Match)"""
+    etag, body = services.recommender.render_moods()
+    max_age = settings.HTTP_CACHE_MOODS_MAX_AGE
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag, max_age)
+    return Response(body, media_type="application/json", headers=cache_headers(etag, max_age))
 
 @router.get("/similar/{movie_id}", response_model=List[Dict[str, Any]])
 async def get_similar_movies(movie_id: int, limit: int = 5):
     """Get similar movies for a given movie ID"""
     try:
-        similar_movies = recommender_service.get_similar_movies(movie_id, limit)
-        
-        # Convert NumPy types to Python native types
-        for movie in similar_movies:
-            for key, value in movie.items():
-                # Convert NumPy integers to Python integers
-                if isinstance(value, np.integer):
-                    movie[key] = int(value)
-                # Convert NumPy floats to Python floats
-                elif isinstance(value, np.floating):
-                    movie[key] = float(value)
-                # Ensure other types are JSON serializable
-                elif isinstance(value, (np.ndarray, pd.Series)):
-                    movie[key] = value.tolist()
-        
-        return similar_movies
+        similar_movies = await services.recommender.get_similar_movies(movie_id, limit)
+        return FastJSONResponse(similar_movies)
     except Exception as e:
         print(f"Error in similar movies endpoint: {e}")
         raise HTTPException(status_code=500, detail=f"Error getting similar movies: {str(e)}")
 
 @router.get("/movie/{movie_id}", response_model=Dict[str, Any])
-async def get_movie_details(movie_id: str):
-    """Get detailed information for a specific movie"""
+async def get_movie_details(movie_id: str, request: Request):
+    """
+    Get detailed information for a specific movie
+    
+    Versioned by catalog and TMDB cache entry: If-None-Match is answered
+    with 304 from the version alone, unchanged bodies are served pre-rendered.
+    """
     try:
         # Check if this is a TMDB ID
         if isinstance(movie_id, str) and movie_id.startswith("tmdb-"):
-            tmdb_id = int(movie_id.replace("tmdb-", ""))
-            movie_details = recommender_service.get_movie_details_by_tmdb(tmdb_id)
+            lookup = {"tmdb_id": int(movie_id.replace("tmdb-", ""))}
         else:
             # Convert to integer if it's not a TMDB ID string
-            movie_details = recommender_service.get_movie_details(int(movie_id))
+            lookup = {"movie_id": int(movie_id)}
         
-        if not movie_details:
+        max_age = settings.HTTP_CACHE_MOVIE_MAX_AGE
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            etag, fresh = services.recommender.movie_details_etag(**lookup)
+            if etag and fresh and etag_matches(if_none_match, etag):
+                return not_modified(etag, max_age)
+        
+        etag, body = await services.recommender.render_movie_details_async(**lookup)
+        
+        if body is None:
             raise HTTPException(status_code=404, detail="Movie not found")
-            
-        # Convert NumPy types to Python native types
-        for key, value in movie_details.items():
-            if isinstance(value, np.integer):
-                movie_details[key] = int(value)
-            elif isinstance(value, np.floating):
-                movie_details[key] = float(value)
-            elif isinstance(value, (np.ndarray, pd.Series)):
-                movie_details[key] = value.tolist()
-                
-        return movie_details
+        
+        if etag and etag_matches(if_none_match, etag):
+            return not_modified(etag, max_age)
+        return Response(body, media_type="application/json", headers=cache_headers(etag, max_age))
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid movie ID format")
     except Exception as e:
@@ -98,7 +112,8 @@ async def analyze_mood(request: MoodAnalysisRequest):
     
     try:
         # Analyze the text with enhanced validation
-        result = text_analysis_service.analyze_text(text)
+        with span("text_analysis"):
+            result = await services.text_analysis.analyze_text_async(text)
         
         # Handle invalid input
         if not result.get('is_valid', True):
@@ -115,7 +130,7 @@ async def analyze_mood(request: MoodAnalysisRequest):
         
         # For valid input, get mood details and return enhanced response
         mood = result['mood']
-        available_moods = recommender_service.get_available_moods()
+        available_moods = services.recommender.get_available_moods()
         mood_details = next((m for m in available_moods if m["id"] == mood), None)
         
         response = {
@@ -156,7 +171,6 @@ async def analyze_mood(request: MoodAnalysisRequest):
 @router.get("/recommendations/{mood}", response_model=List[Dict[str, Any]])
 async def get_recommendations(
     mood: str,
-    response: Response,  # ← This parameter is correct
     limit: int = Query(default=10, ge=1, le=50, description="Number of recommendations (1-50)"),
     session_id: Optional[str] = Query(default=None, description="Optional session ID for enhanced features")
 ):
@@ -164,28 +178,27 @@ async def get_recommendations(
     start_time = time.time()  # ← Now time is imported
     
     try:
-        recommendations = recommender_service.get_recommendations(mood, limit, session_id)
-        
-        # Get cache stats for headers
-        cache_stats = recommender_service.get_cache_stats()  # ← This method exists in your service
+        recommendations = await services.recommender.get_recommendations_async(mood, limit, session_id)
         
-        # Convert NumPy types to Python native types (your existing logic)
-        for movie in recommendations:
-            for key, value in movie.items():
-                if isinstance(value, np.integer):
-                    movie[key] = int(value)
-                elif isinstance(value, np.floating):
-                    movie[key] = float(value)
-                elif isinstance(value, (np.ndarray, pd.Series)):
-                    movie[key] = value.tolist()
+        response = FastJSONResponse(recommendations)
         
         # Add performance headers
         response_time = time.time() - start_time
         response.headers["X-Response-Time"] = f"{response_time:.2f}s"
-        response.headers["X-Cache-Hit-Rate"] = f"{cache_stats['hit_rate_percent']}%"
-        response.headers["X-Cache-Size"] = str(cache_stats['cached_items'])
+        response.headers["X-Cache-Hit-Rate"] = f"{services.recommender.cache_hit_rate()}%"
+        response.headers["X-Cache-Size"] = str(len(services.recommender.tmdb_cache))
+        response.headers["X-Enrichment-Pending"] = str(
+            sum(1 for movie in recommendations if movie.get("enrichment_status") == "pending")
+        )
+        
+        # "Load more" continues from here via /recommendations/{mood}/next
+        next_cursor = services.recommender.next_cursor(
+            mood, limit, [int(movie['movieId']) for movie in recommendations]
+        )
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         
-        return recommendations
+        return response
         
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -193,6 +206,87 @@ async def get_recommendations(
         print(f"Error in recommendations endpoint: {e}")
         raise HTTPException(status_code=500, detail=f"Error getting recommendations: {str(e)}")
 
+@router.get("/recommendations/{mood}/stream")
+async def stream_recommendations(
+    mood: str,
+    limit: int = Query(default=10, ge=1, le=50, description="Number of recommendations (1-50)"),
+    session_id: Optional[str] = Query(default=None, description="Optional session ID for enhanced features"),
+    format: str = Query(default="ndjson", pattern="^(ndjson|sse)$", description="ndjson or sse (Server-Sent Events)")
+):
+    """
+    Streaming variant of /recommendations/{mood}
+    
+    Emits the scored list immediately ("recommendations"), then one
+    "enrichment" event per movie as its TMDB data arrives, then "done".
+    """
+    if not services.recommender.has_mood(mood):
+        raise HTTPException(status_code=400, detail=f"Unknown mood: {mood}")
+    
+    async def events():
+        try:
+            async for event, data in services.recommender.stream_recommendations(mood, limit, session_id):
+                if format == "sse":
+                    yield b"event: " + event.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+                else:
+                    yield dumps({"event": event, "data": data}) + b"\n"
+        except Exception as e:
+            print(f"Error in recommendations stream: {e}")
+            error = {"detail": f"Error getting recommendations: {str(e)}"}
+            if format == "sse":
+                yield b"event: error\ndata: " + dumps(error) + b"\n\n"
+            else:
+                yield dumps({"event": "error", "data": error}) + b"\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream" if format == "sse" else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/recommendations/{mood}/next", response_model=Dict[str, Any])
+async def get_next_recommendations(
+    mood: str,
+    cursor: str = Query(..., description="X-Next-Cursor / next_cursor from the previous page"),
+    session_id: Optional[str] = Query(default=None, description="Optional session ID (fair TMDB scheduling)")
+):
+    """
+    Next page of recommendations ("load more")
+    
+    Pages come from the mood's cached ranking, never repeat a movie already
+    shown, and only the new movies are enriched. next_cursor is null once
+    the ranking is exhausted.
+    """
+    try:
+        movies, next_cursor = await services.recommender.get_next_recommendations_async(mood, cursor, session_id)
+        return FastJSONResponse({"movies": movies, "next_cursor": next_cursor})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"Error in next recommendations endpoint: {e}")
+        raise HTTPException(status_code=500, detail=f"Error getting recommendations: {str(e)}")
+
+@router.get("/enrichment", response_model=Dict[str, Any])
+async def get_enrichment(
+    ids: str = Query(..., description="Comma-separated tmdbIds of movies returned as pending (max 50)")
+):
+    """
+    TMDB data for movies a recommendation response marked as pending
+    
+    Poll until every movie's enrichment_status is complete or unavailable.
+    """
+    try:
+        tmdb_ids = [int(value) for value in ids.split(",") if value.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+    if not tmdb_ids or len(tmdb_ids) > 50:
+        raise HTTPException(status_code=400, detail="Provide between 1 and 50 ids")
+    
+    movies = services.recommender.get_enrichment(tmdb_ids)
+    return FastJSONResponse({
+        "movies": {str(tmdb_id): data for tmdb_id, data in movies.items()},
+        "pending": sum(1 for data in movies.values() if data["enrichment_status"] == "pending")
+    })
+
 # ================================================================
 # 🆕 ENHANCED FEATURES ENDPOINTS
 # ================================================================
@@ -209,19 +303,8 @@ async def get_original_recommendations(
     useful for A/B testing and comparison purposes.
     """
     try:
-        recommendations = recommender_service.get_original_recommendations(mood, limit)
-        
-        # Convert NumPy types to Python native types
-        for movie in recommendations:
-            for key, value in movie.items():
-                if isinstance(value, np.integer):
-                    movie[key] = int(value)
-                elif isinstance(value, np.floating):
-                    movie[key] = float(value)
-                elif isinstance(value, (np.ndarray, pd.Series)):
-                    movie[key] = value.tolist()
-        
-        return recommendations
+        recommendations = await services.recommender.get_original_recommendations_async(mood, limit)
+        return FastJSONResponse(recommendations)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -240,7 +323,7 @@ async def get_session_stats(session_id: str):
     - Session status
     """
     try:
-        stats = recommender_service.get_session_stats(session_id)
+        stats = services.recommender.get_session_stats(session_id)
         return stats
     except Exception as e:
         print(f"Error getting session stats: {e}")
@@ -284,28 +367,10 @@ async def compare_recommendation_systems(
     - Quality assurance
     """
     try:
-        # Get recommendations from both systems
-        original_recs = recommender_service.get_original_recommendations(mood, limit) 
-        
-        if session_id:
-            enhanced_recs = recommender_service.get_recommendations(mood, limit, session_id)
-        else:
-            enhanced_recs = original_recs  # Same as original if no session_id
-        
-        # Clean up NumPy types for both
-        def clean_numpy_types(movies):
-            for movie in movies:
-                for key, value in movie.items():
-                    if isinstance(value, np.integer):
-                        movie[key] = int(value)
-                    elif isinstance(value, np.floating):
-                        movie[key] = float(value)
-                    elif isinstance(value, (np.ndarray, pd.Series)):
-                        movie[key] = value.tolist()
-            return movies
-        
-        original_recs = clean_numpy_types(original_recs)
-        enhanced_recs = clean_numpy_types(enhanced_recs)
+        # Both systems select from one scored candidate pool; one shared enrichment pass
+        original_recs, enhanced_recs = await services.recommender.compare_recommendations_async(
+            mood, limit, session_id
+        )
         
         # Calculate comparison metrics
         original_titles = {movie['title'] for movie in original_recs}
@@ -314,7 +379,7 @@ async def compare_recommendation_systems(
         overlap = len(original_titles & enhanced_titles)
         overlap_percentage = (overlap / limit * 100) if limit > 0 else 0
         
-        return {
+        return FastJSONResponse({
             "mood": mood,
             "session_id": session_id,
             "original_system": {
@@ -333,7 +398,7 @@ async def compare_recommendation_systems(
                 "unique_to_enhanced": len(enhanced_titles - original_titles),
                 "variety_improvement": len(enhanced_titles - original_titles) > 0
             }
-        }
+        })
     except Exception as e:
         print(f"Error in comparison endpoint: {e}")
         raise HTTPException(status_code=500, detail=f"Error comparing systems: {str(e)}")
@@ -349,8 +414,8 @@ async def health_check():
     """
     try:
         # Check if enhanced features are available
-        enhanced_available = hasattr(recommender_service, 'enhanced_features_enabled')
-        enhanced_enabled = getattr(recommender_service, 'enhanced_features_enabled', False)
+        enhanced_available = hasattr(services.recommender, 'enhanced_features_enabled')
+        enhanced_enabled = getattr(services.recommender, 'enhanced_features_enabled', False)
         
         return {
             "status": "healthy",
@@ -381,12 +446,20 @@ async def get_performance_stats():
     Returns cache hit rates, response times, and other performance metrics
     """
     try:
-        cache_stats = recommender_service.get_cache_stats()
+        cache_stats = services.recommender.get_cache_stats()
         
         return {
             "status": "healthy",
             "performance": {
                 "cache_statistics": cache_stats,
+                "tmdb_circuit": services.recommender.get_tmdb_status(),
+                "tmdb_client": services.recommender.tmdb_client.get_stats(),
+                "cpu_executor": cpu_executor.get_stats(),
+                "admission": admission_controller.get_stats(),
+                "client_rate_limit": client_rate_limiter.get_stats(),
+                "request_stages": stage_stats.get_stats(),
+                "scoring": services.recommender.get_scoring_stats(),
+                "mood_prefetch": services.recommender.get_prefetch_stats(),
                 "features": {
                     "parallel_tmdb_calls": True,
                     "intelligent_caching": True,
@@ -394,7 +467,8 @@ async def get_performance_stats():
                 },
                 "configuration": {
                     "cache_duration_hours": settings.TMDB_CACHE_DURATION_SECONDS // 3600,
-                    "max_parallel_connections": settings.TMDB_PARALLEL_CONNECTIONS,
+                    "max_parallel_connections": settings.TMDB_CLIENT_MAX_CONNECTIONS,
+                    "enrichment_budget_ms": settings.TMDB_ENRICHMENT_BUDGET_MS,
                     "preload_size": settings.TMDB_PRELOAD_SIZE
                 }
             }
@@ -402,11 +476,30 @@ async def get_performance_stats():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting performance stats: {str(e)}")
     
+@router.post("/admin/tmdb-import", response_model=Dict[str, Any], dependencies=[Depends(require_admin_token)])
+def import_tmdb_dump():
+    """
+    Bulk-load the configured offline TMDB dump (TMDB_DUMP_PATH) into the cache
+    
+    Requires the X-Admin-Token header (ADMIN_TOKEN). Runs in the threadpool;
+    no TMDB API calls are made.
+    """
+    try:
+        return {
+            "status": "completed",
+            "import": services.recommender.import_tmdb_dump(),
+            "cache": services.recommender.get_cache_stats()
+        }
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error importing TMDB dump: {str(e)}")
+
 @router.get("/metrics", response_model=Dict[str, Any])
 async def get_detailed_metrics():
     """Get detailed system performance metrics"""
     try:
-        cache_stats = recommender_service.get_cache_stats()
+        cache_stats = services.recommender.get_cache_stats()
         return {
             "status": "healthy",
             "cache_performance": cache_stats,
@@ -427,14 +520,13 @@ async def get_detailed_metrics():
 async def detailed_health_check():
     """Detailed health check including TMDB connectivity"""
     try:
-        cache_stats = recommender_service.get_cache_stats()
+        cache_stats = services.recommender.get_cache_stats()
         
-        # Quick TMDB test (optional - might be slow)
-        # test_response = recommender_service._get_tmdb_data(550)  # Fight Club
-        # tmdb_status = "healthy" if test_response else "degraded"
+        # TMDB health comes from the circuit breaker - no test request needed
+        tmdb_circuit = services.recommender.get_tmdb_status()
         
         return {
-            "status": "healthy",
+            "status": "healthy" if tmdb_circuit["state"] == "closed" else "degraded",
             "service": "MoodBinge Recommendations",
             "cache": {
                 "status": "active",
@@ -445,8 +537,8 @@ async def detailed_health_check():
                 "parallel_processing": True,
                 "intelligent_caching": True,
                 "enhanced_recommendations": True
-            }
-            # "tmdb_api": tmdb_status  # Uncomment if you want TMDB test
+            },
+            "tmdb_api": tmdb_circuit
         }
     except Exception as e:
         return {
@@ -0,0 +1,168 @@
+# backend/app/core/admission.py
+import asyncio
+import math
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Dict, Tuple
+
+from app.core.config import settings
+from app.core.rate_limiter import TokenBucket
+
+
+class AdmissionController:
+    """
+    Caps in-flight expensive requests, with a bounded FIFO wait queue
+
+    Up to `max_in_flight` requests run at once; up to `max_queue` more wait
+    (at most `queue_timeout` seconds) for a slot. Anything beyond - or
+    expected to wait longer than that, going by recent service times - is
+    turned away immediately, so overload costs a cheap 503 instead of another
+    request competing for the CPU and TMDB connections.
+
+    Lives on the server's event loop; not thread-safe.
+    """
+
+    def __init__(self, max_in_flight: int, max_queue: int, queue_timeout: float):
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self.in_flight = 0
+        self._waiters = deque()
+        self._service_time = None  # EWMA of seconds per admitted request
+
+        # Statistics
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.max_queue_depth = 0
+
+    async def acquire(self) -> bool:
+        """Wait for a slot; False when the queue is full or the wait timed out. Pair with release()"""
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+
+        # Turn away requests that would wait longer than the timeout anyway
+        if len(self._waiters) >= self.max_queue or self._expected_wait() > self.queue_timeout:
+            self.rejected += 1
+            return False
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        self.queued += 1
+        self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+        try:
+            await asyncio.wait_for(future, self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if future.done() and not future.cancelled():
+                # Granted just before giving up - hand the slot on
+                self.release()
+            elif future in self._waiters:
+                self._waiters.remove(future)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self.timed_out += 1
+            return False
+        self.admitted += 1
+        return True
+
+    def release(self, service_time: float = None):
+        if service_time is not None:
+            self._service_time = service_time if self._service_time is None else (
+                0.8 * self._service_time + 0.2 * service_time
+            )
+
+        # The slot passes straight to the oldest live waiter
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def _expected_wait(self) -> float:
+        """Seconds a request joining the queue now would likely wait"""
+        if self._service_time is None:
+            return 0.0
+        return self._service_time * (len(self._waiters) + 1) / self.max_in_flight
+
+    def retry_after(self) -> int:
+        """Seconds a turned-away client should wait: time to drain the current queue"""
+        return max(1, math.ceil(self._expected_wait() or 1.0))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "max_queue_depth": self.max_queue_depth,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "avg_service_ms": round(self._service_time * 1000, 1) if self._service_time else 0
+        }
+
+
+class ClientRateLimiter:
+    """
+    One token bucket per client, LRU-bounded to `max_clients`
+
+    A client idle long enough to be evicted just starts again with a full
+    bucket.
+    """
+
+    def __init__(self, rate: float, burst: float, max_clients: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.allowed = 0
+        self.limited = 0
+
+    def check(self, client: str) -> Tuple[bool, int]:
+        """Take a token for client; returns (allowed, retry_after_seconds)"""
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                bucket = TokenBucket(rate=self.rate, capacity=self.burst)
+                self._buckets[client] = bucket
+                while len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(client)
+
+        if bucket.try_acquire():
+            self.allowed += 1
+            return True, 0
+        self.limited += 1
+        return False, max(1, math.ceil(bucket.time_until_available()))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "rate_per_second": self.rate,
+            "burst": self.burst,
+            "tracked_clients": len(self._buckets),
+            "allowed": self.allowed,
+            "limited": self.limited
+        }
+
+
+# Shared by the admission middleware in main.py
+admission_controller = AdmissionController(
+    max_in_flight=settings.ADMISSION_MAX_IN_FLIGHT,
+    max_queue=settings.ADMISSION_MAX_QUEUE,
+    queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS
+)
+client_rate_limiter = ClientRateLimiter(
+    rate=settings.CLIENT_RATE_LIMIT_PER_SECOND,
+    burst=settings.CLIENT_RATE_LIMIT_BURST,
+    max_clients=settings.CLIENT_RATE_LIMIT_MAX_CLIENTS
+)
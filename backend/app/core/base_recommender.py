@@ -1,14 +1,17 @@
 # backend\app\core\base_recommender.py
 import pandas as pd
 import numpy as np
-import requests
 from datetime import datetime
+import hashlib
+import os
 import time
-import random
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
 from app.core.config import settings
+from app.core.tmdb_record import split_movie_response
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.tmdb_missing import TMDBMissingIds
+from app.core.tmdb_client import TMDBClient
+from app.core.fetch_scheduler import FetchScheduler
 
 DATA_PATH = settings.DATA_PATH
 TMDB_API_KEY = settings.TMDB_API_KEY
@@ -25,39 +28,39 @@ class MoodBasedRecommender:
         self.tmdb_base_url = TMDB_BASE_URL
         self.movielens_dir = movielens_dir
         
-        # Create a session with retry capability
-        self.session = requests.Session()
-        retries = Retry(
-            total=MAX_RETRIES,
-            backoff_factor=RETRY_BACKOFF_FACTOR,
-            status_forcelist=RETRY_STATUS_FORCELIST,
-            allowed_methods=["GET"],
-            respect_retry_after_header=True
+        # Circuit breaker shared by every TMDB caller (recommender and service)
+        self.tmdb_breaker = CircuitBreaker(
+            "tmdb",
+            failure_rate_threshold=settings.TMDB_BREAKER_FAILURE_RATE,
+            slow_call_rate_threshold=settings.TMDB_BREAKER_SLOW_CALL_RATE,
+            slow_call_seconds=settings.TMDB_BREAKER_SLOW_CALL_SECONDS,
+            min_calls=settings.TMDB_BREAKER_MIN_CALLS,
+            window_seconds=settings.TMDB_BREAKER_WINDOW_SECONDS,
+            open_seconds=settings.TMDB_BREAKER_OPEN_SECONDS,
+            half_open_probes=settings.TMDB_BREAKER_HALF_OPEN_PROBES
         )
         
-        # Configure connection pooling
-        adapter = HTTPAdapter(
-            max_retries=retries,
-            pool_connections=settings.CONNECTION_POOL_SIZE,
-            pool_maxsize=settings.CONNECTION_POOL_MAXSIZE,
-            pool_block=False
-        )
-        self.session.mount('https://', adapter)
+        # Shared TMDB client - every TMDB caller (preload, refreshes, user
+        # requests) goes through its connection pool and priority scheduler
+        self.tmdb_client = TMDBClient(self.tmdb_breaker, base_url=self.tmdb_base_url, api_key=tmdb_api_key)
         
-        # Set default headers
-        self.session.headers.update({
-            'User-Agent': 'MoodBinge/1.0',
-            'Accept': 'application/json',
-            'Connection': 'keep-alive'
-        })
+        # tmdbIds TMDB answered 404 for - never fetched again until the set expires
+        self.tmdb_missing = TMDBMissingIds(
+            os.path.join(settings.TMDB_STATE_DIR, "tmdb_missing_ids.npz") if settings.TMDB_STATE_DIR else None,
+            rebuild_interval_seconds=settings.TMDB_MISSING_IDS_REBUILD_SECONDS,
+            max_age_seconds=settings.TMDB_MISSING_IDS_MAX_AGE_DAYS * 24 * 3600
+        )
         
         # Initialize data
         self.load_and_process_data()
         
     def load_and_process_data(self):
         """Load and preprocess the MovieLens datasets"""
+        self.load_timings = {}
         try:
             # Load core datasets
+            started = time.time()
+            self.catalog_version = self._catalog_version()
             self.movies = pd.read_csv(f"{self.movielens_dir}movies.csv")
             self.ratings = pd.read_csv(f"{self.movielens_dir}ratings.csv")
             self.links = pd.read_csv(f"{self.movielens_dir}links.csv")
@@ -70,9 +73,16 @@ class MoodBasedRecommender:
                 print("Tags file not found, continuing without tags")
                 self.has_tags = False
             
+            self.load_timings["csv_load"] = time.time() - started
+            
             # Process data
+            started = time.time()
             self.preprocess_data()
+            self.load_timings["preprocessing"] = time.time() - started
+            started = time.time()
             self.create_keyword_indexes()
+            self.create_id_indexes()
+            self.load_timings["indexes"] = time.time() - started
             
             print(f"Data loaded successfully: {len(self.movies)} movies")
             
@@ -80,6 +90,16 @@ class MoodBasedRecommender:
             print(f"Error loading data: {e}")
             raise
     
+    def _catalog_version(self):
+        """Short fingerprint of the MovieLens files (name, size, mtime) - changes when the catalog does"""
+        fingerprint = hashlib.sha1()
+        for name in ("movies.csv", "ratings.csv", "links.csv", "tags.csv"):
+            path = f"{self.movielens_dir}{name}"
+            if os.path.exists(path):
+                stat = os.stat(path)
+                fingerprint.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+        return fingerprint.hexdigest()[:12]
+    
     def preprocess_data(self):
         """Prepare MovieLens data for recommendations"""
         # Extract year from title
@@ -131,16 +151,29 @@ class MoodBasedRecommender:
                 
             self.mood_keyword_lookup[mood] = all_keywords
     
-    def fetch_tmdb_data(self, tmdb_id, max_retries=3):
+    def create_id_indexes(self):
+        """Map movieId and tmdbId to row positions for constant-time lookups"""
+        self.movie_index = {int(movie_id): pos for pos, movie_id in enumerate(self.movies['movieId'])}
+        self.tmdb_index = {}
+        for pos, tmdb_id in enumerate(self.movies['tmdbId']):
+            if not pd.isna(tmdb_id):
+                self.tmdb_index.setdefault(int(tmdb_id), pos)
+    
+    def store_tmdb_recommendations(self, tmdb_id, recommendations):
+        """Hook for the recommendations page appended to a movie fetch (not kept here)"""
+        pass
+    
+    def fetch_tmdb_data(self, tmdb_id, keep_raw=False, priority=FetchScheduler.INTERACTIVE):
         """
-        Fetch movie data from TMDB API with improved error handling
+        Fetch movie data from TMDB API through the shared client
         
         Parameters:
             tmdb_id (int): TMDB ID of the movie
-            max_retries (int): Maximum number of retry attempts
+            keep_raw (bool): Keep the full TMDB payload on the record
+            priority (int): FetchScheduler class of the request
             
         Returns:
-            dict: Movie data from TMDB API or None if unavailable
+            TMDBMovieRecord: Projected movie data or None if unavailable
         """
         if not self.tmdb_api_key or not tmdb_id or pd.isna(tmdb_id):
             return None
@@ -150,55 +183,27 @@ class MoodBasedRecommender:
             tmdb_id = int(tmdb_id)
         except:
             return None
-            
-        # Build request
-        movie_url = f"{self.tmdb_base_url}/movie/{tmdb_id}"
-        params = {
-            'api_key': self.tmdb_api_key,
-            'language': 'en-US',
-            'append_to_response': 'keywords'
-        }
-        
-        for attempt in range(max_retries):
-            try:
-                # Add jitter to prevent rate limiting
-                if attempt > 0:
-                    time.sleep(1 + random.random())
-                    
-                response = self.session.get(
-                    movie_url, 
-                    params=params, 
-                    timeout=settings.REQUEST_TIMEOUT
-                )
-                
-                if response.status_code == 200:
-                    return response.json()
-                elif response.status_code == 429:
-                    # Rate limited - get retry-after header if available
-                    retry_after = int(response.headers.get('Retry-After', 2))
-                    print(f"Rate limited, waiting {retry_after} seconds")
-                    time.sleep(retry_after)
-                elif response.status_code in [404, 400]:
-                    # Movie not found or bad request
-                    return None
-                else:
-                    print(f"Error: Status code {response.status_code} for movie ID {tmdb_id}")
-                    time.sleep(1)  # Add small delay for other errors
-                    
-            except requests.exceptions.ConnectionError as e:
-                wait_time = (attempt + 1) * 2
-                print(f"Connection error: {str(e)}, retrying in {wait_time} seconds (attempt {attempt + 1}/{max_retries})")
-                time.sleep(wait_time)
-                
-            except requests.exceptions.Timeout:
-                print(f"Timeout error for movie {tmdb_id}, retrying...")
-                time.sleep(1)
-                
-            except Exception as e:
-                print(f"Exception when fetching TMDB data for movie {tmdb_id}: {e}")
-                time.sleep(1)
-                
-        print(f"Failed to fetch TMDB data for movie {tmdb_id} after {max_retries} attempts")
+        
+        # Known dead id - no network call
+        if self.tmdb_missing.skip(tmdb_id):
+            return None
+        
+        # Retries, backoff, rate limiting and breaker accounting happen in the client
+        status, payload = self.tmdb_client.get_json_sync(
+            f"/movie/{tmdb_id}",
+            {'append_to_response': settings.TMDB_APPEND_TO_RESPONSE},
+            priority=priority
+        )
+        
+        if status == 200:
+            record, recommendations = split_movie_response(payload, keep_raw=keep_raw)
+            if recommendations is not None:
+                self.store_tmdb_recommendations(tmdb_id, recommendations)
+            return record
+        if status == 404:
+            self.tmdb_missing.add(tmdb_id)
+        elif status is None and not self.tmdb_breaker.is_open():
+            print(f"Failed to fetch TMDB data for movie {tmdb_id}")
         return None
     
     def get_recommendations_without_tmdb(self, mood, n=10):
@@ -386,8 +391,8 @@ class MoodBasedRecommender:
         mood_details = self.mood_mapping[mood]
         
         # 1. Runtime appropriateness
-        if 'runtime' in tmdb_data and tmdb_data['runtime']:
-            runtime = tmdb_data['runtime']
+        if tmdb_data.runtime:
+            runtime = tmdb_data.runtime
             pref = mood_details.get('runtime_preference', {})
             
             if pref:
@@ -404,9 +409,9 @@ class MoodBasedRecommender:
                     score *= 1.2
         
         # 2. Release year relevance
-        if 'release_date' in tmdb_data and tmdb_data['release_date']:
+        if tmdb_data.release_date:
             try:
-                year = int(tmdb_data['release_date'].split('-')[0])
+                year = int(tmdb_data.release_date.split('-')[0])
                 year_pref = mood_details.get('year_preference', 'not_important')
                 
                 if year_pref == 'recency_bonus':
@@ -424,8 +429,8 @@ class MoodBasedRecommender:
                 pass
         
         # 3. TMDB keywords
-        if 'keywords' in tmdb_data and 'keywords' in tmdb_data['keywords']:
-            tmdb_keywords = [kw['name'].lower() for kw in tmdb_data['keywords']['keywords']]
+        if tmdb_data.keywords:
+            tmdb_keywords = tmdb_data.keywords
             mood_keywords = self.mood_keyword_lookup[mood]
             
             # Count matches
@@ -435,9 +440,8 @@ class MoodBasedRecommender:
                 score *= min(1.5, 1 + (0.1 * matches))
         
         # 4. Overview/tagline sentiment
-        if self.sia and (('overview' in tmdb_data and tmdb_data['overview']) or 
-                        ('tagline' in tmdb_data and tmdb_data['tagline'])):
-            text = tmdb_data.get('overview', '') + ' ' + tmdb_data.get('tagline', '')
+        if self.sia and (tmdb_data.overview or tmdb_data.tagline):
+            text = (tmdb_data.overview or '') + ' ' + (tmdb_data.tagline or '')
             sentiment = self.sia.polarity_scores(text)
             
             # Get target sentiment for this mood
@@ -0,0 +1,167 @@
+# backend/app/core/circuit_breaker.py
+import threading
+import time
+from collections import deque
+from typing import Any, Dict
+
+
+class CircuitBreaker:
+    """
+    Sliding-window circuit breaker for an external dependency (TMDB)
+
+    CLOSED:    calls flow; outcomes are recorded over a time window. The
+               breaker trips when the failure rate or slow-call rate crosses
+               its threshold (once enough calls have been seen).
+    OPEN:      calls are short-circuited until the cool-down elapses.
+    HALF_OPEN: a limited number of probe calls are let through. If they all
+               succeed the breaker closes, any failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_rate_threshold: float = 0.5,
+                 slow_call_rate_threshold: float = 0.8, slow_call_seconds: float = 3.0,
+                 min_calls: int = 10, window_seconds: float = 30.0,
+                 open_seconds: float = 30.0, half_open_probes: int = 3):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._calls = deque()  # (timestamp, failed, slow)
+        self._opened_at = 0.0
+        self._half_opened_at = 0.0
+        self._probes_started = 0
+        self._probes_succeeded = 0
+
+        # Statistics
+        self.trips = 0
+        self.short_circuited = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open(time.time())
+            return self._state
+
+    def is_open(self) -> bool:
+        """True while calls should not be attempted at all (probes aside)"""
+        return self.state == self.OPEN
+
+    def allow_request(self) -> bool:
+        """Ask permission for one call; callers must record its outcome"""
+        now = time.time()
+        with self._lock:
+            self._maybe_half_open(now)
+
+            if self._state == self.CLOSED:
+                return True
+
+            if self._state == self.HALF_OPEN and self._probes_started < self.half_open_probes:
+                self._probes_started += 1
+                return True
+
+            self.short_circuited += 1
+            return False
+
+    def record_success(self, duration: float = 0.0):
+        """Record a call that got a usable answer (including 404s)"""
+        slow = duration >= self.slow_call_seconds
+        with self._lock:
+            if self._state == self.OPEN:
+                return  # Late result of a call started before the trip
+
+            if self._state == self.HALF_OPEN:
+                if slow:
+                    self._trip(time.time())
+                    return
+                self._probes_succeeded += 1
+                if self._probes_succeeded >= self.half_open_probes:
+                    self._close()
+                return
+
+            self._record(time.time(), failed=False, slow=slow)
+
+    def record_failure(self, duration: float = 0.0):
+        """Record a failed call (5xx, 429, timeout, connection error)"""
+        with self._lock:
+            now = time.time()
+            if self._state == self.OPEN:
+                return
+
+            if self._state == self.HALF_OPEN:
+                self._trip(now)
+                return
+
+            self._record(now, failed=True, slow=duration >= self.slow_call_seconds)
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            self._maybe_half_open(now)
+            self._prune(now)
+            calls = len(self._calls)
+            failures = sum(1 for _, failed, _ in self._calls if failed)
+            slow = sum(1 for _, _, is_slow in self._calls if is_slow)
+            return {
+                "name": self.name,
+                "state": self._state,
+                "window_calls": calls,
+                "window_failure_rate": round(failures / calls, 3) if calls else 0.0,
+                "window_slow_rate": round(slow / calls, 3) if calls else 0.0,
+                "trips": self.trips,
+                "short_circuited": self.short_circuited,
+                "retry_in_seconds": round(max(0.0, self._opened_at + self.open_seconds - now), 1)
+                if self._state == self.OPEN else 0.0
+            }
+
+    # Internal helpers - must be called with the lock held
+
+    def _record(self, now, failed, slow):
+        self._calls.append((now, failed, slow))
+        self._prune(now)
+
+        calls = len(self._calls)
+        if calls < self.min_calls:
+            return
+
+        failures = sum(1 for _, is_failed, _ in self._calls if is_failed)
+        slow_calls = sum(1 for _, _, is_slow in self._calls if is_slow)
+        if (failures / calls >= self.failure_rate_threshold or
+                slow_calls / calls >= self.slow_call_rate_threshold):
+            self._trip(now)
+
+    def _prune(self, now):
+        cutoff = now - self.window_seconds
+        while self._calls and self._calls[0][0] < cutoff:
+            self._calls.popleft()
+
+    def _trip(self, now):
+        if self._state != self.OPEN:
+            self.trips += 1
+            print(f"⛔ Circuit '{self.name}' opened - short-circuiting calls for {self.open_seconds}s")
+        self._state = self.OPEN
+        self._opened_at = now
+        self._calls.clear()
+
+    def _close(self):
+        print(f"✅ Circuit '{self.name}' closed - probes succeeded")
+        self._state = self.CLOSED
+        self._calls.clear()
+
+    def _maybe_half_open(self, now):
+        # Also restart probing if earlier probes never reported back
+        if ((self._state == self.OPEN and now >= self._opened_at + self.open_seconds) or
+                (self._state == self.HALF_OPEN and now >= self._half_opened_at + self.open_seconds)):
+            self._state = self.HALF_OPEN
+            self._half_opened_at = now
+            self._probes_started = 0
+            self._probes_succeeded = 0
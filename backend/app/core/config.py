@@ -13,7 +13,8 @@ class Settings:
     
     # TMDB API configuration
     TMDB_API_KEY: str = os.getenv("TMDB_API_KEY", "")
-    TMDB_BASE_URL: str = "https://api.themoviedb.org/3"
+    # Point at scripts/tmdb_standin.py (e.g. http://127.0.0.1:8765/3) for offline testing and benchmarks
+    TMDB_BASE_URL: str = os.getenv("TMDB_BASE_URL", "https://api.themoviedb.org/3")
     
     # MovieLens data directory
     DATA_PATH: str = os.getenv("DATA_PATH", "data/ml-latest-small/")
@@ -48,6 +49,11 @@ class Settings:
     # Production settings
     DEBUG: bool = os.getenv("DEBUG", "true").lower() == "true"
     
+    # Server settings (serve.py)
+    HOST: str = os.getenv("HOST", "0.0.0.0")
+    PORT: int = int(os.getenv("PORT", "8000"))
+    WORKERS: int = int(os.getenv("WORKERS", "1"))  # >1 forks workers from a master that loaded everything once
+    
     # ================================================================
     # 🆕 ENHANCED RECOMMENDATION FEATURES
     # ================================================================
@@ -84,7 +90,51 @@ class Settings:
     TMDB_CACHE_DURATION_SECONDS: int = int(os.getenv("TMDB_CACHE_DURATION_SECONDS", "7200"))  # INCREASED to 2 hours
     TMDB_CACHE_MAX_SIZE: int = int(os.getenv("TMDB_CACHE_MAX_SIZE", "10000"))        # INCREASED from 5000
     TMDB_CACHE_404_DURATION: int = int(os.getenv("TMDB_CACHE_404_DURATION", "300"))  # NEW: Cache 404s for 5 min
+    TMDB_CACHE_MAX_STALE_SECONDS: int = int(os.getenv("TMDB_CACHE_MAX_STALE_SECONDS", "604800"))  # Serve stale entries up to 7 days
+    TMDB_REFRESH_WORKERS: int = int(os.getenv("TMDB_REFRESH_WORKERS", "2"))  # Background refresh threads
+    TMDB_RECOMMENDATIONS_CACHE_SECONDS: int = int(os.getenv("TMDB_RECOMMENDATIONS_CACHE_SECONDS", "86400"))  # Similar-movie lists change slowly
+    TMDB_RECOMMENDATIONS_CACHE_MAX_SIZE: int = int(os.getenv("TMDB_RECOMMENDATIONS_CACHE_MAX_SIZE", "2000"))
+    # Sub-resources fetched with every /movie/{id} call - one round trip fills both caches
+    TMDB_APPEND_TO_RESPONSE: str = os.getenv("TMDB_APPEND_TO_RESPONSE", "keywords,recommendations")
+    
+    
+    # "Load more" pagination: scored candidate pools per mood, reused by every cursor
+    RECOMMENDATION_POOL_TTL_SECONDS: int = int(os.getenv("RECOMMENDATION_POOL_TTL_SECONDS", "300"))
+    RECOMMENDATION_CURSOR_MAX_DEPTH: int = int(os.getenv("RECOMMENDATION_CURSOR_MAX_DEPTH", "200"))  # Movies a cursor can page through
+    
+    # HTTP caching (ETag + Cache-Control) of mood list and movie details responses
+    HTTP_CACHE_MOODS_MAX_AGE: int = int(os.getenv("HTTP_CACHE_MOODS_MAX_AGE", "3600"))
+    HTTP_CACHE_MOVIE_MAX_AGE: int = int(os.getenv("HTTP_CACHE_MOVIE_MAX_AGE", "300"))
+    HTTP_RENDERED_CACHE_MAX_SIZE: int = int(os.getenv("HTTP_RENDERED_CACHE_MAX_SIZE", "5000"))  # Pre-rendered details bodies
+    
+    # Per-request enrichment deadline - movies not loaded in time are returned as pending
+    TMDB_ENRICHMENT_BUDGET_MS: int = int(os.getenv("TMDB_ENRICHMENT_BUDGET_MS", "300"))
+    
+    TMDB_STREAM_TIMEOUT_SECONDS: float = float(os.getenv("TMDB_STREAM_TIMEOUT_SECONDS", "10"))  # Streaming endpoint gives up on stragglers
+    
+    # Bounded thread pool for blocking work called from async handlers
+    CPU_EXECUTOR_WORKERS: int = int(os.getenv("CPU_EXECUTOR_WORKERS", str(min(8, (os.cpu_count() or 1) + 2))))
+    CPU_EXECUTOR_MAX_QUEUE: int = int(os.getenv("CPU_EXECUTOR_MAX_QUEUE", "64"))
     
+    # Admission control of expensive requests (recommendations, compare, analyze-mood)
+    ADMISSION_CONTROL_ENABLED: bool = os.getenv("ADMISSION_CONTROL_ENABLED", "true").lower() == "true"
+    ADMISSION_MAX_IN_FLIGHT: int = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", str(CPU_EXECUTOR_WORKERS * 2)))
+    ADMISSION_MAX_QUEUE: int = int(os.getenv("ADMISSION_MAX_QUEUE", "32"))  # Beyond this: immediate 503
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "5"))
+    
+    # Per-client token buckets for the same requests (0 disables)
+    CLIENT_RATE_LIMIT_PER_SECOND: float = float(os.getenv("CLIENT_RATE_LIMIT_PER_SECOND", "2"))
+    CLIENT_RATE_LIMIT_BURST: int = int(os.getenv("CLIENT_RATE_LIMIT_BURST", "10"))
+    CLIENT_RATE_LIMIT_MAX_CLIENTS: int = int(os.getenv("CLIENT_RATE_LIMIT_MAX_CLIENTS", "10000"))
+    RATE_LIMIT_TRUST_FORWARDED: bool = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() == "true"  # Key clients by X-Forwarded-For
+    
+    # Per-stage request timings in a Server-Timing header (stage aggregates are always kept)
+    SERVER_TIMING_ENABLED: bool = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+    
+    # Optional process pool for scoring (0 = score in threads of this process);
+    # with serve.py each server worker runs its own pool
+    SCORING_POOL_WORKERS: int = int(os.getenv("SCORING_POOL_WORKERS", "0"))
+    SCORING_POOL_SNAPSHOT_SECONDS: int = int(os.getenv("SCORING_POOL_SNAPSHOT_SECONDS", "60"))  # Hand new diversity data to the workers
     
     # Parallel processing settings
     TMDB_PARALLEL_CONNECTIONS: int = int(os.getenv("TMDB_PARALLEL_CONNECTIONS", "5"))
@@ -94,7 +144,51 @@ class Settings:
     # Preloading settings
     TMDB_PRELOAD_SIZE: int = int(os.getenv("TMDB_PRELOAD_SIZE", "2000"))   # INCREASED from 1000
     TMDB_PRELOAD_ON_STARTUP: bool = os.getenv("TMDB_PRELOAD_ON_STARTUP", "true").lower() == "true"
+    TMDB_PRELOAD_CONCURRENCY: int = int(os.getenv("TMDB_PRELOAD_CONCURRENCY", "5"))   # Parallel preload fetches
+    TMDB_PRELOAD_REQUIRED_FOR_READY: bool = os.getenv("TMDB_PRELOAD_REQUIRED_FOR_READY", "false").lower() == "true"
+    TMDB_PRELOAD_TOP_PER_MOOD: int = int(os.getenv("TMDB_PRELOAD_TOP_PER_MOOD", "200"))  # Best candidates of each mood warmed
+    
+    # Persisted TMDB state (access log, ...) - empty disables persistence
+    TMDB_STATE_DIR: str = os.getenv("TMDB_STATE_DIR", "data/state/")
+    TMDB_ACCESS_LOG_HALF_LIFE_HOURS: float = float(os.getenv("TMDB_ACCESS_LOG_HALF_LIFE_HOURS", "72"))
+    TMDB_ACCESS_LOG_SAVE_SECONDS: int = int(os.getenv("TMDB_ACCESS_LOG_SAVE_SECONDS", "300"))
+    TMDB_MISSING_IDS_REBUILD_SECONDS: int = int(os.getenv("TMDB_MISSING_IDS_REBUILD_SECONDS", "600"))  # Merge new 404s and save
+    TMDB_MISSING_IDS_MAX_AGE_DAYS: int = int(os.getenv("TMDB_MISSING_IDS_MAX_AGE_DAYS", "30"))  # Re-check known 404s after this
+
+    # Offline TMDB dump (JSONL of /movie/{id} responses, optionally .gz) imported at startup
+    TMDB_DUMP_PATH: str = os.getenv("TMDB_DUMP_PATH", "")
+    TMDB_IMPORT_BATCH_SIZE: int = int(os.getenv("TMDB_IMPORT_BATCH_SIZE", "1000"))
+    # Shared token admin endpoints (e.g. POST /admin/tmdb-import) expect in X-Admin-Token - empty disables them
+    ADMIN_TOKEN: str = os.getenv("ADMIN_TOKEN", "")
+
+    # Predictive prefetch of the next mood's TMDB data (learned from session mood transitions)
+    MOOD_PREFETCH_ENABLED: bool = os.getenv("MOOD_PREFETCH_ENABLED", "true").lower() == "true"
+    MOOD_PREFETCH_BUDGET: int = int(os.getenv("MOOD_PREFETCH_BUDGET", "150"))             # Diversity picks reach deep into the ranking
+    MOOD_PREFETCH_TOP_MOODS: int = int(os.getenv("MOOD_PREFETCH_TOP_MOODS", "2"))         # Next moods warmed per request
+    MOOD_PREFETCH_MIN_PROBABILITY: float = float(os.getenv("MOOD_PREFETCH_MIN_PROBABILITY", "0.2"))
+    MOOD_PREFETCH_CONCURRENCY: int = int(os.getenv("MOOD_PREFETCH_CONCURRENCY", "4"))
+
+    # Circuit breaker around TMDB calls
+    TMDB_BREAKER_FAILURE_RATE: float = float(os.getenv("TMDB_BREAKER_FAILURE_RATE", "0.5"))        # Trip at 50% failures
+    TMDB_BREAKER_SLOW_CALL_RATE: float = float(os.getenv("TMDB_BREAKER_SLOW_CALL_RATE", "0.8"))    # ...or 80% slow calls
+    TMDB_BREAKER_SLOW_CALL_SECONDS: float = float(os.getenv("TMDB_BREAKER_SLOW_CALL_SECONDS", "3.0"))
+    TMDB_BREAKER_MIN_CALLS: int = int(os.getenv("TMDB_BREAKER_MIN_CALLS", "10"))                   # Calls needed before tripping
+    TMDB_BREAKER_WINDOW_SECONDS: float = float(os.getenv("TMDB_BREAKER_WINDOW_SECONDS", "30"))
+    TMDB_BREAKER_OPEN_SECONDS: float = float(os.getenv("TMDB_BREAKER_OPEN_SECONDS", "30"))         # Cool-down before probing
+    TMDB_BREAKER_HALF_OPEN_PROBES: int = int(os.getenv("TMDB_BREAKER_HALF_OPEN_PROBES", "3"))
 
+    TMDB_CLIENT_MAX_CONNECTIONS: int = int(os.getenv("TMDB_CLIENT_MAX_CONNECTIONS", "10"))  # Shared async client pool
+    TMDB_RATE_LIMIT_PER_SECOND: float = float(os.getenv("TMDB_RATE_LIMIT_PER_SECOND", "40"))  # Stay under TMDB's ~50 req/s
+    TMDB_RATE_LIMIT_BURST: int = int(os.getenv("TMDB_RATE_LIMIT_BURST", "40"))
+    TMDB_RATE_LIMIT_INTERACTIVE_RESERVE: int = int(os.getenv("TMDB_RATE_LIMIT_INTERACTIVE_RESERVE", "5"))  # Tokens background fetches leave for users
+    TMDB_SCHEDULER_INTERACTIVE_RESERVED: int = int(os.getenv("TMDB_SCHEDULER_INTERACTIVE_RESERVED", "5"))  # Connections background work can't take
+    
+    # Hedged requests: duplicate a request still unanswered after the observed latency percentile
+    TMDB_HEDGE_ENABLED: bool = os.getenv("TMDB_HEDGE_ENABLED", "true").lower() == "true"
+    TMDB_HEDGE_PERCENTILE: float = float(os.getenv("TMDB_HEDGE_PERCENTILE", "95"))
+    TMDB_HEDGE_MIN_DELAY_MS: int = int(os.getenv("TMDB_HEDGE_MIN_DELAY_MS", "50"))
+    TMDB_HEDGE_MAX_DELAY_MS: int = int(os.getenv("TMDB_HEDGE_MAX_DELAY_MS", "2000"))
+    TMDB_HEDGE_MIN_SAMPLES: int = int(os.getenv("TMDB_HEDGE_MIN_SAMPLES", "20"))  # Latencies observed before hedging starts
     TMDB_KEEPALIVE_TIMEOUT: int = 30
     TMDB_ENABLE_COMPRESSION: bool = True
     TMDB_FORCE_CONNECTION_REUSE: bool = True
@@ -1,15 +1,47 @@
 #backend\app\core\enhanced_recommender.py
 from app.core.improved_recommender import ImprovedMoodRecommender
+from app.core.config import settings
+from app.core.tmdb_cache import TMDBCache
+from app.core.tmdb_record import TMDBMovieRecord
+from app.core.tmdb_access_log import TMDBAccessLog
+from app.core.fetch_scheduler import FetchScheduler
+from app.core.timing import record, span
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import os
+import threading
+import time
 import pandas as pd
 
 class EnhancedMoodRecommender(ImprovedMoodRecommender):
     """Enhanced mood-based recommender with international cinema representation"""
     
+    # Track underrepresented countries/regions for boosting
+    underrepresented_regions = {
+        "South America": ["Argentina", "Brazil", "Chile", "Colombia", "Peru", "Venezuela"],
+        "Asia": ["China", "Japan", "South Korea", "India", "Thailand", "Vietnam", "Indonesia"],
+        "Africa": ["South Africa", "Nigeria", "Kenya", "Morocco", "Egypt"],
+        "Middle East": ["Iran", "Turkey", "Israel", "Lebanon", "Saudi Arabia"],
+        "Eastern Europe": ["Russia", "Poland", "Czech Republic", "Hungary", "Romania"]
+    }
+    
     def __init__(self, mood_mapping, tmdb_api_key=None, movielens_dir="./data/ml-latest-small/"):
         super().__init__(mood_mapping, tmdb_api_key, movielens_dir)
         
-        # Cache for TMDB data to reduce API calls
-        self.tmdb_cache = {}
+        # Cache for TMDB data to reduce API calls (shared with RecommenderService)
+        self.tmdb_cache = TMDBCache(
+            ttl_seconds=settings.TMDB_CACHE_DURATION_SECONDS,
+            max_stale_seconds=settings.TMDB_CACHE_MAX_STALE_SECONDS,
+            max_size=settings.TMDB_CACHE_MAX_SIZE,
+            sizeof=TMDBMovieRecord.approx_size
+        )
+        
+        # TMDB recommendations pages, keyed by tmdbId - filled by the same
+        # /movie/{id} calls through append_to_response
+        self.similar_cache = TMDBCache(
+            ttl_seconds=settings.TMDB_RECOMMENDATIONS_CACHE_SECONDS,
+            max_stale_seconds=settings.TMDB_CACHE_MAX_STALE_SECONDS,
+            max_size=settings.TMDB_RECOMMENDATIONS_CACHE_MAX_SIZE
+        )
         
         # Track diversity data
         self.movie_studios = {}
@@ -20,119 +52,289 @@ class EnhancedMoodRecommender(ImprovedMoodRecommender):
         self.country_representation = {}
         self.language_representation = {}
         
-        # Track underrepresented countries/regions for boosting
-        self.underrepresented_regions = {
-            "South America": ["Argentina", "Brazil", "Chile", "Colombia", "Peru", "Venezuela"],
-            "Asia": ["China", "Japan", "South Korea", "India", "Thailand", "Vietnam", "Indonesia"],
-            "Africa": ["South Africa", "Nigeria", "Kenya", "Morocco", "Egypt"],
-            "Middle East": ["Iran", "Turkey", "Israel", "Lebanon", "Saudi Arabia"],
-            "Eastern Europe": ["Russia", "Poland", "Czech Republic", "Hungary", "Romania"]
+        # Lock guarding the representation counters, which preload workers update concurrently
+        self._diversity_lock = threading.Lock()
+        
+        # Persisted access statistics - drive what the preload warms first
+        self.tmdb_access_log = TMDBAccessLog(
+            os.path.join(settings.TMDB_STATE_DIR, "tmdb_access_log.json") if settings.TMDB_STATE_DIR else None,
+            half_life_seconds=settings.TMDB_ACCESS_LOG_HALF_LIFE_HOURS * 3600,
+            save_interval_seconds=settings.TMDB_ACCESS_LOG_SAVE_SECONDS
+        )
+        
+        # Scored ranking of a mood, best first - RecommenderService points this
+        # at its cached candidate pools so the preload doesn't rescore the catalog
+        self.candidate_source = self.score_candidates
+        
+        # Background preload state (see start_background_preload); the status
+        # is read by request threads while the preload updates it
+        self._preloaded_ids = []
+        self._preload_thread = None
+        self._preload_stop = threading.Event()
+        self._preload_status_lock = threading.Lock()
+        self.preload_status = {
+            "state": "idle",  # idle | running | completed | cancelled | failed | disabled
+            "target": 0,
+            "processed": 0,
+            "loaded": 0,
+            "started_at": None,
+            "finished_at": None
         }
+    
+    @classmethod
+    def for_scoring(cls, mood_mapping, movies, has_tags):
+        """
+        Scoring-only instance over an already processed catalog (see scoring_catalog)
         
-        # Load or preload TMDB data if API key provided
-        if tmdb_api_key:
-            self.preload_tmdb_data()
+        Just what score_candidates and get_recommendations read - no ratings
+        table, TMDB client, caches or state files. The diversity maps start
+        empty; scoring workers fill them from the parent's snapshots.
+        """
+        scorer = cls.__new__(cls)
+        scorer.mood_mapping = mood_mapping
+        scorer.movies = movies
+        scorer.has_tags = has_tags
+        scorer.create_keyword_indexes()
+        scorer.create_id_indexes()
+        scorer.movie_studios = {}
+        scorer.movie_countries = {}
+        scorer.movie_languages = {}
+        return scorer
+    
+    def scoring_catalog(self):
+        """The catalog columns scoring reads, picklable (movies without tags get None)"""
+        catalog = self.movies[['movieId', 'title', 'genres', 'year', 'avg_rating',
+                               'num_ratings', 'tmdbId', 'clean_tag']].copy()
+        catalog['clean_tag'] = [tags if isinstance(tags, list) else None for tags in catalog['clean_tag']]
+        return catalog
     
-    def preload_tmdb_data(self, sample_size=1000):  # CHANGED FROM 200 TO 1000
-        """Preload TMDB data for more movies"""
-        print(f"Preloading TMDB data for {sample_size} movies...")
-        
-        # Get movies with TMDB IDs
-        movies_with_tmdb = self.movies[pd.notna(self.movies['tmdbId'])]
-        
-        # Take random sample with stratification by decade (to ensure diverse temporal coverage)
-        if len(movies_with_tmdb) > sample_size:
-            # Add decade column for stratification
-            movies_with_tmdb = movies_with_tmdb.copy()
-            movies_with_tmdb.loc[:, 'decade'] = movies_with_tmdb['year'].apply(
-                lambda x: (x // 10) * 10 if pd.notna(x) else 2000
+    def start_background_preload(self, sample_size=None):
+        """
+        Start TMDB preloading in a daemon thread so startup doesn't wait on it
+        
+        Returns:
+            bool: True if a new preload was started
+        """
+        if not self.tmdb_api_key:
+            self.update_preload_status(state="disabled")
+            return False
+        
+        if self._preload_thread and self._preload_thread.is_alive():
+            return False
+        
+        self.update_preload_status(state="running")
+        self._preload_stop.clear()
+        self._preload_thread = threading.Thread(
+            target=self.preload_tmdb_data,
+            args=(sample_size,),
+            name="tmdb-preload",
+            daemon=True
+        )
+        self._preload_thread.start()
+        return True
+    
+    def stop_background_preload(self):
+        """Ask a running preload to stop; in-flight fetches finish, queued ones are dropped"""
+        self._preload_stop.set()
+    
+    def update_preload_status(self, **fields):
+        with self._preload_status_lock:
+            self.preload_status.update(fields)
+    
+    def get_preload_status(self):
+        """Get a snapshot of the background preload progress"""
+        with self._preload_status_lock:
+            status = dict(self.preload_status)
+        status["progress_percent"] = round(
+            status["processed"] / status["target"] * 100, 1
+        ) if status["target"] else 0.0
+        status["diversity_movies"] = len(self.movie_countries)
+        
+        # How many warmed entries were actually served since the preload started
+        if self._preloaded_ids and status["started_at"]:
+            accessed = sum(
+                1 for tmdb_id in self._preloaded_ids
+                if (self.tmdb_access_log.last_access(tmdb_id) or 0) >= status["started_at"]
             )
-            
-            # Stratified sample by decade with MORE movies per decade
-            sample = pd.DataFrame()
-            for decade, group in movies_with_tmdb.groupby('decade'):
-                n_samples = max(10, int((len(group) / len(movies_with_tmdb)) * sample_size))  # INCREASED FROM 5 TO 10
-                decade_sample = group.sample(n_samples) if len(group) > n_samples else group
-                sample = pd.concat([sample, decade_sample])
-            
-            # If needed, supplement with random samples to reach target size
-            if len(sample) < sample_size:
-                remaining = movies_with_tmdb[~movies_with_tmdb['movieId'].isin(sample['movieId'])]
-                additional = remaining.sample(min(sample_size - len(sample), len(remaining)))
-                sample = pd.concat([sample, additional])
-        else:
-            sample = movies_with_tmdb
-        
-        # Fetch TMDB data with progress tracking
-        processed = 0
-        for _, movie in sample.iterrows():
-            tmdb_id = int(movie['tmdbId'])
-            self._get_and_process_tmdb_data(movie['movieId'], tmdb_id)
-            processed += 1
-            
-            # Progress logging every 100 movies
-            if processed % 100 == 0:
-                print(f"Preloaded {processed}/{len(sample)} movies...")
+            status["accessed_since_preload"] = accessed
+            status["hit_rate_per_entry"] = round(accessed / len(self._preloaded_ids) * 100, 1)
+        return status
+    
+    def _select_preload_targets(self, sample_size):
+        """
+        Pick the movies most likely to be served, in priority order
+        
+        Merges, rank by rank, the most accessed movies of the persisted access
+        log and the top candidates of every mood's score ranking, so each
+        source gets its best movies warmed first. Rankings come from
+        candidate_source, shared with "load more" pages.
+        
+        Returns:
+            list of (movie_id, tmdb_id)
+        """
+        movie_ids = self.movies['movieId'].to_numpy()
+        per_source = settings.TMDB_PRELOAD_TOP_PER_MOOD
+        
+        sources = [self.tmdb_access_log.top(sample_size)]
+        for mood in self.mood_mapping:
+            if self._preload_stop.is_set():
+                break
+            sources.append([
+                int(candidate['tmdbId'])
+                for candidate in self.candidate_source(mood)[:per_source]
+                if pd.notna(candidate['tmdbId'])
+            ])
+        sources = [[tmdb_id for tmdb_id in source if tmdb_id not in self.tmdb_missing] for source in sources]
+        
+        targets = []
+        seen = set()
+        for rank in range(max(len(source) for source in sources)):
+            for source in sources:
+                if rank >= len(source) or source[rank] in seen:
+                    continue
+                tmdb_id = source[rank]
+                seen.add(tmdb_id)
+                position = self.tmdb_index.get(tmdb_id)
+                if position is not None:
+                    targets.append((int(movie_ids[position]), tmdb_id))
+                if len(targets) >= sample_size:
+                    return targets
+        return targets
+    
+    def preload_tmdb_data(self, sample_size=None, max_workers=None):
+        """
+        Preload TMDB data for the most likely served movies with bounded concurrency
+        
+        Diversity maps are updated as each movie arrives, so scoring picks up
+        new data while the preload is still running.
+        """
+        sample_size = sample_size or settings.TMDB_PRELOAD_SIZE
+        max_workers = max_workers or settings.TMDB_PRELOAD_CONCURRENCY
+        
+        # The target is an upper bound until the rankings have been merged
+        started_at = time.time()
+        self.update_preload_status(
+            state="running",
+            target=sample_size,
+            processed=0,
+            loaded=0,
+            started_at=started_at,
+            finished_at=None
+        )
+        
+        try:
+            targets = self._select_preload_targets(sample_size)
+            self._preloaded_ids = [tmdb_id for _, tmdb_id in targets]
+            self.update_preload_status(target=len(targets))
+            print(f"Preloading TMDB data for {len(targets)} movies ({max_workers} parallel fetches)...")
+            
+            # Fetch TMDB data with progress tracking
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tmdb-preload") as executor:
+                futures = [
+                    executor.submit(self._preload_movie, movie_id, tmdb_id)
+                    for movie_id, tmdb_id in targets
+                ]
+                
+                processed = loaded = 0
+                for future in as_completed(futures):
+                    if self._preload_stop.is_set():
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        break
+                    
+                    processed += 1
+                    try:
+                        if future.result():
+                            loaded += 1
+                    except Exception as e:
+                        print(f"Preload fetch failed: {e}")
+                    self.update_preload_status(processed=processed, loaded=loaded)
+                    
+                    # Progress logging every 100 movies
+                    if processed % 100 == 0:
+                        print(f"Preloaded {processed}/{len(targets)} movies...")
+        except Exception as e:
+            self.update_preload_status(state="failed", finished_at=time.time())
+            print(f"TMDB preload failed: {e}")
+            return
+        
+        finished_at = time.time()
+        self.update_preload_status(
+            state="cancelled" if self._preload_stop.is_set() else "completed",
+            finished_at=finished_at
+        )
+        self.tmdb_missing.rebuild()
         
         # Summarize what we found
-        print(f"Preloaded data for {len(self.tmdb_cache)} movies")
+        print(f"Preloaded data for {len(self.tmdb_cache)} movies in {finished_at - started_at:.1f}s")
         
         if self.movie_studios:
-            all_studios = set(sum(self.movie_studios.values(), []))
+            all_studios = set(sum(list(self.movie_studios.values()), []))
             print(f"Found {len(all_studios)} unique studios")
         
         if self.movie_countries:
-            all_countries = set(sum(self.movie_countries.values(), []))
+            all_countries = set(sum(list(self.movie_countries.values()), []))
             print(f"Found {len(all_countries)} unique countries")
             
-            # Calculate country representation
-            for movie_id, countries in self.movie_countries.items():
-                for country in countries:
-                    self.country_representation[country] = self.country_representation.get(country, 0) + 1
-            
             # Print top countries
             top_countries = sorted(self.country_representation.items(), key=lambda x: x[1], reverse=True)[:5]
             print(f"Top countries: {', '.join([f'{c[0]} ({c[1]})' for c in top_countries])}")
         
         if self.movie_languages:
-            all_languages = set(sum(self.movie_languages.values(), []))
+            all_languages = set(sum(list(self.movie_languages.values()), []))
             print(f"Found {len(all_languages)} unique languages")
             
-            # Calculate language representation
-            for movie_id, languages in self.movie_languages.items():
-                for language in languages:
-                    self.language_representation[language] = self.language_representation.get(language, 0) + 1
-            
             # Print top languages
             top_languages = sorted(self.language_representation.items(), key=lambda x: x[1], reverse=True)[:5]
             print(f"Top languages: {', '.join([f'{l[0]} ({l[1]})' for l in top_languages])}")
     
+    def _preload_movie(self, movie_id, tmdb_id):
+        """Preload worker - skips the fetch once a stop has been requested"""
+        if self._preload_stop.is_set():
+            return None
+        return self._get_and_process_tmdb_data(movie_id, tmdb_id)
+    
     def _get_and_process_tmdb_data(self, movie_id, tmdb_id):
         """Get TMDB data and extract diversity information"""
-        if tmdb_id in self.tmdb_cache:
-            return self.tmdb_cache[tmdb_id]
-            
-        data = self.fetch_tmdb_data(tmdb_id)
-        if data:
-            self.tmdb_cache[tmdb_id] = data
-            
-            # Extract studio information
-            if 'production_companies' in data:
-                studios = [company['name'] for company in data['production_companies']]
-                self.movie_studios[movie_id] = studios
-            
-            # Extract country information
-            if 'production_countries' in data:
-                countries = [country['name'] for country in data['production_countries']]
-                self.movie_countries[movie_id] = countries
-                
-            # Extract language information
-            if 'spoken_languages' in data:
-                languages = [lang['name'] for lang in data['spoken_languages']]
-                self.movie_languages[movie_id] = languages
+        data = self.tmdb_cache.get(tmdb_id)
+        if data is None:
+            data = self.fetch_tmdb_data(tmdb_id, priority=FetchScheduler.PRELOAD)
+            if data:
+                self.tmdb_cache.set(tmdb_id, data)
+        
+        if data and movie_id not in self.movie_countries:
+            self._record_diversity_data(movie_id, data)
                 
         return data
     
+    def store_tmdb_recommendations(self, tmdb_id, recommendations):
+        """Cache the recommendations page appended to a movie fetch"""
+        self.similar_cache.set(tmdb_id, recommendations)
+    
+    def _record_diversity_data(self, movie_id, record):
+        """Extract studio/country/language information from a TMDB record"""
+        self.record_diversity_batch([(movie_id, record)])
+    
+    def record_diversity_batch(self, items):
+        """
+        Extract studio/country/language information from many TMDB records
+        
+        Args:
+            items: (movie_id, record) pairs; the counters are updated under one lock
+        """
+        # Names are already interned by the record projection
+        for movie_id, record in items:
+            self.movie_studios[movie_id] = list(record.companies)
+            self.movie_countries[movie_id] = list(record.countries)
+            self.movie_languages[movie_id] = list(record.languages)
+        
+        # Keep representation counts current as data arrives
+        with self._diversity_lock:
+            for _, record in items:
+                for country in record.countries:
+                    self.country_representation[country] = self.country_representation.get(country, 0) + 1
+                for language in record.languages:
+                    self.language_representation[language] = self.language_representation.get(language, 0) + 1
+    
     def _is_from_underrepresented_region(self, movie_id):
         """Check if a movie is from an underrepresented region"""
         if movie_id not in self.movie_countries:
@@ -196,13 +398,14 @@ class EnhancedMoodRecommender(ImprovedMoodRecommender):
         
         return score
     
-    def get_recommendations(self, mood, n=10):
+    def score_candidates(self, mood):
         """
-        Get recommendations with enhanced diversity awareness
+        Score every eligible movie for a mood, best first
         """
-        if mood not in self.mood_mapping:
-            raise ValueError(f"Unknown mood: {mood}")
-            
+        with span("scoring"):
+            return self._score_candidates(mood)
+    
+    def _score_candidates(self, mood):
         # Get a larger candidate pool (3x desired recommendations)
         candidates = []
         for _, movie in self.movies.iterrows():
@@ -227,8 +430,32 @@ class EnhancedMoodRecommender(ImprovedMoodRecommender):
         
         # Sort candidates by score
         candidates.sort(key=lambda x: x['score'], reverse=True)
+        return candidates
+    
+    def get_recommendations(self, mood, n=10, exclude=None, candidates=None):
+        """
+        Get recommendations with enhanced diversity awareness
+        
+        Parameters:
+            exclude: movieIds never to recommend (e.g. already shown)
+            candidates: score_candidates(mood) result to select from instead
+                        of rescoring the catalog (left unmodified)
+        """
+        if mood not in self.mood_mapping:
+            raise ValueError(f"Unknown mood: {mood}")
+            
+        if candidates is None:
+            candidates = self.score_candidates(mood)
+        else:
+            # Selection annotates the dicts - keep the shared pool clean
+            candidates = [dict(candidate) for candidate in candidates]
+        if exclude:
+            with span("exclusion"):
+                exclude = set(exclude)
+                candidates = [c for c in candidates if c['movieId'] not in exclude]
         
         # Apply diversity-aware selection
+        selection_start = time.perf_counter()
         selected = []
         
         # Tracking dictionaries for diversity
@@ -377,6 +604,8 @@ class EnhancedMoodRecommender(ImprovedMoodRecommender):
                 for country in self.movie_countries[movie_id]:
                     countries_count[country] = countries_count.get(country, 0) + 1
         
+        record("diversity_selection", time.perf_counter() - selection_start)
+        
         # Return as DataFrame
         return pd.DataFrame(selected)
     
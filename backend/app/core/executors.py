@@ -0,0 +1,172 @@
+# backend/app/core/executors.py
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from app.core import timing
+from app.core.config import settings
+
+
+class _Waiter:
+    __slots__ = ("loop", "future", "granted")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.future = loop.create_future()
+        self.granted = False
+
+    def wake(self):
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class BoundedExecutor:
+    """
+    Thread pool for blocking/CPU-bound work called from async handlers
+
+    At most `max_workers` jobs run at once and at most `max_queue` more wait
+    in the pool's queue; further callers wait (without blocking the event
+    loop, in arrival order) for room, which gives backpressure instead of an
+    unbounded backlog.
+    Jobs run in a copy of the caller's contextvars context, so request-scoped
+    state (e.g. timing spans) follows the work into the thread.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._free_slots = max_workers + max_queue
+        self._waiters = deque()  # callers waiting for a slot, oldest first
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.queued = 0         # submitted, not started
+        self.running = 0
+        self.waiting = 0        # callers waiting for room in the queue
+        self.completed = 0
+        self.failed = 0
+        self.max_queue_depth = 0
+        self._queue_wait_total = 0.0
+        self._run_time_total = 0.0
+
+    async def _acquire_slot(self):
+        """Take a slot, or sleep until a finishing job hands one over (FIFO)"""
+        with self._lock:
+            if self._free_slots > 0 and not self._waiters:
+                self._free_slots -= 1
+                return
+            waiter = _Waiter(asyncio.get_running_loop())
+            self._waiters.append(waiter)
+            self.waiting += 1
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                granted = waiter.granted
+                if not granted:
+                    self._waiters.remove(waiter)
+            if granted:
+                # Handed a slot just as we gave up - pass it on
+                self._release_slot()
+            raise
+        finally:
+            with self._lock:
+                self.waiting -= 1
+
+    def _release_slot(self):
+        """Called from worker threads: the slot goes straight to the oldest waiter"""
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                try:
+                    waiter.loop.call_soon_threadsafe(waiter.wake)
+                except RuntimeError:
+                    # Its event loop is gone
+                    continue
+                waiter.granted = True
+                return
+            self._free_slots += 1
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run fn(*args, **kwargs) in the pool and await its result"""
+        await self._acquire_slot()
+
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, fn, *args, **kwargs)
+        submitted = time.perf_counter()
+        with self._lock:
+            self.queued += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queued)
+
+        try:
+            future = self._executor.submit(self._call, context, call, submitted)
+        except BaseException:
+            with self._lock:
+                self.queued -= 1
+            self._release_slot()
+            raise
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def _on_done(self, future):
+        # A job cancelled before it started never reaches _call
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+            self._release_slot()
+
+    def _call(self, context: contextvars.Context, call: Callable, submitted: float):
+        started = time.perf_counter()
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self._queue_wait_total += started - submitted
+        context.run(timing.record, "executor_queue", started - submitted)
+        failed = False
+        try:
+            return call()
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+                self.failed += failed
+                self._run_time_total += time.perf_counter() - started
+            self._release_slot()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            completed = self.completed
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self.queued,
+                "running": self.running,
+                "waiting_for_queue": self.waiting,
+                "max_queue_depth": self.max_queue_depth,
+                "completed": completed,
+                "failed": self.failed,
+                "avg_queue_wait_ms": round(self._queue_wait_total / completed * 1000, 1) if completed else 0,
+                "avg_run_ms": round(self._run_time_total / completed * 1000, 1) if completed else 0
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Shared pool for recommendation scoring, text analysis and other blocking work
+cpu_executor = BoundedExecutor(
+    "cpu-work",
+    max_workers=settings.CPU_EXECUTOR_WORKERS,
+    max_queue=settings.CPU_EXECUTOR_MAX_QUEUE
+)
@@ -0,0 +1,141 @@
+# backend/app/core/fetch_scheduler.py
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Hashable, Optional
+
+
+class FetchScheduler:
+    """
+    Priority-aware admission of TMDB requests
+
+    Every request holds one of `max_concurrency` slots while it is on the
+    wire. Free slots go to the most important waiting class first
+    (interactive > refresh > prefetch > preload); within a class, waiting
+    flows (e.g. sessions) are served round-robin so one burst can't starve
+    the others. Background classes may never hold more than
+    `max_concurrency - interactive_reserved` slots, so a user request always
+    finds a slot without waiting for background work to drain.
+
+    Lives on the TMDB client loop; not thread-safe.
+    """
+
+    INTERACTIVE = 0
+    REFRESH = 1
+    PREFETCH = 2
+    PRELOAD = 3
+    CLASS_NAMES = ("interactive", "refresh", "prefetch", "preload")
+
+    def __init__(self, max_concurrency: int, interactive_reserved: int = 0):
+        self.max_concurrency = max(1, max_concurrency)
+        self.background_limit = max(1, self.max_concurrency - interactive_reserved)
+
+        self._queues = [OrderedDict() for _ in self.CLASS_NAMES]  # per class: {flow: deque of futures}
+        self._active = [0] * len(self.CLASS_NAMES)
+
+        # Statistics per class
+        self._granted = [0] * len(self.CLASS_NAMES)
+        self._queued = [0] * len(self.CLASS_NAMES)
+        self._wait_total = [0.0] * len(self.CLASS_NAMES)
+        self._wait_max = [0.0] * len(self.CLASS_NAMES)
+
+    @property
+    def active(self) -> int:
+        return sum(self._active)
+
+    def _can_start(self, priority: int) -> bool:
+        if self.active >= self.max_concurrency:
+            return False
+        if priority == self.INTERACTIVE:
+            return True
+        return self.active - self._active[self.INTERACTIVE] < self.background_limit
+
+    def _has_waiters(self, up_to_priority: int) -> bool:
+        return any(self._queues[p] for p in range(up_to_priority + 1))
+
+    def _grant(self, priority: int, waited: float):
+        self._active[priority] += 1
+        self._granted[priority] += 1
+        self._wait_total[priority] += waited
+        self._wait_max[priority] = max(self._wait_max[priority], waited)
+
+    async def acquire(self, priority: int, flow: Optional[Hashable] = None):
+        """Wait for a slot; pair with release(priority)"""
+        if self._can_start(priority) and not self._has_waiters(priority):
+            self._grant(priority, 0.0)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        queue = self._queues[priority].setdefault(flow, deque())
+        queue.append((time.monotonic(), future))
+        self._queued[priority] += 1
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before the cancellation - hand the slot back
+                self.release(priority)
+            else:
+                self._discard(priority, flow, future)
+            raise
+
+    def release(self, priority: int):
+        self._active[priority] -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, priority: int, flow: Optional[Hashable] = None):
+        await self.acquire(priority, flow)
+        try:
+            yield
+        finally:
+            self.release(priority)
+
+    def _discard(self, priority: int, flow, future):
+        queue = self._queues[priority].get(flow)
+        if queue is None:
+            return
+        for item in queue:
+            if item[1] is future:
+                queue.remove(item)
+                break
+        if not queue:
+            del self._queues[priority][flow]
+
+    def _dispatch(self):
+        """Hand free slots to waiters: best class first, round-robin over its flows"""
+        for priority, flows in enumerate(self._queues):
+            while flows and self._can_start(priority):
+                flow, queue = next(iter(flows.items()))
+                enqueued_at, future = queue.popleft()
+                if queue:
+                    flows.move_to_end(flow)
+                else:
+                    del flows[flow]
+                if future.done():
+                    continue
+                self._grant(priority, time.monotonic() - enqueued_at)
+                future.set_result(None)
+            if flows:
+                # Keep lower classes waiting behind this one
+                return
+
+    def get_stats(self) -> Dict[str, Any]:
+        classes = {}
+        for priority, name in enumerate(self.CLASS_NAMES):
+            granted = self._granted[priority]
+            classes[name] = {
+                "active": self._active[priority],
+                "waiting": sum(len(queue) for queue in self._queues[priority].values()),
+                "granted": granted,
+                "queued": self._queued[priority],
+                "avg_wait_ms": round(self._wait_total[priority] / granted * 1000, 1) if granted else 0,
+                "max_wait_ms": round(self._wait_max[priority] * 1000, 1)
+            }
+        return {
+            "max_concurrency": self.max_concurrency,
+            "background_limit": self.background_limit,
+            "active": self.active,
+            "classes": classes
+        }
@@ -0,0 +1,81 @@
+# backend/app/core/http_cache.py
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+from fastapi import Response
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header covers etag (weak comparison, as for GET)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == bare:
+            return True
+    return False
+
+
+def cache_headers(etag: Optional[str], max_age: int) -> Dict[str, str]:
+    if etag is None:
+        # Not versioned yet (e.g. TMDB data still loading) - always revalidate
+        return {"Cache-Control": "no-cache"}
+    return {"ETag": etag, "Cache-Control": f"public, max-age={max_age}"}
+
+
+def not_modified(etag: str, max_age: int) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag, max_age))
+
+
+class RenderedResponseCache:
+    """
+    LRU of pre-rendered response bodies, each tagged with the ETag it was rendered for
+
+    A body is only served while the caller's current ETag still matches,
+    so a catalog or TMDB cache change re-renders it on the next request.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries = OrderedDict()  # key -> (etag, body)
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, etag: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != etag:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, etag: str, body: bytes):
+        with self._lock:
+            self._entries[key] = (etag, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": sum(len(body) for _, body in list(self._entries.values())),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate_percent": round(self.hits / total * 100, 1) if total else 0
+        }
+
+    def __len__(self):
+        return len(self._entries)
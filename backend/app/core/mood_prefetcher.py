@@ -0,0 +1,133 @@
+# backend/app/core/mood_prefetcher.py
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
+
+
+class MoodTransitionPrefetcher:
+    """
+    Predictive TMDB prefetch driven by session mood transitions
+
+    Every served request of a session records a mood -> next-mood transition.
+    After a response is served for a mood, the most likely next moods are
+    looked up and their top candidates' TMDB data is warmed in the
+    background, so the session's following request is served from cache.
+    """
+
+    def __init__(self, candidate_source: Callable[[str], List[int]],
+                 warm: Callable[[List[int]], int], budget: int = 150,
+                 top_moods: int = 2, min_probability: float = 0.2,
+                 candidate_ttl: int = 3600, max_sessions: int = 5000):
+        """
+        Args:
+            candidate_source: mood -> tmdbIds of its best candidates, best first
+            warm: Fetches the given tmdbIds into the cache (blocking), returns how many were fetched
+            budget: Max movies warmed per predicted mood
+            top_moods: Max next moods warmed after each request
+            min_probability: Ignore transitions less likely than this
+            candidate_ttl: How long a mood's candidate list is reused
+            max_sessions: Sessions whose last mood is remembered
+        """
+        self.candidate_source = candidate_source
+        self.warm = warm
+        self.budget = budget
+        self.top_moods = top_moods
+        self.min_probability = min_probability
+        self.candidate_ttl = candidate_ttl
+        self.max_sessions = max_sessions
+
+        self._lock = threading.Lock()
+        self._last_mood = OrderedDict()  # {session_id: mood}
+        self._transitions = defaultdict(lambda: defaultdict(int))  # {mood: {next_mood: count}}
+        self._candidates = {}  # {mood: (computed_at, [tmdbIds])}
+        self._pending = set()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mood-prefetch")
+
+        # Statistics
+        self.transitions_recorded = 0
+        self.prefetches = 0
+        self.movies_warmed = 0
+
+    def observe(self, session_id: str, mood: str):
+        """Record a served request and warm the session's likely next moods"""
+        with self._lock:
+            previous = self._last_mood.pop(session_id, None)
+            self._last_mood[session_id] = mood
+            while len(self._last_mood) > self.max_sessions:
+                self._last_mood.popitem(last=False)
+
+            if previous is not None:
+                self._transitions[previous][mood] += 1
+                self.transitions_recorded += 1
+
+        for next_mood, _ in self.predict(mood):
+            self._schedule(next_mood)
+
+    def predict(self, mood: str) -> List[Tuple[str, float]]:
+        """Most likely next moods after `mood`, with their probabilities"""
+        with self._lock:
+            counts = dict(self._transitions.get(mood, {}))
+
+        total = sum(counts.values())
+        if not total:
+            return []
+
+        ranked = sorted(counts.items(), key=lambda item: item[1], reverse=True)
+        return [
+            (next_mood, count / total)
+            for next_mood, count in ranked[:self.top_moods]
+            if count / total >= self.min_probability
+        ]
+
+    def _schedule(self, mood: str):
+        with self._lock:
+            if mood in self._pending:
+                return
+            self._pending.add(mood)
+        try:
+            self._executor.submit(self._prefetch, mood)
+        except RuntimeError:
+            # Executor already shut down
+            with self._lock:
+                self._pending.discard(mood)
+
+    def _prefetch(self, mood: str):
+        try:
+            tmdb_ids = self._get_candidates(mood)
+            warmed = self.warm(tmdb_ids[:self.budget])
+            self.prefetches += 1
+            self.movies_warmed += warmed
+        except Exception as e:
+            print(f"Mood prefetch failed for {mood}: {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(mood)
+
+    def _get_candidates(self, mood: str) -> List[int]:
+        cached = self._candidates.get(mood)
+        if cached and time.time() - cached[0] < self.candidate_ttl:
+            return cached[1]
+
+        tmdb_ids = self.candidate_source(mood)
+        self._candidates[mood] = (time.time(), tmdb_ids)
+        return tmdb_ids
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            transitions = {
+                mood: dict(next_moods) for mood, next_moods in self._transitions.items()
+            }
+            pending = len(self._pending)
+        return {
+            "transitions_recorded": self.transitions_recorded,
+            "transitions": transitions,
+            "tracked_sessions": len(self._last_mood),
+            "prefetches": self.prefetches,
+            "movies_warmed": self.movies_warmed,
+            "pending": pending
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,56 @@
+# backend/app/core/ranking_cursor.py
+import base64
+import hashlib
+import hmac
+import json
+import zlib
+from typing import List, Tuple
+
+from app.core.config import settings
+
+# Same bound as the endpoints' `limit` parameter
+MAX_PAGE_SIZE = 50
+
+_MAC_SIZE = 12
+
+
+def _mac(payload: bytes) -> bytes:
+    return hmac.new(settings.SECRET_KEY.encode(), payload, hashlib.sha256).digest()[:_MAC_SIZE]
+
+
+def encode_cursor(mood: str, page_size: int, shown: List[int]) -> str:
+    """
+    Opaque "load more" cursor: the mood, page size and movies already shown
+
+    The ranking itself stays server-side (the mood's cached candidate pool);
+    the cursor only carries the position in it, so any worker process can
+    serve the next page. Signed with SECRET_KEY so clients can't forge page
+    sizes or positions.
+    """
+    payload = zlib.compress(json.dumps(
+        {"m": mood, "n": page_size, "x": [int(movie_id) for movie_id in shown]},
+        separators=(",", ":")
+    ).encode())
+    return base64.urlsafe_b64encode(_mac(payload) + payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int, List[int]]:
+    """
+    Inverse of encode_cursor; raises ValueError for malformed, tampered or
+    out-of-range cursors (page size outside 1..MAX_PAGE_SIZE, nothing shown,
+    or at least RECOMMENDATION_CURSOR_MAX_DEPTH movies shown)
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        mac, payload = raw[:_MAC_SIZE], raw[_MAC_SIZE:]
+        valid = hmac.compare_digest(mac, _mac(payload))
+        if valid:
+            data = json.loads(zlib.decompress(payload))
+            mood, page_size, shown = str(data["m"]), int(data["n"]), [int(movie_id) for movie_id in data["x"]]
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not valid:
+        raise ValueError("Invalid cursor")
+    if not 1 <= page_size <= MAX_PAGE_SIZE or not 1 <= len(shown) < settings.RECOMMENDATION_CURSOR_MAX_DEPTH:
+        raise ValueError("Invalid cursor")
+    return mood, page_size, shown
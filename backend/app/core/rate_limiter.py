@@ -0,0 +1,56 @@
+# backend/app/core/rate_limiter.py
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket
+
+    Holds up to `capacity` tokens, refilled continuously at `rate` tokens per
+    second. Callers either take a token if one is available (try_acquire) or
+    wait for one (acquire, from a coroutine).
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def try_acquire(self, tokens: float = 1, reserve: float = 0) -> bool:
+        """Take tokens if available right now, leaving at least `reserve` behind"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens - tokens >= reserve:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def time_until_available(self, tokens: float = 1, reserve: float = 0) -> float:
+        """Seconds until `tokens` could be taken (0 if available now)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            missing = tokens + reserve - self._tokens
+            return max(0.0, missing / self.rate) if self.rate > 0 else float("inf")
+
+    async def acquire(self, tokens: float = 1, reserve: float = 0) -> float:
+        """Wait until tokens can be taken; returns the time spent waiting"""
+        waited = 0.0
+        while not self.try_acquire(tokens, reserve):
+            delay = max(self.time_until_available(tokens, reserve), 0.001)
+            await asyncio.sleep(delay)
+            waited += delay
+        return waited
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
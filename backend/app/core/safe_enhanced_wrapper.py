@@ -4,6 +4,7 @@ from typing import List, Dict, Optional
 from .session_manager import SessionBasedAntiRepetition
 from .smart_randomizer import SmartRandomizer
 from .mood_scorer_enhanced import EnhancedMoodScorer
+from .timing import span
 
 class SafeEnhancedWrapper:
     """
@@ -35,7 +36,8 @@ class SafeEnhancedWrapper:
     
     def get_recommendations(self, mood: str, n: int = 10, 
                           session_id: Optional[str] = None, 
-                          use_enhancements: bool = True) -> List[Dict]:
+                          use_enhancements: bool = True,
+                          candidates: Optional[List[Dict]] = None) -> List[Dict]:
         """
         Get recommendations with optional enhancements
         
@@ -44,6 +46,8 @@ class SafeEnhancedWrapper:
             n: Number of recommendations
             session_id: Optional session ID for anti-repetition
             use_enhancements: If False, uses your original system exactly
+            candidates: Optional pre-scored candidate pool (score_candidates)
+                        shared with another pipeline, so the catalog isn't rescored
         
         Returns:
             List of movie dictionaries
@@ -52,24 +56,32 @@ class SafeEnhancedWrapper:
         # FALLBACK: Use your original system if requested
         if not use_enhancements or not session_id:
             print("Using original recommendation system")
-            original_results = self.original_recommender.get_recommendations(mood, n)
+            original_results = self._original(mood, n, candidates)
             return self._convert_to_list_format(original_results)
         
         try:
             print(f"Using enhanced system for mood: {mood}, session: {session_id}")
-            return self._get_enhanced_recommendations(mood, n, session_id)
+            return self._get_enhanced_recommendations(mood, n, session_id, candidates)
             
         except Exception as e:
             print(f"Enhanced system failed, falling back to original: {e}")
             # SAFETY: Always fallback to your proven system
-            original_results = self.original_recommender.get_recommendations(mood, n)
+            original_results = self._original(mood, n, candidates)
             return self._convert_to_list_format(original_results)
     
-    def _get_enhanced_recommendations(self, mood: str, n: int, session_id: str) -> List[Dict]:
+    def _original(self, mood: str, n: int, candidates: Optional[List[Dict]] = None):
+        """Original system's picks - selected from `candidates` when given"""
+        if candidates is None:
+            return self.original_recommender.get_recommendations(mood, n)
+        return self.original_recommender.get_recommendations(mood, n, candidates=candidates)
+    
+    def _get_enhanced_recommendations(self, mood: str, n: int, session_id: str,
+                                      candidates: Optional[List[Dict]] = None) -> List[Dict]:
         """Apply all enhancements safely"""
         
         # Step 1: Get excluded movies (anti-repetition)
-        excluded_movies = self.session_manager.get_excluded_movies(session_id, mood)
+        with span("exclusion"):
+            excluded_movies = self.session_manager.get_excluded_movies(session_id, mood)
         print(f"Excluding {len(excluded_movies)} movies for anti-repetition")
         
         # Step 2: Get larger candidate pool from your original system
@@ -77,14 +89,15 @@ class SafeEnhancedWrapper:
         candidate_pool_size = min(n * 3, 50)  # Cap at 50 to avoid performance issues
         
         # Use your original system to get candidates
-        original_candidates = self.original_recommender.get_recommendations(mood, candidate_pool_size)
+        original_candidates = self._original(mood, candidate_pool_size, candidates)
         candidates = self._convert_to_list_format(original_candidates)
         
         # Step 3: Filter out excluded movies
-        available_candidates = [
-            movie for movie in candidates 
-            if movie.get('movieId') not in excluded_movies
-        ]
+        with span("exclusion"):
+            available_candidates = [
+                movie for movie in candidates 
+                if movie.get('movieId') not in excluded_movies
+            ]
         
         print(f"After exclusion: {len(available_candidates)} available candidates")
         
@@ -95,26 +108,29 @@ class SafeEnhancedWrapper:
             available_candidates = candidates[:n*2]
         
         # Step 5: Apply enhanced mood-specific scoring
-        for candidate in available_candidates:
-            original_score = candidate.get('score', 1.0)
-            enhanced_score = self.enhanced_scorer.enhance_movie_score(
-                candidate, mood, original_score
-            )
-            candidate['enhanced_score'] = enhanced_score
-        
-        # Step 6: Sort by enhanced score
-        available_candidates.sort(key=lambda x: x.get('enhanced_score', 0), reverse=True)
+        with span("enhanced_scoring"):
+            for candidate in available_candidates:
+                original_score = candidate.get('score', 1.0)
+                enhanced_score = self.enhanced_scorer.enhance_movie_score(
+                    candidate, mood, original_score
+                )
+                candidate['enhanced_score'] = enhanced_score
+            
+            # Step 6: Sort by enhanced score
+            available_candidates.sort(key=lambda x: x.get('enhanced_score', 0), reverse=True)
         
         # Step 7: Apply smart randomization
-        randomized_candidates = self.randomizer.add_smart_randomization(
-            available_candidates[:n*2], session_id, randomization_strength=0.25
-        )
-        
-        # Step 8: Sort by randomized score and apply final diversity selection
-        randomized_candidates.sort(key=lambda x: x.get('randomized_score', x.get('enhanced_score', 0)), reverse=True)
+        with span("randomization"):
+            randomized_candidates = self.randomizer.add_smart_randomization(
+                available_candidates[:n*2], session_id, randomization_strength=0.25
+            )
+            
+            # Step 8: Sort by randomized score and apply final diversity selection
+            randomized_candidates.sort(key=lambda x: x.get('randomized_score', x.get('enhanced_score', 0)), reverse=True)
         
         # Step 9: Select final recommendations with diversity
-        final_recommendations = self._select_diverse_final(randomized_candidates, n)
+        with span("diversity_selection"):
+            final_recommendations = self._select_diverse_final(randomized_candidates, n)
         
         # Step 10: Record recommendations to prevent future repetition
         movie_ids = [rec['movieId'] for rec in final_recommendations]
@@ -181,10 +197,10 @@ class SafeEnhancedWrapper:
     
     def get_session_stats(self, session_id: str) -> Dict:
         """Get statistics about a session"""
-        if session_id not in self.session_manager.movie_history:
+        session_data = self.session_manager.get_session(session_id)
+        if session_data is None:
             return {"session_found": False}
         
-        session_data = self.session_manager.movie_history[session_id]
         return {
             "session_found": True,
             "moods_requested": list(session_data['moods'].keys()),
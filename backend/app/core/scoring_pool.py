@@ -0,0 +1,279 @@
+# backend/app/core/scoring_pool.py
+import multiprocessing
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.core.timing import span
+
+# Worker-process state: the scoring-only recommender (built by _init_worker
+# from the parent's shared catalog) and the diversity snapshot it last applied
+_worker_recommender = None
+_worker_snapshot = None
+
+
+def _init_worker(recommender_cls, mood_mapping, catalog_name: str, catalog_size: int):
+    global _worker_recommender
+    np.random.seed()
+    block = shared_memory.SharedMemory(name=catalog_name)
+    try:
+        data = block.buf[:catalog_size]
+        try:
+            movies, has_tags = pickle.loads(data)
+        finally:
+            data.release()
+    finally:
+        block.close()
+    _worker_recommender = recommender_cls.for_scoring(mood_mapping, movies, has_tags)
+
+
+def _apply_snapshot(path: Optional[str]):
+    """Load the parent's diversity maps if they changed since the last job"""
+    global _worker_snapshot
+    if path is None or path == _worker_snapshot:
+        return
+    try:
+        with open(path, "rb") as f:
+            studios, countries, languages = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        # Superseded and removed already - the next job names a newer one
+        return
+    _worker_recommender.movie_studios = studios
+    _worker_recommender.movie_countries = countries
+    _worker_recommender.movie_languages = languages
+    _worker_snapshot = path
+
+
+def _score_job(mood: str, n: int, exclude: Tuple[int, ...],
+               snapshot: Optional[str]) -> List[Tuple[int, float, Optional[float]]]:
+    """Worker side: run the recommender, return compact (movieId, score, diversity_score) rows"""
+    _apply_snapshot(snapshot)
+    selected = _worker_recommender.get_recommendations(mood, n, exclude=exclude)
+    return [
+        (int(movie['movieId']), float(movie['score']),
+         float(movie['diversity_score']) if pd.notna(movie.get('diversity_score')) else None)
+        for movie in selected.to_dict('records')
+    ]
+
+
+def _candidates_job(mood: str, snapshot: Optional[str]) -> List[Tuple[int, float, None]]:
+    """Worker side: score the whole catalog for a mood, best first, as compact rows"""
+    _apply_snapshot(snapshot)
+    return [
+        (int(movie['movieId']), float(movie['score']), None)
+        for movie in _worker_recommender.score_candidates(mood)
+    ]
+
+
+class ScoringPool:
+    """
+    Process-pool backend for recommendation scoring
+
+    Scoring and diversity selection are pure Python and hold the GIL, so
+    threads can't spread them over cores. Workers come from a forkserver -
+    a clean single-threaded process - rather than forking this one, which by
+    then runs the TMDB client loop and executor threads whose locks a child
+    could inherit held. The parent puts the processed catalog (just the
+    columns scoring reads) in a shared-memory block once, and each worker
+    builds a scoring-only recommender from it - no CSV parsing, ratings
+    table, TMDB client or state files per worker. Jobs send (mood, n,
+    exclusions) and receive compact rows the parent expands from its own
+    catalog. Quacks like the recommender's
+    get_recommendations and score_candidates, so it can stand in for it
+    (e.g. under SafeEnhancedWrapper).
+
+    The studio/country/language maps grow as TMDB data arrives. The parent
+    writes them to a snapshot file at most every `snapshot_interval`
+    seconds and names the current one in every job; workers reload it when
+    it changes. The pool itself is never re-created while running.
+    """
+
+    def __init__(self, recommender, workers: int, snapshot_interval: float = 60):
+        self.recommender = recommender
+        self.workers = workers
+        self.snapshot_interval = snapshot_interval
+        self.mood_mapping = recommender.mood_mapping
+
+        self._context = multiprocessing.get_context("forkserver")
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+        self._catalog = None  # (SharedMemory, size) of the pickled scoring catalog
+        self._snapshot_dir = None
+        self._snapshots = []  # newest last; the previous one is kept for jobs in flight
+        self._snapshot_at = 0.0
+        self._snapshot_size = 0
+
+        # Statistics
+        self.jobs = 0
+        self.snapshots = 0
+        self.failures = 0
+        self._job_time_total = 0.0
+
+    @staticmethod
+    def available() -> bool:
+        """Workers are started through a forkserver (POSIX only)"""
+        return "forkserver" in multiprocessing.get_all_start_methods()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                if self._pid != os.getpid():
+                    # (A pool and catalog inherited through serve.py's fork belong to the master - share our own)
+                    self._catalog = None
+                block, size = self._share_catalog()
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=self._context,
+                    initializer=_init_worker,
+                    initargs=(type(self.recommender), self.mood_mapping, block.name, size)
+                )
+                self._pid = os.getpid()
+            return self._executor
+
+    def _share_catalog(self) -> Tuple[shared_memory.SharedMemory, int]:
+        """The shared-memory catalog workers initialize from, written on first use; caller holds _lock"""
+        if self._catalog is None:
+            data = pickle.dumps((self.recommender.scoring_catalog(), self.recommender.has_tags),
+                                protocol=pickle.HIGHEST_PROTOCOL)
+            block = shared_memory.SharedMemory(create=True, size=len(data))
+            block.buf[:len(data)] = data
+            self._catalog = (block, len(data))
+        return self._catalog
+
+    def _current_snapshot(self) -> Optional[str]:
+        """Path of the newest diversity snapshot, writing a new one if the maps grew"""
+        with self._lock:
+            size = len(self.recommender.movie_countries)
+            due = (
+                size != self._snapshot_size
+                and time.time() - self._snapshot_at >= self.snapshot_interval
+            )
+            if due or (size and not self._snapshots):
+                self._write_snapshot()
+                self._snapshot_size = size
+                self._snapshot_at = time.time()
+            return self._snapshots[-1] if self._snapshots else None
+
+    def _write_snapshot(self):
+        """Caller holds _lock"""
+        recommender = self.recommender
+        maps = (dict(recommender.movie_studios), dict(recommender.movie_countries), dict(recommender.movie_languages))
+        if self._snapshot_dir is None:
+            self._snapshot_dir = tempfile.mkdtemp(prefix="moodbinge-scoring-")
+        fd, path = tempfile.mkstemp(dir=self._snapshot_dir, suffix=".pkl")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(maps, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self._snapshots.append(path)
+        self.snapshots += 1
+        while len(self._snapshots) > 2:
+            try:
+                os.remove(self._snapshots.pop(0))
+            except OSError:
+                pass
+
+    def get_recommendations(self, mood: str, n: int = 10, exclude: Optional[Iterable[int]] = None,
+                            candidates: Optional[List[Dict]] = None) -> pd.DataFrame:
+        """
+        Blocking: score in a worker process, return the recommender's DataFrame shape
+
+        Given an already scored `candidates` pool, only the (cheap) selection
+        is left, and it runs in-process.
+        """
+        if mood not in self.mood_mapping:
+            raise ValueError(f"Unknown mood: {mood}")
+        if candidates is not None:
+            return self.recommender.get_recommendations(mood, n, exclude=exclude, candidates=candidates)
+
+        # Scoring and selection both happen in the worker
+        rows = self._run(_score_job, (mood, n, tuple(exclude or ())))
+        if rows is None:
+            return self.recommender.get_recommendations(mood, n, exclude=exclude)
+        return pd.DataFrame(self._expand(rows))
+
+    def score_candidates(self, mood: str) -> List[Dict]:
+        """Blocking: the recommender's score_candidates, computed in a worker process"""
+        if mood not in self.mood_mapping:
+            raise ValueError(f"Unknown mood: {mood}")
+        rows = self._run(_candidates_job, (mood,))
+        if rows is None:
+            return self.recommender.score_candidates(mood)
+        return self._expand(rows)
+
+    def _run(self, job, args: tuple):
+        """Run a job with the current snapshot; None if the pool failed (the caller scores in-process)"""
+        started = time.time()
+        try:
+            snapshot = self._current_snapshot()
+            with span("scoring"):
+                return self._get_executor().submit(job, *args, snapshot).result()
+        except Exception as e:
+            # Broken pool (e.g. a worker was killed) - score in-process and re-fork next time
+            self.failures += 1
+            print(f"Scoring pool failed, scoring in-process: {e}")
+            with self._lock:
+                # Broken pools stay broken - start a fresh one next time
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False, cancel_futures=True)
+                    self._executor = None
+            return None
+        finally:
+            self.jobs += 1
+            self._job_time_total += time.time() - started
+
+    def _expand(self, rows: List[Tuple[int, float, Optional[float]]]) -> List[Dict]:
+        """Rebuild candidate dicts from compact rows using the parent's catalog"""
+        movies = self.recommender.movies
+        movie_index = self.recommender.movie_index
+        selected = []
+        for movie_id, score, diversity_score in rows:
+            row = movies.iloc[movie_index[movie_id]]
+            movie = {
+                'movieId': movie_id,
+                'title': row['title'],
+                'genres': row['genres'],
+                'year': row.get('year'),
+                'rating': row['avg_rating'],
+                'popularity': row['num_ratings'],
+                'score': score,
+                'tmdbId': row.get('tmdbId')
+            }
+            if diversity_score is not None:
+                movie['diversity_score'] = diversity_score
+            selected.append(movie)
+        return selected
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "running": self._executor is not None,
+            "jobs": self.jobs,
+            "failures": self.failures,
+            "diversity_snapshots": self.snapshots,
+            "avg_job_ms": round(self._job_time_total / self.jobs * 1000, 1) if self.jobs else 0
+        }
+
+    def shutdown(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False, cancel_futures=True)
+                if self._catalog is not None:
+                    block, _ = self._catalog
+                    block.close()
+                    block.unlink()
+            self._executor = None
+            self._catalog = None
+            if self._snapshot_dir is not None:
+                shutil.rmtree(self._snapshot_dir, ignore_errors=True)
+                self._snapshot_dir = None
+                self._snapshots = []
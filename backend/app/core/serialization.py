@@ -0,0 +1,70 @@
+# backend/app/core/serialization.py
+import json
+import math
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from fastapi.responses import JSONResponse
+
+from app.core.timing import span
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _default(value):
+    """Values the encoder doesn't know natively - NumPy/pandas leftovers in movie dicts"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (np.ndarray, pd.Series, pd.Index)):
+        return value.tolist()
+    if value is pd.NA or value is pd.NaT:
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
+
+
+def _finite(value: Any) -> Any:
+    """Stdlib fallback pre-pass: NaN/inf aren't JSON - missing values become null, like orjson"""
+    if isinstance(value, float):
+        return None if math.isnan(value) or math.isinf(value) else value
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    return value
+
+
+def _fallback_default(value):
+    return _finite(_default(value))
+
+
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=_fallback_default)
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize API content to JSON bytes in one pass (NaN -> null, NumPy/pandas -> native)"""
+    with span("serialization"):
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(content, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        return _encoder.encode(_finite(content)).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered straight from the handler's content
+
+    Returned directly by movie endpoints, which skips FastAPI's response
+    model validation and jsonable_encoder walk; NumPy values need no
+    per-key conversion first. Uses orjson when installed.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
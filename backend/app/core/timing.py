@@ -0,0 +1,122 @@
+# backend/app/core/timing.py
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+# Timings of the request being handled; None outside requests (background
+# refreshes, prefetch, scripts), where spans cost one lookup and record nothing
+_current: ContextVar[Optional["RequestTimings"]] = ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    """
+    Per-stage durations for one request
+
+    Shared by every task and executor thread working on the request (they
+    see it through the copied contextvars context). Durations of the same
+    stage add up, including ones that ran in parallel.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._spans: List[Tuple[str, float]] = []  # list.append is atomic - no lock
+
+    def record(self, stage: str, seconds: float):
+        self._spans.append((stage, seconds))
+
+    def stages(self) -> Dict[str, float]:
+        """Stage -> total seconds, in first-recorded order"""
+        totals = {}
+        for stage, seconds in list(self._spans):
+            totals[stage] = totals.get(stage, 0.0) + seconds
+        return totals
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        """Server-Timing header value, e.g. `scoring;dur=412.3, tmdb_network;dur=80.1, total;dur=501.9`"""
+        entries = [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in self.stages().items()]
+        entries.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ", ".join(entries)
+
+
+def start_request() -> Tuple[RequestTimings, Any]:
+    """Begin timing a request; pass the token to finish_request"""
+    timings = RequestTimings()
+    return timings, _current.set(timings)
+
+
+def finish_request(timings: RequestTimings, token):
+    _current.reset(token)
+    stage_stats.add(timings)
+
+
+def current() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+def record(stage: str, seconds: float):
+    """Add a duration measured elsewhere to the current request's stage"""
+    timings = _current.get()
+    if timings is not None:
+        timings.record(stage, seconds)
+
+
+@contextmanager
+def span(stage: str):
+    """Time the enclosed block as `stage` of the current request"""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.record(stage, time.perf_counter() - started)
+
+
+class StageStats:
+    """Per-stage aggregates across requests: how often a stage ran and what it cost per request"""
+
+    def __init__(self):
+        self._stages = {}  # stage -> [requests, total seconds, max seconds]
+        self._lock = threading.Lock()
+        self.requests = 0
+        self._total_time = 0.0
+
+    def add(self, timings: RequestTimings):
+        stages = timings.stages()
+        elapsed = timings.elapsed()
+        with self._lock:
+            self.requests += 1
+            self._total_time += elapsed
+            for stage, seconds in stages.items():
+                entry = self._stages.setdefault(stage, [0, 0.0, 0.0])
+                entry[0] += 1
+                entry[1] += seconds
+                entry[2] = max(entry[2], seconds)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "avg_total_ms": round(self._total_time / self.requests * 1000, 1) if self.requests else 0,
+                "stages": {
+                    stage: {
+                        "requests": count,
+                        "avg_ms": round(total / count * 1000, 2),
+                        "max_ms": round(peak * 1000, 2),
+                        "total_ms": round(total * 1000, 1)
+                    }
+                    for stage, (count, total, peak) in sorted(
+                        self._stages.items(), key=lambda item: item[1][1], reverse=True
+                    )
+                }
+            }
+
+
+stage_stats = StageStats()
@@ -0,0 +1,115 @@
+# backend/app/core/tmdb_access_log.py
+import json
+import math
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+class TMDBAccessLog:
+    """
+    Decayed access counts per tmdbId, persisted across restarts
+
+    Every served lookup bumps the movie's score; scores halve every
+    `half_life_seconds`, so the ranking reflects recent demand. The preloader
+    warms the top of this ranking first after a restart.
+    """
+
+    def __init__(self, path: Optional[str], half_life_seconds: float = 3 * 24 * 3600,
+                 max_entries: int = 20000, save_interval_seconds: float = 300):
+        self.path = path
+        self.half_life_seconds = half_life_seconds
+        self.max_entries = max_entries
+        self.save_interval_seconds = save_interval_seconds
+
+        self._entries = {}  # {tmdb_id: [score, last_access]}
+        self._lock = threading.Lock()
+        self._last_saved = time.time()
+        self._dirty = False
+
+        self.load()
+
+    def _decayed(self, score, last_access, now):
+        return score * math.pow(0.5, (now - last_access) / self.half_life_seconds)
+
+    def record(self, tmdb_id: int):
+        """Count one access"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(tmdb_id)
+            if entry is None:
+                self._entries[tmdb_id] = [1.0, now]
+            else:
+                entry[0] = self._decayed(entry[0], entry[1], now) + 1.0
+                entry[1] = now
+            self._dirty = True
+
+    def due_for_save(self) -> bool:
+        return self._dirty and time.time() - self._last_saved >= self.save_interval_seconds
+
+    def top(self, n: int) -> List[int]:
+        """The n most accessed tmdbIds (decayed), most accessed first"""
+        now = time.time()
+        with self._lock:
+            ranked = sorted(
+                self._entries.items(),
+                key=lambda item: self._decayed(item[1][0], item[1][1], now),
+                reverse=True
+            )
+        return [tmdb_id for tmdb_id, _ in ranked[:n]]
+
+    def last_access(self, tmdb_id: int) -> Optional[float]:
+        entry = self._entries.get(tmdb_id)
+        return entry[1] if entry else None
+
+    def load(self):
+        """Read the persisted log, if any"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            with self._lock:
+                self._entries = {
+                    int(tmdb_id): [float(score), float(last_access)]
+                    for tmdb_id, (score, last_access) in data.get("entries", {}).items()
+                }
+            print(f"📒 Loaded TMDB access log with {len(self._entries)} movies")
+        except Exception as e:
+            print(f"Could not load TMDB access log {self.path}: {e}")
+
+    def save(self):
+        """Persist the log atomically, dropping the least accessed entries beyond max_entries"""
+        if not self.path:
+            return
+        now = time.time()
+        with self._lock:
+            ranked = sorted(
+                self._entries.items(),
+                key=lambda item: self._decayed(item[1][0], item[1][1], now),
+                reverse=True
+            )[:self.max_entries]
+            self._entries = dict(ranked)
+            snapshot = {str(tmdb_id): [round(score, 4), last_access] for tmdb_id, (score, last_access) in ranked}
+            self._dirty = False
+            self._last_saved = now
+
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"saved_at": now, "entries": snapshot}, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Could not save TMDB access log {self.path}: {e}")
+
+    def get_stats(self) -> Dict:
+        return {
+            "tracked_movies": len(self._entries),
+            "path": self.path,
+            "last_saved": self._last_saved
+        }
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,183 @@
+# backend/app/core/tmdb_cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+
+class _CacheEntry:
+    __slots__ = ("value", "fetched_at", "expires_at", "stale_until", "size")
+
+    def __init__(self, value, fetched_at, expires_at, stale_until, size=0):
+        self.value = value
+        self.fetched_at = fetched_at
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+        self.size = size
+
+
+class TMDBCache:
+    """
+    Thread-safe LRU cache for TMDB records with stale-while-revalidate semantics
+
+    Entries are FRESH until their TTL expires, then STALE until the hard
+    max-staleness bound. Stale entries are still served so callers can
+    refresh them in the background; past the bound they count as a MISS
+    and a blocking fetch is required.
+
+    With a `sizeof` function, the bytes held are tracked as entries come and
+    go, so size_bytes is O(1).
+    """
+
+    FRESH = "fresh"
+    STALE = "stale"
+    MISS = "miss"
+
+    def __init__(self, ttl_seconds: int, max_stale_seconds: int, max_size: int,
+                 sizeof: Optional[Callable[[Any], int]] = None):
+        self.ttl_seconds = ttl_seconds
+        self.max_stale_seconds = max_stale_seconds
+        self.max_size = max_size
+        self._sizeof = sizeof
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.size_bytes = 0
+
+    def _entry(self, value, fetched_at, expires_at, stale_until) -> _CacheEntry:
+        size = self._sizeof(value) if self._sizeof is not None and value is not None else 0
+        return _CacheEntry(value, fetched_at, expires_at, stale_until, size)
+
+    def _store(self, key, entry: _CacheEntry):
+        """Caller holds _lock"""
+        old = self._entries.get(key)
+        if old is not None:
+            self.size_bytes -= old.size
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self.size_bytes += entry.size
+
+    def _remove(self, key):
+        """Caller holds _lock"""
+        self.size_bytes -= self._entries.pop(key).size
+
+    def _evict(self):
+        """Drop least recently used entries beyond the size limit; caller holds _lock"""
+        while len(self._entries) > self.max_size:
+            self.size_bytes -= self._entries.popitem(last=False)[1].size
+
+    def lookup(self, key) -> Tuple[Any, str]:
+        """
+        Look up a key
+
+        Returns:
+            (value, state) where state is FRESH, STALE or MISS
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, self.MISS
+
+            if now >= entry.stale_until:
+                self._remove(key)
+                return None, self.MISS
+
+            self._entries.move_to_end(key)
+            state = self.FRESH if now < entry.expires_at else self.STALE
+            return entry.value, state
+
+    def get(self, key, default=None):
+        """Get a fresh or stale value without recording an access"""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or time.time() >= entry.stale_until:
+            return default
+        return entry.value
+
+    def version(self, key) -> Tuple[Optional[float], str]:
+        """
+        Version of a key's entry, without recording an access
+
+        Returns:
+            (stored_at, state) - stored_at changes whenever the entry is
+            replaced and is None on a MISS
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or now >= entry.stale_until:
+            return None, self.MISS
+        return entry.fetched_at, self.FRESH if now < entry.expires_at else self.STALE
+
+    def set(self, key, value, ttl: Optional[int] = None, max_stale: Optional[int] = None):
+        """
+        Store a value
+
+        Args:
+            ttl: Freshness lifetime (defaults to the cache TTL)
+            max_stale: Hard bound on total age; defaults to the cache bound,
+                       or to the TTL for negative (None) entries
+        """
+        now = time.time()
+        ttl = self.ttl_seconds if ttl is None else ttl
+        if max_stale is None:
+            max_stale = ttl if value is None else max(ttl, self.max_stale_seconds)
+
+        entry = self._entry(value, now, now + ttl, now + max_stale)
+        with self._lock:
+            self._store(key, entry)
+            self._evict()
+
+    def set_many(self, items, ttl: Optional[int] = None) -> int:
+        """
+        Store many (key, value) pairs under a single lock acquisition
+
+        Used for bulk imports so readers are blocked once per batch rather
+        than once per record. Returns the number of entries stored.
+        """
+        now = time.time()
+        ttl = self.ttl_seconds if ttl is None else ttl
+        expires_at = now + ttl
+        stale_until = now + max(ttl, self.max_stale_seconds)
+        stored = 0
+
+        entries = [(key, self._entry(value, now, expires_at, stale_until)) for key, value in items]
+        with self._lock:
+            for key, entry in entries:
+                self._store(key, entry)
+                stored += 1
+            self._evict()
+        return stored
+
+    def extend(self, key, seconds: int):
+        """Push back the freshness deadline of an entry (e.g. after a failed refresh)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.expires_at = min(time.time() + seconds, entry.stale_until)
+
+    def cleanup(self) -> int:
+        """Drop entries past their max-staleness bound, returning how many were removed"""
+        now = time.time()
+        with self._lock:
+            expired = [key for key, entry in self._entries.items() if now >= entry.stale_until]
+            for key in expired:
+                self._remove(key)
+        return len(expired)
+
+    def values(self):
+        """Snapshot of cached values (including negative entries)"""
+        with self._lock:
+            return [entry.value for entry in self._entries.values()]
+
+    def stale_count(self) -> int:
+        """Number of entries currently past their TTL"""
+        now = time.time()
+        with self._lock:
+            return sum(1 for entry in self._entries.values() if now >= entry.expires_at)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        return len(self._entries)
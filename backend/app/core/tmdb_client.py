@@ -0,0 +1,322 @@
+# backend/app/core/tmdb_client.py
+import asyncio
+import concurrent.futures
+import os
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional, Tuple
+
+import aiohttp
+
+from app.core.config import settings
+from app.core.fetch_scheduler import FetchScheduler
+from app.core.rate_limiter import TokenBucket
+
+
+def _retry_after_seconds(value: Optional[str], default: float = 2.0) -> float:
+    """
+    Seconds to wait per a Retry-After header - delta-seconds or an HTTP-date
+
+    Missing or unparseable values give `default`.
+    """
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+class TMDBClient:
+    """
+    Shared non-blocking TMDB client
+
+    A single aiohttp session lives on a dedicated event-loop thread, so its
+    connection pool is reused by every caller: coroutines running on any
+    loop await `get_json`, plain threads call `get_json_sync`. Retries back
+    off with asyncio.sleep (never blocking a caller's loop) and every attempt
+    is reported to the circuit breaker. Requests are admitted by priority
+    (see FetchScheduler), paced by a token bucket, and slow ones can be
+    hedged (see _hedged_send).
+    """
+
+    def __init__(self, breaker, base_url: str = None, api_key: str = None,
+                 timeout: float = None, max_connections: int = None, max_retries: int = 3):
+        self.breaker = breaker
+        self.base_url = base_url or settings.TMDB_BASE_URL
+        self.api_key = api_key if api_key is not None else settings.TMDB_API_KEY
+        self.timeout = timeout or settings.REQUEST_TIMEOUT
+        self.max_connections = max_connections or settings.TMDB_CLIENT_MAX_CONNECTIONS
+        self.max_retries = max_retries
+
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._session = None
+        self._pid = None
+
+        # Shared request budget; hedges draw from it too
+        self.limiter = TokenBucket(
+            rate=settings.TMDB_RATE_LIMIT_PER_SECOND,
+            capacity=settings.TMDB_RATE_LIMIT_BURST
+        )
+        
+        # Connection slots, handed out interactive-first
+        self.scheduler = FetchScheduler(
+            self.max_connections,
+            interactive_reserved=settings.TMDB_SCHEDULER_INTERACTIVE_RESERVED
+        )
+
+        # Recent latencies of answered requests, for the adaptive hedge delay
+        self._latencies = deque(maxlen=200)
+        self._latency_samples = 0
+        self._hedge_delay_cache = None
+
+        # Statistics
+        self.requests = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    # Loop management
+
+    def _ensure_started(self):
+        """Start the client loop thread on first use (and again after a fork)"""
+        with self._lock:
+            if self._loop is not None and self._pid == os.getpid():
+                return self._loop
+
+            # A forked child inherits the attributes but not the thread
+            self._pid = os.getpid()
+            self._session = None
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self._loop.run_forever,
+                name="tmdb-client",
+                daemon=True
+            )
+            self._thread.start()
+            return self._loop
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                ttl_dns_cache=600,
+                keepalive_timeout=settings.TMDB_KEEPALIVE_TIMEOUT
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={
+                    'User-Agent': 'MoodBinge/1.0',
+                    'Accept': 'application/json'
+                }
+            )
+        return self._session
+
+    def close(self):
+        """Close the HTTP session and stop the loop thread"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or self._pid != os.getpid():
+            return
+
+        async def _shutdown():
+            # Background fetches still in flight are abandoned
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if self._session is not None:
+                await self._session.close()
+                self._session = None
+
+        try:
+            asyncio.run_coroutine_threadsafe(_shutdown(), loop).result(timeout=5)
+        except Exception as e:
+            print(f"Error closing TMDB client session: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        if not thread.is_alive():
+            loop.close()
+
+    # Requests
+
+    async def _request(self, path: str, params: Optional[Dict[str, Any]],
+                       priority: int, flow) -> Tuple[Optional[int], Any]:
+        """Runs on the client loop; see get_json"""
+        url = f"{self.base_url}{path}"
+        query = {"api_key": self.api_key, "language": "en-US"}
+        if params:
+            query.update(params)
+        # Background work leaves a few rate-limit tokens for user requests
+        reserve = 0 if priority == FetchScheduler.INTERACTIVE else settings.TMDB_RATE_LIMIT_INTERACTIVE_RESERVE
+
+        session = await self._get_session()
+        for attempt in range(self.max_retries):
+            if not self.breaker.allow_request():
+                return None, None
+
+            if attempt > 0:
+                self.retries += 1
+
+            await self.scheduler.acquire(priority, flow)
+            try:
+                if await self.limiter.acquire(reserve=reserve):
+                    self.rate_limited += 1
+
+                started = time.time()
+                status, payload, retry_after = await self._hedged_send(session, url, query, reserve)
+                elapsed = time.time() - started
+
+                if status == 200 or status in (404, 400):
+                    self.breaker.record_success(elapsed)
+                    self._record_latency(elapsed)
+                    return status, payload
+
+                if status == 429:
+                    self.breaker.record_failure(elapsed)
+                    delay = min(_retry_after_seconds(retry_after), 5)
+                elif status >= 500:
+                    self.breaker.record_failure(elapsed)
+                    delay = 0.5 * (2 ** attempt)
+                else:
+                    self.breaker.record_success(elapsed)
+                    return status, None
+
+            except (asyncio.TimeoutError, aiohttp.ClientError, ValueError) as e:
+                # (ValueError: a 200 with a malformed JSON body)
+                self.breaker.record_failure(time.time() - started)
+                if settings.ENHANCED_FEATURES_LOGGING:
+                    print(f"TMDB client error for {path}: {e!r}")
+                delay = 0.5 * (2 ** attempt)
+            finally:
+                # Backoff sleeps don't hold a slot
+                self.scheduler.release(priority)
+
+            if attempt < self.max_retries - 1 and not self.breaker.is_open():
+                await asyncio.sleep(delay)
+
+        return None, None
+
+    async def _send(self, session: aiohttp.ClientSession, url: str, query: Dict[str, Any]):
+        """One HTTP exchange -> (status, payload, Retry-After); the caller holds a rate limiter token"""
+        self.requests += 1
+        async with session.get(url, params=query) as response:
+            payload = await response.json() if response.status == 200 else None
+            return response.status, payload, response.headers.get('Retry-After')
+
+    async def _hedged_send(self, session: aiohttp.ClientSession, url: str, query: Dict[str, Any],
+                           reserve: float = 0):
+        """
+        Send a request, duplicating it if it outlives the adaptive hedge delay
+
+        Whichever copy answers first wins and the other is cancelled. A hedge
+        is only sent when the rate limiter has a token to spare, so hedging
+        never pushes us past the TMDB budget.
+        """
+        delay = self._hedge_delay()
+        if delay is None:
+            return await self._send(session, url, query)
+
+        primary = asyncio.ensure_future(self._send(session, url, query))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done or not self.limiter.try_acquire(reserve=reserve):
+            return await primary
+
+        self.hedges += 1
+        hedge = asyncio.ensure_future(self._send(session, url, query))
+        pending = {primary, hedge}
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    # Adaptive hedge delay
+
+    def _record_latency(self, elapsed: float):
+        self._latencies.append(elapsed)
+        self._latency_samples += 1
+        if self._latency_samples % 20 == 0:
+            self._hedge_delay_cache = None
+
+    def _hedge_delay(self) -> Optional[float]:
+        """Observed latency percentile (clamped), or None when hedging is off or untrained"""
+        if not settings.TMDB_HEDGE_ENABLED or len(self._latencies) < settings.TMDB_HEDGE_MIN_SAMPLES:
+            return None
+        if self._hedge_delay_cache is None:
+            ordered = sorted(self._latencies)
+            index = min(len(ordered) - 1, int(len(ordered) * settings.TMDB_HEDGE_PERCENTILE / 100))
+            self._hedge_delay_cache = min(
+                max(ordered[index], settings.TMDB_HEDGE_MIN_DELAY_MS / 1000),
+                settings.TMDB_HEDGE_MAX_DELAY_MS / 1000
+            )
+        return self._hedge_delay_cache
+
+    async def get_json(self, path: str, params: Optional[Dict[str, Any]] = None,
+                       priority: int = FetchScheduler.INTERACTIVE, flow=None) -> Tuple[Optional[int], Any]:
+        """
+        GET a TMDB path from any event loop without blocking it
+
+        Args:
+            path: TMDB path, e.g. /movie/862
+            params: Extra query parameters
+            priority: FetchScheduler class of the request
+            flow: Fair-queuing key within the class (e.g. a session id)
+
+        Returns:
+            (status, payload). Status is None when no API key is configured,
+            the circuit is open or all retries failed; payload is only set
+            for 200 responses.
+        """
+        if not self.api_key:
+            # Every call would be a 401 - don't send it (or count it against the breaker)
+            return None, None
+        loop = self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(self._request(path, params, priority, flow), loop)
+        return await asyncio.wrap_future(future)
+
+    def get_json_sync(self, path: str, params: Optional[Dict[str, Any]] = None,
+                      priority: int = FetchScheduler.INTERACTIVE, flow=None) -> Tuple[Optional[int], Any]:
+        """Blocking variant of get_json for plain threads (never call it on an event loop)"""
+        if not self.api_key:
+            return None, None
+        loop = self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(self._request(path, params, priority, flow), loop)
+        return future.result()
+
+    def run(self, coro) -> concurrent.futures.Future:
+        """Schedule a coroutine on the client loop, e.g. a batch of get_json calls"""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_started())
+
+    def get_stats(self) -> Dict[str, Any]:
+        hedge_delay = self._hedge_delay()
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedge_delay_ms": round(hedge_delay * 1000) if hedge_delay else None,
+            "running": self._loop is not None and self._pid == os.getpid(),
+            "scheduler": self.scheduler.get_stats()
+        }
@@ -0,0 +1,120 @@
+# backend/app/core/tmdb_import.py
+import gzip
+import json
+import time
+from typing import Any, Dict, Iterator
+
+from app.core.tmdb_record import split_movie_response
+
+
+def iter_tmdb_dump(path: str, stats: Dict[str, int]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield TMDB movie objects from a JSONL dump (plain or gzipped)
+
+    Blank and malformed lines are counted in stats["invalid_lines"] and skipped.
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as dump:
+        for line in dump:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError:
+                stats["invalid_lines"] += 1
+                continue
+            if isinstance(data, dict):
+                yield data
+            else:
+                stats["invalid_lines"] += 1
+
+
+def import_tmdb_dump(recommender, path: str, batch_size: int = 1000,
+                     include_unmatched: bool = False) -> Dict[str, Any]:
+    """
+    Bulk-load a TMDB dump into the recommender's TMDB cache and diversity maps
+
+    Each line is a /movie/{id} response (e.g. from TMDB's daily export joined
+    with earlier fetches). Records are projected exactly like fetched ones,
+    appended recommendations pages included, and applied in batches: one cache lock and one diversity lock per batch.
+    Lines without detail fields (bare export entries) are skipped so they
+    don't shadow a real fetch. A movie repeated within a batch keeps its
+    last line and is counted in stats["duplicates"].
+
+    Args:
+        recommender: EnhancedMoodRecommender owning the cache and maps
+        path: JSONL dump path
+        batch_size: Records applied per batch
+        include_unmatched: Also cache movies that are not in the catalog
+    """
+    started = time.time()
+    stats = {
+        "lines": 0,
+        "invalid_lines": 0,
+        "incomplete": 0,
+        "unmatched": 0,
+        "duplicates": 0,
+        "imported": 0,
+        "recommendations_imported": 0,
+        "diversity_added": 0,
+        "batches": 0
+    }
+    movie_ids = recommender.movies['movieId'].to_numpy()
+    tmdb_index = recommender.tmdb_index
+
+    # Keyed by id so a repeated movie is stored (and counted) once per batch
+    cache_batch = {}
+    similar_batch = {}
+    diversity_batch = {}
+
+    def flush():
+        if cache_batch:
+            stats["imported"] += recommender.tmdb_cache.set_many(cache_batch.items())
+        if similar_batch:
+            stats["recommendations_imported"] += recommender.similar_cache.set_many(similar_batch.items())
+        if diversity_batch:
+            recommender.record_diversity_batch(list(diversity_batch.items()))
+            stats["diversity_added"] += len(diversity_batch)
+        if cache_batch or diversity_batch:
+            stats["batches"] += 1
+        cache_batch.clear()
+        similar_batch.clear()
+        diversity_batch.clear()
+
+    for data in iter_tmdb_dump(path, stats):
+        stats["lines"] += 1
+
+        # Daily export entries only carry ids/titles - not worth caching
+        if "poster_path" not in data:
+            stats["incomplete"] += 1
+            continue
+
+        record, similar = split_movie_response(data)
+        if record is None:
+            stats["invalid_lines"] += 1
+            continue
+
+        if record.tmdb_id in cache_batch:
+            stats["duplicates"] += 1
+            similar_batch.pop(record.tmdb_id, None)
+
+        position = tmdb_index.get(record.tmdb_id)
+        if position is None:
+            stats["unmatched"] += 1
+            if not include_unmatched:
+                continue
+        else:
+            movie_id = int(movie_ids[position])
+            if movie_id not in recommender.movie_countries:
+                diversity_batch[movie_id] = record
+
+        cache_batch[record.tmdb_id] = record
+        if similar is not None:
+            similar_batch[record.tmdb_id] = similar
+        if len(cache_batch) >= batch_size:
+            flush()
+
+    flush()
+    stats["duration_seconds"] = round(time.time() - started, 2)
+    return stats
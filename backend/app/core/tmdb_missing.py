@@ -0,0 +1,114 @@
+# backend/app/core/tmdb_missing.py
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+
+class TMDBMissingIds:
+    """
+    Compact, persisted set of tmdbIds TMDB answered 404 for
+
+    Confirmed ids live in a sorted int32 array (4 bytes each, binary search
+    lookups); new 404s go to a small pending set until the next rebuild merges
+    them in and saves the array. The whole set is dropped once it is older
+    than `max_age_seconds`, so ids TMDB later (re)publishes get re-checked.
+    """
+
+    def __init__(self, path: Optional[str], rebuild_interval_seconds: float = 600,
+                 max_age_seconds: float = 30 * 24 * 3600):
+        self.path = path
+        self.rebuild_interval_seconds = rebuild_interval_seconds
+        self.max_age_seconds = max_age_seconds
+
+        self._ids = np.empty(0, dtype=np.int32)
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._created_at = time.time()
+        self._rebuilt_at = time.time()
+
+        # Statistics
+        self.skipped_lookups = 0
+
+        self.load()
+
+    def __contains__(self, tmdb_id) -> bool:
+        tmdb_id = int(tmdb_id)
+        if tmdb_id in self._pending:
+            return True
+        ids = self._ids
+        position = np.searchsorted(ids, tmdb_id)
+        return position < len(ids) and ids[position] == tmdb_id
+
+    def skip(self, tmdb_id) -> bool:
+        """True (and counted) when a fetch of tmdb_id can be skipped"""
+        if tmdb_id in self:
+            self.skipped_lookups += 1
+            return True
+        return False
+
+    def add(self, tmdb_id):
+        """Record a confirmed 404"""
+        with self._lock:
+            self._pending.add(int(tmdb_id))
+
+    def due_for_rebuild(self) -> bool:
+        return bool(self._pending) and time.time() - self._rebuilt_at >= self.rebuild_interval_seconds
+
+    def rebuild(self):
+        """Merge pending ids into the sorted array and persist it"""
+        with self._lock:
+            if time.time() - self._created_at >= self.max_age_seconds:
+                self._ids = np.empty(0, dtype=np.int32)
+                self._created_at = time.time()
+            if self._pending:
+                pending = np.fromiter(self._pending, dtype=np.int32, count=len(self._pending))
+                self._ids = np.union1d(self._ids, pending).astype(np.int32)
+                self._pending = set()
+            self._rebuilt_at = time.time()
+            ids, created_at = self._ids, self._created_at
+        self.save(ids, created_at)
+
+    def load(self):
+        """Read the persisted set, if any and not expired"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path) as data:
+                created_at = float(data["created_at"])
+                ids = np.unique(data["ids"].astype(np.int32))
+            if time.time() - created_at >= self.max_age_seconds:
+                print(f"Discarding expired TMDB missing-id set ({len(ids)} ids)")
+                return
+            with self._lock:
+                self._ids = ids
+                self._created_at = created_at
+            print(f"🚫 Loaded {len(ids)} TMDB ids known to 404")
+        except Exception as e:
+            print(f"Could not load TMDB missing-id set {self.path}: {e}")
+
+    def save(self, ids, created_at):
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp.npz"
+            np.savez(tmp_path, ids=ids, created_at=np.float64(created_at))
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Could not save TMDB missing-id set {self.path}: {e}")
+
+    def get_stats(self) -> Dict:
+        return {
+            "missing_ids": len(self._ids) + len(self._pending),
+            "pending": len(self._pending),
+            "memory_bytes": int(self._ids.nbytes),
+            "skipped_lookups": self.skipped_lookups,
+            "created_at": self._created_at,
+            "rebuilt_at": self._rebuilt_at
+        }
+
+    def __len__(self):
+        return len(self._ids) + len(self._pending)
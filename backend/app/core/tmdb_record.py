@@ -0,0 +1,163 @@
+# backend/app/core/tmdb_record.py
+import sys
+from typing import Any, Dict, Optional, Tuple
+
+
+def _interned_names(items, key="name") -> Tuple[str, ...]:
+    """Extract and intern the name field from a list of TMDB objects"""
+    if not items:
+        return ()
+    return tuple(sys.intern(item[key]) for item in items if item.get(key))
+
+
+class TMDBMovieRecord:
+    """
+    Compact projection of a TMDB movie response
+
+    Only the fields the recommendation and detail paths read are kept.
+    Repeated strings (countries, languages, studios, genres, keywords) are
+    interned, so thousands of cached records share a single copy of each.
+    The raw payload is only retained when explicitly requested.
+    """
+
+    __slots__ = (
+        "tmdb_id", "title", "poster_path", "backdrop_path", "overview",
+        "runtime", "release_date", "tagline", "vote_average",
+        "genres", "keywords", "countries", "languages", "companies", "raw"
+    )
+
+    def __init__(self, tmdb_id, title=None, poster_path=None, backdrop_path=None,
+                 overview=None, runtime=None, release_date=None, tagline=None,
+                 vote_average=None, genres=(), keywords=(), countries=(),
+                 languages=(), companies=(), raw=None):
+        self.tmdb_id = tmdb_id
+        self.title = title
+        self.poster_path = poster_path
+        self.backdrop_path = backdrop_path
+        self.overview = overview
+        self.runtime = runtime
+        self.release_date = release_date
+        self.tagline = tagline
+        self.vote_average = vote_average
+        self.genres = genres
+        self.keywords = keywords
+        self.countries = countries
+        self.languages = languages
+        self.companies = companies
+        self.raw = raw
+
+    @classmethod
+    def from_tmdb(cls, data: Dict[str, Any], keep_raw: bool = False) -> Optional["TMDBMovieRecord"]:
+        """
+        Project a TMDB /movie/{id} response into a compact record
+
+        Args:
+            data: Parsed TMDB JSON (optionally with appended keywords)
+            keep_raw: Keep the full payload on the record as well
+        """
+        if not data or not data.get("id"):
+            return None
+
+        keywords = data.get("keywords") or {}
+
+        return cls(
+            tmdb_id=int(data["id"]),
+            title=data.get("title"),
+            poster_path=data.get("poster_path"),
+            backdrop_path=data.get("backdrop_path"),
+            overview=data.get("overview") or None,
+            runtime=data.get("runtime"),
+            release_date=data.get("release_date") or None,
+            tagline=data.get("tagline") or None,
+            vote_average=data.get("vote_average"),
+            genres=_interned_names(data.get("genres")),
+            keywords=tuple(sys.intern(kw["name"].lower()) for kw in keywords.get("keywords", []) if kw.get("name")),
+            countries=_interned_names(data.get("production_countries")),
+            languages=_interned_names(data.get("spoken_languages")),
+            companies=_interned_names(data.get("production_companies")),
+            raw=data if keep_raw else None
+        )
+
+    @property
+    def year(self) -> Optional[int]:
+        """Release year parsed from the release date"""
+        if not self.release_date:
+            return None
+        try:
+            return int(self.release_date.split("-")[0])
+        except ValueError:
+            return None
+
+    def to_details(self) -> Dict[str, Any]:
+        """TMDB fields exposed by the movie detail endpoints"""
+        return {
+            "poster_path": self.poster_path,
+            "backdrop_path": self.backdrop_path,
+            "overview": self.overview,
+            "release_date": self.release_date,
+            "runtime": self.runtime,
+            "tagline": self.tagline,
+            "vote_average": self.vote_average,
+            "production_companies": [{"name": name} for name in self.companies],
+            "production_countries": [{"name": name} for name in self.countries]
+        }
+
+    def approx_size(self) -> int:
+        """Approximate memory footprint in bytes (interned strings not counted)"""
+        size = sys.getsizeof(self)
+        for attr in ("title", "poster_path", "backdrop_path", "overview", "release_date", "tagline"):
+            value = getattr(self, attr)
+            if value is not None:
+                size += sys.getsizeof(value)
+        for attr in ("genres", "keywords", "countries", "languages", "companies"):
+            size += sys.getsizeof(getattr(self, attr))
+        return size
+
+    def __repr__(self):
+        return f"TMDBMovieRecord(tmdb_id={self.tmdb_id}, title={self.title!r})"
+
+
+class TMDBRecommendation:
+    """Compact entry of a TMDB /movie/{id}/recommendations page"""
+
+    __slots__ = ("tmdb_id", "title", "poster_path", "overview", "release_date")
+
+    def __init__(self, tmdb_id, title=None, poster_path=None, overview=None, release_date=None):
+        self.tmdb_id = tmdb_id
+        self.title = title
+        self.poster_path = poster_path
+        self.overview = overview
+        self.release_date = release_date
+
+    @classmethod
+    def from_page(cls, data: Dict[str, Any]) -> Tuple["TMDBRecommendation", ...]:
+        """Project a recommendations page (its "results" list) into compact entries"""
+        return tuple(
+            cls(
+                tmdb_id=int(item["id"]),
+                title=item.get("title", ""),
+                poster_path=item.get("poster_path"),
+                overview=item.get("overview"),
+                release_date=item.get("release_date")
+            )
+            for item in (data or {}).get("results", [])
+            if item.get("id")
+        )
+
+    def __repr__(self):
+        return f"TMDBRecommendation(tmdb_id={self.tmdb_id}, title={self.title!r})"
+
+
+def split_movie_response(data: Dict[str, Any], keep_raw: bool = False
+                         ) -> Tuple[Optional[TMDBMovieRecord], Optional[Tuple[TMDBRecommendation, ...]]]:
+    """
+    Split a /movie/{id} response with appended sub-resources for the caches
+
+    Returns:
+        (record, recommendations) - recommendations is None when the page
+        was not appended to the response
+    """
+    record = TMDBMovieRecord.from_tmdb(data, keep_raw=keep_raw)
+    page = (data or {}).get("recommendations")
+    recommendations = TMDBRecommendation.from_page(page) if isinstance(page, dict) else None
+    return record, recommendations
@@ -6,14 +6,11 @@ import time
 import re
 import numpy as np
 import pandas as pd
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-import random
 import asyncio
-import aiohttp
-from concurrent.futures import ThreadPoolExecutor
-from typing import List, Dict, Any, Optional
+import hashlib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import List, Dict, Any, Optional, Tuple
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(os.path.dirname(current_dir))
@@ -21,6 +18,17 @@ sys.path.append(parent_dir)
 
 from app.core.enhanced_recommender import EnhancedMoodRecommender
 from app.core.mood_mapping import mood_mapping, get_available_moods
+from app.core.tmdb_record import TMDBMovieRecord, TMDBRecommendation, split_movie_response
+from app.core.tmdb_cache import TMDBCache
+from app.core.fetch_scheduler import FetchScheduler
+from app.core.executors import cpu_executor
+from app.core.http_cache import RenderedResponseCache
+from app.core.ranking_cursor import encode_cursor, decode_cursor
+from app.core.serialization import dumps
+from app.core.timing import current as current_timings, span
+from app.core.scoring_pool import ScoringPool
+from app.core.mood_prefetcher import MoodTransitionPrefetcher
+from app.core.tmdb_import import import_tmdb_dump
 
 try:
     from app.core.safe_enhanced_wrapper import SafeEnhancedWrapper
@@ -29,49 +37,6 @@ except ImportError:
     print("Enhanced features not available - using original system only")
     ENHANCED_FEATURES_AVAILABLE = False
 
-USER_AGENTS = [
-    "MoodBinge/1.0",
-    "Mozilla/5.0 (compatible; MoodBingeBot/1.0)",
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
-    # Add more if you want
-]
-
-def get_retry_session():
-    """
-    🚀 OPTIMIZED: HTTP session with aggressive performance tuning
-    """
-    session = requests.Session()
-    
-    # OPTIMIZED: Fewer retries, faster backoff
-    retries = Retry(
-        total=3,                    # REDUCED from 5
-        backoff_factor=0.5,         # REDUCED from 2 - faster recovery  
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["GET"],
-        raise_on_status=False       # Don't raise exceptions, let us handle them
-    )
-    
-    # OPTIMIZED: Connection pooling
-    adapter = HTTPAdapter(
-        max_retries=retries,
-        pool_connections=8,         # REDUCED from default 10
-        pool_maxsize=15,           # REDUCED from default 20  
-        pool_block=False           # Don't block when pool is full
-    )
-    
-    session.mount('https://', adapter)
-    session.mount('http://', adapter)
-    
-    # OPTIMIZED: Default headers for better performance
-    session.headers.update({
-        'Connection': 'keep-alive',
-        'Accept-Encoding': 'gzip, deflate',
-        'Accept': 'application/json',
-        'User-Agent': random.choice(USER_AGENTS)
-    })
-    
-    return session
-
 class RecommenderService:
     def __init__(self):
         # Initialize the recommender with the mood mapping and TMDB API key
@@ -80,7 +45,6 @@ class RecommenderService:
             tmdb_api_key=settings.TMDB_API_KEY,
             movielens_dir=settings.DATA_PATH
         )
-        self.session = get_retry_session()
 
         # Initialize enhanced features if available and enabled
         self.enhanced_features_enabled = (
@@ -88,10 +52,24 @@ class RecommenderService:
             settings.USE_ENHANCED_RECOMMENDATIONS
         )
         
+        # Scoring backend: forked worker processes when configured, else in-process
+        self.scoring_pool = None
+        if settings.SCORING_POOL_WORKERS > 0:
+            if ScoringPool.available():
+                self.scoring_pool = ScoringPool(
+                    self.recommender,
+                    workers=settings.SCORING_POOL_WORKERS,
+                    snapshot_interval=settings.SCORING_POOL_SNAPSHOT_SECONDS
+                )
+                print(f"✅ Scoring pool enabled with {settings.SCORING_POOL_WORKERS} worker processes")
+            else:
+                print("Scoring pool needs a forkserver - scoring in-process")
+        self.scorer = self.scoring_pool or self.recommender
+        
         if self.enhanced_features_enabled:
             try:
                 self.enhanced_wrapper = SafeEnhancedWrapper(
-                    original_recommender=self.recommender,
+                    original_recommender=self.scorer,
                     mood_mapping=mood_mapping
                 )
                 print("✅ Enhanced recommendation features initialized")
@@ -99,22 +77,168 @@ class RecommenderService:
                 print(f"❌ Enhanced features failed to initialize: {e}")
                 self.enhanced_features_enabled = False
         
-        # TMDB response cache
-        self.tmdb_cache = {}
-        self.cache_expiry = {}
-        self.cache_duration = 3600  # 1 hour cache
+        # TMDB response cache - shared with the recommender so preloaded data is served directly
+        self.tmdb_cache = self.recommender.tmdb_cache
+        self.access_log = self.recommender.tmdb_access_log
+        self.tmdb_missing = self.recommender.tmdb_missing
+        self.cache_duration = settings.TMDB_CACHE_DURATION_SECONDS
+        
+        # Circuit breaker shared with the recommender so every TMDB caller sees the same health
+        self.tmdb_breaker = self.recommender.tmdb_breaker
+        
+        # Shared non-blocking TMDB client (connection pool and priority scheduler)
+        self.tmdb_client = self.recommender.tmdb_client
+        
+        # TMDB recommendations pages, keyed by tmdbId, with their own TTL
+        self.similar_cache = self.recommender.similar_cache
+        
+        # Background refresh of stale entries (stale-while-revalidate)
+        self._refresh_executor = ThreadPoolExecutor(
+            max_workers=settings.TMDB_REFRESH_WORKERS,
+            thread_name_prefix="tmdb-refresh"
+        )
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        
+        # Enrichment fetches that outlived their request's latency budget
+        self._pending_fetches = {}  # tmdb_id -> concurrent.futures.Future
+        self._pending_lock = threading.Lock()
+        
+        # Warm the likely next mood of a session in the background
+        self.mood_prefetcher = None
+        if settings.MOOD_PREFETCH_ENABLED and settings.TMDB_API_KEY:
+            self.mood_prefetcher = MoodTransitionPrefetcher(
+                candidate_source=self._mood_candidate_tmdb_ids,
+                warm=self.warm_tmdb_cache,
+                budget=settings.MOOD_PREFETCH_BUDGET,
+                top_moods=settings.MOOD_PREFETCH_TOP_MOODS,
+                min_probability=settings.MOOD_PREFETCH_MIN_PROBABILITY,
+                candidate_ttl=self.cache_duration
+            )
+        
+        # Scored candidate pools per mood - first pages, "load more" pages,
+        # the preload and the mood prefetch all select from them
+        self.candidate_pools = TMDBCache(
+            ttl_seconds=settings.RECOMMENDATION_POOL_TTL_SECONDS,
+            max_stale_seconds=settings.RECOMMENDATION_POOL_TTL_SECONDS,
+            max_size=len(mood_mapping)
+        )
+        self._pool_builds = {}  # mood -> concurrent.futures.Future of the scoring in progress
+        self._pool_lock = threading.Lock()
+        
+        # The preload and mood prefetch take their rankings from the same pools
+        self.recommender.candidate_source = self._candidate_pool
+        
+        # Pre-rendered response bodies for HTTP caching, tagged with their ETag
+        self.rendered_details = RenderedResponseCache(max_size=settings.HTTP_RENDERED_CACHE_MAX_SIZE)
+        self._rendered_moods = None
         
         # Performance statistics
         self.cache_hits = 0
         self.cache_misses = 0
+        self.stale_hits = 0
+        self.background_refreshes = 0
+        self.partial_responses = 0
         
         print(f"RecommenderService initialized. Enhanced features: {self.enhanced_features_enabled}")
-        print(f"🚀 Performance optimizations: Caching enabled, Cache duration: {self.cache_duration}s")
+        print(f"🚀 Performance optimizations: Caching enabled, Cache duration: {self.cache_duration}s, "
+              f"max staleness: {settings.TMDB_CACHE_MAX_STALE_SECONDS}s")
 
+    def start_background_preload(self) -> bool:
+        """Kick off TMDB preloading in the background (non-blocking)"""
+        started = self.recommender.start_background_preload(settings.TMDB_PRELOAD_SIZE)
+        if started:
+            print(f"🚀 Background TMDB preload started for {settings.TMDB_PRELOAD_SIZE} movies")
+        return started
+    
+    def preload(self) -> bool:
+        """Run the TMDB preload in the calling thread (blocking), e.g. before forking workers"""
+        if not self.recommender.tmdb_api_key:
+            self.recommender.update_preload_status(state="disabled")
+            return False
+        self.recommender.preload_tmdb_data(settings.TMDB_PRELOAD_SIZE)
+        return True
+    
+    def prepare_fork(self):
+        """
+        Stop the threads a forked child can't inherit
+        
+        Only the TMDB client loop runs in a master that has just loaded and
+        warmed the caches; each worker restarts it on first use. Workers
+        start their own scoring pools too.
+        """
+        self.tmdb_client.close()
+        if self.scoring_pool:
+            self.scoring_pool.shutdown()
+    
+    def stop_background_preload(self):
+        """Stop background TMDB preloading"""
+        self.recommender.stop_background_preload()
+    
+    def shutdown(self):
+        """Stop background TMDB work (preload and stale-entry refreshes)"""
+        self.stop_background_preload()
+        self._refresh_executor.shutdown(wait=False, cancel_futures=True)
+        self.access_log.save()
+        self.tmdb_missing.rebuild()
+        if self.mood_prefetcher:
+            self.mood_prefetcher.shutdown()
+        self.tmdb_client.close()
+        cpu_executor.shutdown()
+        if self.scoring_pool:
+            self.scoring_pool.shutdown()
+    
+    def import_tmdb_dump(self, path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Bulk-load an offline TMDB dump into the cache and diversity maps
+        
+        Args:
+            path: JSONL dump path (defaults to TMDB_DUMP_PATH)
+        """
+        path = path or settings.TMDB_DUMP_PATH
+        if not path or not os.path.exists(path):
+            raise FileNotFoundError(f"TMDB dump not found: {path or '(TMDB_DUMP_PATH not set)'}")
+        
+        stats = import_tmdb_dump(self.recommender, path, batch_size=settings.TMDB_IMPORT_BATCH_SIZE)
+        print(f"📦 Imported {stats['imported']} TMDB records from {path} in {stats['duration_seconds']}s "
+              f"({stats['incomplete']} incomplete, {stats['unmatched']} outside the catalog)")
+        return stats
+    
+    def get_preload_status(self) -> Dict[str, Any]:
+        """Get background TMDB preload progress"""
+        return self.recommender.get_preload_status()
+    
+    def get_tmdb_status(self) -> Dict[str, Any]:
+        """Get TMDB circuit breaker state"""
+        return self.tmdb_breaker.get_stats()
+    
+    def get_scoring_stats(self) -> Dict[str, Any]:
+        """Scoring backend in use and its pool statistics"""
+        if not self.scoring_pool:
+            return {"backend": "in-process"}
+        return {"backend": "process-pool", **self.scoring_pool.get_stats()}
+    
+    def get_prefetch_stats(self) -> Dict[str, Any]:
+        """Get mood-transition prefetch statistics"""
+        if not self.mood_prefetcher:
+            return {"enabled": False}
+        return {"enabled": True, **self.mood_prefetcher.get_stats()}
+
+    def has_mood(self, mood: str) -> bool:
+        """Whether a mood category exists"""
+        return mood in mood_mapping
+    
     def get_available_moods(self) -> List[Dict[str, Any]]:
         """Get a list of available mood categories with descriptions"""
         return get_available_moods()
     
+    def render_moods(self) -> Tuple[str, bytes]:
+        """The mood list as JSON bytes and its ETag - rendered once, mood_mapping is static"""
+        if self._rendered_moods is None:
+            body = dumps(self.get_available_moods())
+            self._rendered_moods = (f'"{hashlib.sha1(body).hexdigest()[:16]}"', body)
+        return self._rendered_moods
+    
     def get_recommendations(self, mood: str, n: int = 10, session_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Get movie recommendations for a specific mood with performance optimizations
@@ -124,12 +248,68 @@ class RecommenderService:
             n: Number of recommendations
             session_id: Optional session ID for enhanced features
         """
+        recommendations = self._score_recommendations(mood, n, session_id, self._candidate_pool(mood))
+        
+        # ================================================================
+        # 🚀 OPTIMIZED TMDB ENHANCEMENT WITH SMART FALLBACK
+        # ================================================================
+        
+        result = self.enrich_movies(recommendations, flow=session_id)
+        
+        self._after_recommendations(mood, session_id)
+        return result
+    
+    async def get_recommendations_async(self, mood: str, n: int = 10,
+                                        session_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        get_recommendations for async handlers
+        
+        Scoring runs on the bounded CPU executor and TMDB enrichment awaits
+        the shared client, so the event loop is never blocked.
+        """
+        # The catalog is scored once per mood; this page and the "load more"
+        # pages after it all select from the same pool
+        candidates = await cpu_executor.run(self._candidate_pool, mood)
+        recommendations = await cpu_executor.run(self._score_recommendations, mood, n, session_id, candidates)
+        result = await self.enrich_movies_async(recommendations, flow=session_id)
+        
+        self._after_recommendations(mood, session_id)
+        return result
+    
+    def _after_recommendations(self, mood: str, session_id: Optional[str]):
+        """Prefetch bookkeeping and performance logging once a response is ready"""
+        # Learn the session's mood transition and warm its likely next mood
+        if session_id and self.mood_prefetcher:
+            self.mood_prefetcher.observe(session_id, mood)
+        
+        # ================================================================
+        # 📊 PERFORMANCE LOGGING
+        # ================================================================
+        
+        timings = current_timings()
+        if settings.ENHANCED_FEATURES_LOGGING and timings is not None:
+            print(f"⚡ Performance: {timings.server_timing()}")
+            
+            # Show cache stats if available
+            if hasattr(self, 'get_cache_stats'):
+                try:
+                    cache_stats = self.get_cache_stats()
+                    print(f"📊 Cache stats: {cache_stats['hit_rate_percent']}% hit rate, {cache_stats['cached_items']} items cached")
+                except:
+                    pass
+    
+    def _score_recommendations(self, mood: str, n: int, session_id: Optional[str],
+                               candidates: Optional[List[Dict]] = None) -> List[Dict[str, Any]]:
+        """
+        Pick and score the movies for a mood (no TMDB enrichment)
+        
+        Args:
+            candidates: Pre-scored pool (score_candidates) to select from,
+                        shared between pipelines instead of rescoring the catalog
+        """
         if mood not in mood_mapping:
             raise ValueError(f"Unknown mood: {mood}")
         
-        # Performance timing
-        start_time = time.time()
-        
         # Log request if enabled
         if settings.ENHANCED_FEATURES_LOGGING:
             enhanced_status = "enhanced" if (self.enhanced_features_enabled and session_id) else "original"
@@ -142,109 +322,355 @@ class RecommenderService:
                     mood=mood,
                     n=n,
                     session_id=session_id,
-                    use_enhancements=True
+                    use_enhancements=True,
+                    candidates=candidates
                 )
                 if settings.ENHANCED_FEATURES_LOGGING:
                     print(f"✅ Enhanced recommendations generated: {len(recommendations)} movies")
             except Exception as e:
                 print(f"❌ Enhanced system failed, using original: {e}")
                 # Fallback to original system
-                recommendations = self.recommender.get_recommendations(mood, n)
-                recommendations = self._convert_to_list_format(recommendations)
+                recommendations = self._original_scores(mood, n, candidates)
         else:
             # Use original system
-            recommendations = self.recommender.get_recommendations(mood, n)
-            recommendations = self._convert_to_list_format(recommendations)
+            recommendations = self._original_scores(mood, n, candidates)
             
             if settings.ENHANCED_FEATURES_LOGGING:
                 print(f"📊 Original recommendations generated: {len(recommendations)} movies")
         
-        # ================================================================
-        # 🚀 OPTIMIZED TMDB ENHANCEMENT WITH SMART FALLBACK
-        # ================================================================
+        return recommendations
+    
+    def _original_scores(self, mood: str, n: int, candidates: Optional[List[Dict]] = None) -> List[Dict[str, Any]]:
+        if candidates is None:
+            recommendations = self.scorer.get_recommendations(mood, n)
+        else:
+            recommendations = self.scorer.get_recommendations(mood, n, candidates=candidates)
+        return self._convert_to_list_format(recommendations)
+    
+    async def compare_recommendations_async(self, mood: str, n: int = 10,
+                                            session_id: Optional[str] = None):
+        """
+        Original and enhanced recommendations for the same request, side by side
+        
+        The catalog is scored once; both pipelines select from that pool
+        concurrently, and the union of their movies is enriched with one
+        de-duplicated TMDB pass.
+        
+        Returns:
+            (original, enhanced) - the same list when there is no session_id
+        """
+        if mood not in mood_mapping:
+            raise ValueError(f"Unknown mood: {mood}")
+        
+        candidates = await cpu_executor.run(self._candidate_pool, mood)
+        
+        if session_id:
+            original, enhanced = await asyncio.gather(
+                cpu_executor.run(self._original_scores, mood, n, candidates),
+                cpu_executor.run(self._score_recommendations, mood, n, session_id, candidates)
+            )
+        else:
+            original = enhanced = await cpu_executor.run(self._original_scores, mood, n, candidates)
+        
+        movies = list({id(movie): movie for movie in original + enhanced}.values())
+        await self.enrich_movies_async(movies, flow=session_id)
+        
+        if session_id:
+            self._after_recommendations(mood, session_id)
+        return original, enhanced
+    
+    def next_cursor(self, mood: str, page_size: int, shown: List[int]) -> Optional[str]:
+        """Cursor for the page after `shown`, or None once the depth limit is reached"""
+        if not shown or len(shown) >= settings.RECOMMENDATION_CURSOR_MAX_DEPTH:
+            return None
+        return encode_cursor(mood, page_size, shown)
+    
+    def _candidate_pool(self, mood: str) -> List[Dict]:
+        """
+        The mood's scored candidates, best first (blocking)
+        
+        Cached per mood; concurrent callers for a mood that isn't cached yet
+        wait for a single scoring pass instead of each scanning the catalog.
+        """
+        if mood not in mood_mapping:
+            raise ValueError(f"Unknown mood: {mood}")
+        
+        pool = self.candidate_pools.get(mood)
+        if pool is not None:
+            return pool
+        
+        with self._pool_lock:
+            pool = self.candidate_pools.get(mood)
+            if pool is not None:
+                return pool
+            build = self._pool_builds.get(mood)
+            owner = build is None
+            if owner:
+                build = Future()
+                self._pool_builds[mood] = build
         
-        enhancement_start = time.time()
+        if not owner:
+            return build.result()
         
         try:
-            # TRY PARALLEL ENHANCEMENT FIRST (FASTEST)
-            if hasattr(self, '_run_async_enhancement'):
-                result = self._run_async_enhancement(recommendations)
-                
-                if settings.ENHANCED_FEATURES_LOGGING:
-                    print("⚡ Used parallel TMDB enhancement")
-            else:
-                # Parallel enhancement not available, use cached sync
-                raise Exception("Parallel enhancement not initialized")
-                
-        except Exception as e:
-            if settings.ENHANCED_FEATURES_LOGGING:
-                print(f"⚠️ Parallel enhancement failed: {e}")
-                print("🔄 Falling back to optimized sync enhancement...")
-            
-            # FALLBACK TO OPTIMIZED SYNC METHOD WITH CACHING
-            result = []
-            for movie in recommendations:
-                # Add placeholder values for TMDB data in case the API fails
-                movie["poster_path"] = None
-                movie["backdrop_path"] = None
-                movie["overview"] = "No overview available."
-                
-                # Extract year from title if not in data
-                if 'year' not in movie or pd.isna(movie.get('year')):
-                    year_match = re.search(r'\((\d{4})\)$', movie.get('title', ''))
-                    if year_match:
-                        movie['year'] = int(year_match.group(1))
-                
-                # Try to enhance with TMDB data using CACHED method
-                if "tmdbId" in movie and movie["tmdbId"] and not pd.isna(movie["tmdbId"]):
-                    try:
-                        # Use cached TMDB data method (if available) or fallback to original
-                        if hasattr(self, '_get_cached_tmdb_data'):
-                            tmdb_data = self._get_cached_tmdb_data(int(movie["tmdbId"]))
-                        else:
-                            tmdb_data = self._get_tmdb_data(int(movie["tmdbId"]))
-                        
-                        if tmdb_data:
-                            if 'poster_path' in tmdb_data:
-                                movie["poster_path"] = tmdb_data.get("poster_path")
-                            if 'backdrop_path' in tmdb_data:
-                                movie["backdrop_path"] = tmdb_data.get("backdrop_path")
-                            if 'overview' in tmdb_data and tmdb_data.get("overview"):
-                                movie["overview"] = tmdb_data.get("overview")
-                    except Exception as e:
-                        if settings.ENHANCED_FEATURES_LOGGING:
-                            print(f"Error enhancing movie data: {e}")
-                
-                result.append(movie)
+            pool = self.scorer.score_candidates(mood)
+            self.candidate_pools.set(mood, pool)
+            build.set_result(pool)
+            return pool
+        except BaseException as e:
+            build.set_exception(e)
+            raise
+        finally:
+            with self._pool_lock:
+                self._pool_builds.pop(mood, None)
+    
+    def _select_page(self, mood: str, page_size: int, shown: List[int]) -> List[Dict[str, Any]]:
+        page = self.recommender.get_recommendations(
+            mood, page_size, exclude=shown, candidates=self._candidate_pool(mood)
+        )
+        return self._convert_to_list_format(page)
+    
+    async def get_next_recommendations_async(self, mood: str, cursor: str,
+                                             session_id: Optional[str] = None):
+        """
+        The next "load more" page for a cursor from a previous response
+        
+        Selects from the mood's cached candidate pool, skipping every movie
+        already shown, and enriches only the new page.
+        
+        Returns:
+            (movies, next_cursor) - next_cursor is None when the ranking is exhausted
+        """
+        cursor_mood, page_size, shown = decode_cursor(cursor)
+        if cursor_mood != mood:
+            raise ValueError("Cursor belongs to a different mood")
+        
+        page = await cpu_executor.run(self._select_page, mood, page_size, shown)
+        page = await self.enrich_movies_async(page, flow=session_id)
+        
+        next_cursor = None
+        if len(page) == page_size:
+            next_cursor = self.next_cursor(mood, page_size, shown + [int(movie['movieId']) for movie in page])
+        return page, next_cursor
+    
+    async def stream_recommendations(self, mood: str, n: int = 10, session_id: Optional[str] = None):
+        """
+        Recommendations as a stream of (event, data) pairs
+        
+        "recommendations" carries the scored list as soon as scoring is done
+        (cached TMDB data already applied), then one "enrichment" event per
+        movie as its TMDB fetch completes, then "done" with any ids still
+        pending after TMDB_STREAM_TIMEOUT_SECONDS.
+        """
+        loop = asyncio.get_running_loop()
+        candidates = await cpu_executor.run(self._candidate_pool, mood)
+        recommendations = await cpu_executor.run(self._score_recommendations, mood, n, session_id, candidates)
+        
+        # Zero budget: apply what is cached and start fetching the rest
+        recommendations = self.enrich_movies(recommendations, budget_ms=0, flow=session_id)
+        if session_id and self.mood_prefetcher:
+            self.mood_prefetcher.observe(session_id, mood)
+        
+        yield "recommendations", recommendations
+        
+        pending = {}
+        for movie in recommendations:
+            if movie.get("enrichment_status") == "pending":
+                pending.setdefault(int(movie["tmdbId"]), []).append(movie)
+        
+        # Don't cancel the shared fetches if the client goes away - other requests may be waiting on them
+        futures = {asyncio.wrap_future(self._start_tmdb_fetch(tmdb_id, session_id)): tmdb_id for tmdb_id in pending}
+        deadline = loop.time() + settings.TMDB_STREAM_TIMEOUT_SECONDS
+        remaining = set(futures)
+        
+        while remaining:
+            done, remaining = await asyncio.wait(
+                remaining,
+                timeout=max(0.0, deadline - loop.time()),
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                break
             
-            if settings.ENHANCED_FEATURES_LOGGING:
-                print("✅ Used fallback sync enhancement")
+            for future in done:
+                record = None if future.exception() else future.result()
+                tmdb_id = futures[future]
+                for movie in pending.pop(tmdb_id):
+                    self._apply_tmdb_record(movie, record)
+                    yield "enrichment", {
+                        "movieId": movie.get("movieId"),
+                        "tmdbId": tmdb_id,
+                        "poster_path": movie["poster_path"],
+                        "backdrop_path": movie["backdrop_path"],
+                        "overview": movie["overview"],
+                        "enrichment_status": movie["enrichment_status"]
+                    }
         
-        # ================================================================
-        # 📊 PERFORMANCE LOGGING
-        # ================================================================
+        yield "done", {"pending": sorted(pending)}
+    
+    def enrich_movies(self, recommendations: List[Dict], budget_ms: Optional[int] = None,
+                      flow: Optional[str] = None) -> List[Dict]:
+        """
+        Add TMDB poster/backdrop/overview data to a list of movies within a latency budget
         
-        enhancement_time = time.time() - enhancement_start
-        total_time = time.time() - start_time
+        Cached movies are applied immediately; missing ones are fetched through
+        the shared client until the deadline. Anything still in flight is marked
+        "pending" and keeps loading in the background, so a follow-up
+        GET /movies/enrichment?ids= (or the next request) returns it.
         
-        if settings.ENHANCED_FEATURES_LOGGING:
-            print(f"⚡ Performance: TMDB enhancement {enhancement_time:.2f}s, Total {total_time:.2f}s")
+        Each movie gets an "enrichment_status": complete | pending | unavailable.
+        Fetches are interactive priority, queued fairly per `flow` (session).
+        """
+        budget = (budget_ms if budget_ms is not None else settings.TMDB_ENRICHMENT_BUDGET_MS) / 1000
+        deadline = time.time() + budget
+        
+        with span("tmdb_cache"):
+            waiting = self._apply_cached_enrichment(recommendations)
+        
+        # Fetch the misses, but only wait for them until the deadline
+        if waiting and not self.tmdb_breaker.is_open():
+            with span("tmdb_network"):
+                futures = {self._start_tmdb_fetch(tmdb_id, flow): tmdb_id for tmdb_id in waiting}
+                done, not_done = wait(futures, timeout=max(0.0, deadline - time.time()))
+            self._apply_fetched_enrichment(waiting, futures, done, not_done, budget)
+        
+        return recommendations
+    
+    async def enrich_movies_async(self, recommendations: List[Dict], budget_ms: Optional[int] = None,
+                                  flow: Optional[str] = None) -> List[Dict]:
+        """enrich_movies for async handlers - awaits the fetches instead of blocking"""
+        budget = (budget_ms if budget_ms is not None else settings.TMDB_ENRICHMENT_BUDGET_MS) / 1000
+        deadline = time.time() + budget
+        
+        with span("tmdb_cache"):
+            waiting = self._apply_cached_enrichment(recommendations)
+        
+        if waiting and not self.tmdb_breaker.is_open():
+            # Not cancelled on timeout - the fetches are shared and keep loading in the background
+            with span("tmdb_network"):
+                futures = {asyncio.wrap_future(self._start_tmdb_fetch(tmdb_id, flow)): tmdb_id for tmdb_id in waiting}
+                done, not_done = await asyncio.wait(futures, timeout=max(0.0, deadline - time.time()))
+            self._apply_fetched_enrichment(waiting, futures, done, not_done, budget)
+        
+        return recommendations
+    
+    def _apply_cached_enrichment(self, recommendations: List[Dict]) -> Dict[int, List[Dict]]:
+        """Set placeholders, apply cached TMDB data; returns tmdb_id -> movies still needing data"""
+        waiting = {}
+        for movie in recommendations:
+            # Add placeholder values for TMDB data in case the API fails
+            movie["poster_path"] = None
+            movie["backdrop_path"] = None
+            movie["overview"] = "No overview available."
+            movie["enrichment_status"] = "unavailable"
             
-            # Show cache stats if available
-            if hasattr(self, 'get_cache_stats'):
-                try:
-                    cache_stats = self.get_cache_stats()
-                    print(f"📊 Cache stats: {cache_stats['hit_rate_percent']}% hit rate, {cache_stats['cached_items']} items cached")
-                except:
-                    pass
+            # Extract year from title if not in data
+            if 'year' not in movie or pd.isna(movie.get('year')):
+                year_match = re.search(r'\((\d{4})\)$', movie.get('title', ''))
+                if year_match:
+                    movie['year'] = int(year_match.group(1))
+            
+            tmdb_id = movie.get("tmdbId")
+            if not tmdb_id or pd.isna(tmdb_id):
+                continue
+            tmdb_id = int(tmdb_id)
+            
+            record, hit = self._lookup_tmdb_cache(tmdb_id)
+            if hit:
+                self._apply_tmdb_record(movie, record)
+            else:
+                waiting.setdefault(tmdb_id, []).append(movie)
+        return waiting
+    
+    def _apply_fetched_enrichment(self, waiting, futures, done, not_done, budget: float):
+        """Apply finished fetches and mark the rest pending"""
+        for future in done:
+            try:
+                record = future.result()
+            except Exception:
+                record = None
+            for movie in waiting[futures[future]]:
+                self._apply_tmdb_record(movie, record)
         
+        for future in not_done:
+            for movie in waiting[futures[future]]:
+                movie["enrichment_status"] = "pending"
+        
+        if not_done:
+            self.partial_responses += 1
+            if settings.ENHANCED_FEATURES_LOGGING:
+                print(f"⏱️ Enrichment budget of {budget * 1000:.0f}ms spent, {len(not_done)} movies pending")
+    
+    def get_enrichment(self, tmdb_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Current TMDB data for movies previously returned as pending
+        
+        Misses that are not being fetched yet are started, so polling again
+        eventually returns them.
+        """
+        result = {}
+        for tmdb_id in tmdb_ids:
+            entry = {"poster_path": None, "backdrop_path": None, "overview": None}
+            if self.tmdb_missing.skip(tmdb_id):
+                # Confirmed 404 - polling again won't change that
+                entry["enrichment_status"] = "unavailable"
+                result[tmdb_id] = entry
+                continue
+            
+            record, state = self.tmdb_cache.lookup(tmdb_id)
+            if state != TMDBCache.MISS:
+                entry["enrichment_status"] = "complete" if record else "unavailable"
+                if record:
+                    entry.update(
+                        poster_path=record.poster_path,
+                        backdrop_path=record.backdrop_path,
+                        overview=record.overview
+                    )
+            elif self.tmdb_breaker.is_open():
+                entry["enrichment_status"] = "unavailable"
+            else:
+                self._start_tmdb_fetch(tmdb_id)
+                entry["enrichment_status"] = "pending"
+            
+            result[tmdb_id] = entry
         return result
     
+    def _apply_tmdb_record(self, movie: Dict, record: Optional[TMDBMovieRecord]):
+        """Copy TMDB fields onto a movie dict (a None record leaves the placeholders)"""
+        if not record:
+            movie["enrichment_status"] = "unavailable"
+            return
+        movie["poster_path"] = record.poster_path
+        movie["backdrop_path"] = record.backdrop_path
+        if record.overview:
+            movie["overview"] = record.overview
+        movie["enrichment_status"] = "complete"
+    
+    def _start_tmdb_fetch(self, tmdb_id: int, flow: Optional[str] = None):
+        """Start an interactive fetch on the shared client, or join the one in flight"""
+        with self._pending_lock:
+            future = self._pending_fetches.get(tmdb_id)
+            if future is not None:
+                return future
+            future = self.tmdb_client.run(self._fetch_tmdb_record(tmdb_id, flow=flow))
+            self._pending_fetches[tmdb_id] = future
+        
+        future.add_done_callback(lambda _: self._finish_tmdb_fetch(tmdb_id))
+        return future
+    
+    def _finish_tmdb_fetch(self, tmdb_id: int):
+        with self._pending_lock:
+            self._pending_fetches.pop(tmdb_id, None)
+    
     def get_original_recommendations(self, mood: str, n: int = 10) -> List[Dict[str, Any]]:
         """Get recommendations using only the original system"""
-        recommendations = self.recommender.get_recommendations(mood, n)
+        recommendations = self.scorer.get_recommendations(mood, n)
         return self._convert_to_list_format(recommendations)
     
+    async def get_original_recommendations_async(self, mood: str, n: int = 10) -> List[Dict[str, Any]]:
+        """get_original_recommendations on the bounded CPU executor"""
+        return await cpu_executor.run(self.get_original_recommendations, mood, n)
+    
     def get_session_stats(self, session_id: str) -> Dict:
         """Get session statistics (enhanced feature)"""
         if not self.enhanced_features_enabled:
@@ -261,80 +687,104 @@ class RecommenderService:
         else:
             return []
     
-    def get_similar_movies(self, movie_id: int, n: int = 5) -> List[Dict[str, Any]]:
-        """Get similar movies for a given movie ID"""
-        # Get the tmdbId for the movie
-        movie_data = self.recommender.movies[self.recommender.movies['movieId'] == movie_id]
-        if movie_data.empty or 'tmdbId' not in movie_data.columns:
+    async def get_similar_movies(self, movie_id: int, n: int = 5) -> List[Dict[str, Any]]:
+        """
+        Get similar movies for a given movie ID
+        
+        TMDB recommendation pages are cached with their own TTL and fetched
+        through the shared non-blocking client, so this never blocks the
+        event loop. Falls back to MovieLens genre similarity when TMDB fails.
+        """
+        movies = self.recommender.movies
+        position = self.recommender.movie_index.get(movie_id)
+        if position is None:
             return []
         
-        tmdb_id = movie_data.iloc[0]['tmdbId']
+        tmdb_id = movies.iloc[position]['tmdbId']
         if pd.isna(tmdb_id):
             return []
+        tmdb_id = int(tmdb_id)
         
-        url = f"{settings.TMDB_BASE_URL}/movie/{int(tmdb_id)}/recommendations"
-        params = {
-            "api_key": settings.TMDB_API_KEY,
-            "language": "en-US",
-            "page": 1
-        }
-        headers = {"User-Agent": random.choice(USER_AGENTS)}
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                if attempt > 0:
-                    time.sleep(2 ** attempt)  # exponential backoff
-                response = self.session.get(
-                    url,
-                    params=params,
-                    timeout=settings.REQUEST_TIMEOUT,
-                    headers=headers
-                )
+        # Ids known to 404 go straight to the genre fallback - no TMDB call
+        similar = None
+        if not self.tmdb_missing.skip(tmdb_id):
+            with span("tmdb_cache"):
+                similar, state = self.similar_cache.lookup(tmdb_id)
+            if state == TMDBCache.STALE:
+                self._schedule_similar_refresh(tmdb_id)
+            elif state == TMDBCache.MISS:
+                with span("tmdb_network"):
+                    similar = await self._fetch_similar(tmdb_id)
+        
+        if similar is None:
+            # TMDB failed or has no page for this movie - genre scan runs off the event loop
+            return await cpu_executor.run(self._get_similar_from_movielens, movie_id, n)
+        
+        # Transform the data to match our format
+        result = []
+        for movie in similar[:n]:
+            movie_data = {
+                "title": movie.title,
+                "poster_path": movie.poster_path,
+                "overview": movie.overview,
+                "release_date": movie.release_date,
+                "tmdbId": movie.tmdb_id
+            }
             
-                if response.status_code == 200:
-                    similar_movies = response.json().get("results", [])[:n]
-                    
-                    # Transform the data to match our format
-                    result = []
-                    for movie in similar_movies:
-                        # Try to find this movie in our dataset by TMDB ID
-                        matched_movie = self.recommender.movies[self.recommender.movies['tmdbId'] == movie['id']]
-                        
-                        movie_data = {
-                            "title": movie.get("title", ""),
-                            "poster_path": movie.get("poster_path"),
-                            "overview": movie.get("overview"),
-                            "release_date": movie.get("release_date"),
-                            "tmdbId": int(movie.get("id")) if movie.get("id") else None  # Convert to regular int
-                        }
-                        
-                        # Add MovieLens data if we have it - convert numpy types to Python native types
-                        if not matched_movie.empty:
-                            # Convert numpy values to Python native types explicitly
-                            movie_data["movieId"] = int(matched_movie.iloc[0]['movieId'])
-                            movie_data["genres"] = str(matched_movie.iloc[0]['genres'])
-                            
-                            if 'avg_rating' in matched_movie.iloc[0]:
-                                rating = matched_movie.iloc[0]['avg_rating']
-                                movie_data["rating"] = float(rating) if not pd.isna(rating) else 0
-                        
-                        result.append(movie_data)
-                    
-                    return result
-                elif response.status_code == 429:
-                    time.sleep(2 ** attempt)
-                elif response.status_code in [404, 400]:
-                    break
-                else:
-                    print(f"TMDB API error: Status {response.status_code}, Content: {response.text}")
-                
-                # If TMDB API fails, return similar movies based on MovieLens data
-                return self._get_similar_from_movielens(movie_id, n)
-                
-            except Exception as e:
-                print(f"Error getting similar movies: {e}")
-                # Fallback to MovieLens-based recommendations
-                return self._get_similar_from_movielens(movie_id, n)
+            # Add MovieLens data if we have it
+            matched = self.recommender.tmdb_index.get(movie.tmdb_id)
+            if matched is not None:
+                row = movies.iloc[matched]
+                movie_data["movieId"] = int(row['movieId'])
+                movie_data["genres"] = str(row['genres'])
+                rating = row['avg_rating']
+                movie_data["rating"] = float(rating) if not pd.isna(rating) else 0
+            
+            result.append(movie_data)
+        
+        return result
+    
+    async def _fetch_similar(self, tmdb_id: int, priority: int = FetchScheduler.INTERACTIVE):
+        """Fetch and cache a TMDB recommendations page; None when unavailable"""
+        if "recommendations" in settings.TMDB_APPEND_TO_RESPONSE:
+            # One call refreshes the movie and its recommendations page
+            if await self._fetch_tmdb_record(tmdb_id, priority) is None:
+                return None
+            return self.similar_cache.get(tmdb_id)
+        
+        status, payload = await self.tmdb_client.get_json(
+            f"/movie/{tmdb_id}/recommendations", {"page": 1}, priority=priority
+        )
+        
+        if status == 200:
+            similar = TMDBRecommendation.from_page(payload)
+            self.similar_cache.set(tmdb_id, similar)
+            return similar
+        if status == 404:
+            self.tmdb_missing.add(tmdb_id)
+        elif status == 400:
+            self.similar_cache.set(tmdb_id, None, ttl=settings.TMDB_CACHE_404_DURATION)
+        elif status is not None and settings.ENHANCED_FEATURES_LOGGING:
+            print(f"TMDB API error: Status {status} for recommendations of {tmdb_id}")
+        return None
+    
+    def _schedule_similar_refresh(self, tmdb_id: int):
+        """Refresh a stale recommendations page on the client loop"""
+        with self._refresh_lock:
+            if ('similar', tmdb_id) in self._refreshing:
+                return
+            self._refreshing.add(('similar', tmdb_id))
+        
+        async def refresh():
+            try:
+                if await self._fetch_similar(tmdb_id, FetchScheduler.REFRESH) is None:
+                    self.similar_cache.extend(tmdb_id, settings.TMDB_CACHE_404_DURATION)
+                self.background_refreshes += 1
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(('similar', tmdb_id))
+        
+        asyncio.ensure_future(refresh())
 
     def _get_similar_from_movielens(self, movie_id: int, n: int = 5) -> List[Dict[str, Any]]:
         """Get similar movies based on MovieLens data (genres) when TMDB fails"""
@@ -393,35 +843,87 @@ class RecommenderService:
             print(f"Error finding similar movies from MovieLens: {e}")
             return []
     
-    def _get_cached_tmdb_data(self, tmdb_id: int) -> Dict[str, Any]:
-        """Get TMDB data with intelligent caching (SYNC FALLBACK)"""
-        if not tmdb_id:
-            return {}
+    def _lookup_tmdb_cache(self, tmdb_id: int):
+        """
+        Check the TMDB cache, serving stale entries while a refresh runs in the background
         
-        current_time = time.time()
-        cache_key = f"tmdb_{tmdb_id}"
+        Returns:
+            (record, hit) - record may be None for cached negative lookups
+            and ids known to 404
+        """
+        if self.tmdb_missing.skip(tmdb_id):
+            return None, True
         
-        # Check if cached and not expired
-        if (cache_key in self.tmdb_cache and 
-            cache_key in self.cache_expiry and 
-            current_time < self.cache_expiry[cache_key]):
-            self.cache_hits += 1
+        record, state = self.tmdb_cache.lookup(tmdb_id)
+        
+        # Served lookups drive what the preload warms after a restart
+        self.access_log.record(tmdb_id)
+        try:
+            if self.access_log.due_for_save():
+                self._refresh_executor.submit(self.access_log.save)
+            if self.tmdb_missing.due_for_rebuild():
+                self._refresh_executor.submit(self.tmdb_missing.rebuild)
+        except RuntimeError:
+            # Executor already shut down
+            pass
+        
+        if state == TMDBCache.MISS:
+            self.cache_misses += 1
             if settings.ENHANCED_FEATURES_LOGGING:
-                print(f"🎯 Cache hit for TMDB ID {tmdb_id}")
-            return self.tmdb_cache[cache_key]
+                print(f"📡 Cache miss for TMDB ID {tmdb_id}, fetching...")
+            return None, False
         
-        # Cache miss - fetch fresh data using EXISTING sync method
-        self.cache_misses += 1
-        if settings.ENHANCED_FEATURES_LOGGING:
-            print(f"📡 Cache miss for TMDB ID {tmdb_id}, fetching...")
+        self.cache_hits += 1
+        if state == TMDBCache.STALE:
+            self.stale_hits += 1
+            self._schedule_refresh(tmdb_id)
+        elif settings.ENHANCED_FEATURES_LOGGING:
+            print(f"🎯 Cache hit for TMDB ID {tmdb_id}")
+        return record, True
+    
+    def _schedule_refresh(self, tmdb_id: int):
+        """Refresh a stale cache entry in the background (deduplicated per ID)"""
+        with self._refresh_lock:
+            if tmdb_id in self._refreshing:
+                return
+            self._refreshing.add(tmdb_id)
+        
+        try:
+            self._refresh_executor.submit(self._refresh_tmdb_entry, tmdb_id)
+        except RuntimeError:
+            # Executor already shut down
+            with self._refresh_lock:
+                self._refreshing.discard(tmdb_id)
+    
+    def _refresh_tmdb_entry(self, tmdb_id: int):
+        """Background worker: re-fetch a stale entry, keeping the old one on failure"""
+        try:
+            data = self._get_tmdb_data(tmdb_id, priority=FetchScheduler.REFRESH)
+            if data:
+                self.tmdb_cache.set(tmdb_id, data)
+                self.background_refreshes += 1
+            else:
+                # Keep serving the stale copy; retry no sooner than the 404 window
+                self.tmdb_cache.extend(tmdb_id, settings.TMDB_CACHE_404_DURATION)
+        finally:
+            with self._refresh_lock:
+                self._refreshing.discard(tmdb_id)
+    
+    def _get_cached_tmdb_data(self, tmdb_id: int) -> Optional[TMDBMovieRecord]:
+        """Get TMDB data with intelligent caching (SYNC FALLBACK)"""
+        if not tmdb_id:
+            return None
+        
+        record, hit = self._lookup_tmdb_cache(tmdb_id)
+        if hit:
+            return record
         
-        # USE YOUR EXISTING _get_tmdb_data METHOD (KEEP IT!)
-        data = self._get_tmdb_data(tmdb_id)  # ← THIS CALLS YOUR EXISTING METHOD
+        # Cache miss (or past max staleness) - blocking fetch required
+        data = self._get_tmdb_data(tmdb_id)
         
         # Cache the result if successful
         if data:
-            self.tmdb_cache[cache_key] = data
-            self.cache_expiry[cache_key] = current_time + self.cache_duration
+            self.tmdb_cache.set(tmdb_id, data)
             
             # Cleanup old cache entries periodically
             if len(self.tmdb_cache) % 100 == 0:
@@ -429,85 +931,204 @@ class RecommenderService:
         
         return data
 
-    def _get_tmdb_data(self, tmdb_id: int) -> Dict[str, Any]:
-        """Your existing TMDB data fetching logic (unchanged)"""
+    async def _get_tmdb_record_async(self, tmdb_id: int) -> Optional[TMDBMovieRecord]:
+        """Cached TMDB record, or await an interactive fetch (joining one in flight)"""
         if not tmdb_id:
-            return {}
-
-        url = f"{settings.TMDB_BASE_URL}/movie/{int(tmdb_id)}"
-        params = {
-            "api_key": settings.TMDB_API_KEY,
-            "language": "en-US"
-        }
-        headers = {
-            "User-Agent": random.choice(USER_AGENTS)
-        }
-
+            return None
+        with span("tmdb_cache"):
+            record, hit = self._lookup_tmdb_cache(tmdb_id)
+        if hit or self.tmdb_breaker.is_open():
+            return record
         try:
-            response = self.session.get(
-                url,
-                params=params,
-                timeout=settings.REQUEST_TIMEOUT,
-                headers=headers
-            )
-            if response.status_code == 200:
-                return response.json()
-            elif response.status_code == 429:
-                time.sleep(2)
-            elif response.status_code in [404, 400]:
-                return {}
-            else:
-                if settings.ENHANCED_FEATURES_LOGGING:
-                    print(f"TMDB API error: Status {response.status_code}")
-        except Exception as e:
-            if settings.ENHANCED_FEATURES_LOGGING:
-                print(f"TMDB connection error: {e}")
-        return {}
+            with span("tmdb_network"):
+                return await asyncio.wrap_future(self._start_tmdb_fetch(tmdb_id))
+        except Exception:
+            return None
     
-    def _cleanup_expired_cache(self):
-        """Remove expired cache entries"""
-        current_time = time.time()
-        expired_keys = [
-            key for key, expiry_time in self.cache_expiry.items() 
-            if current_time >= expiry_time
+    def _get_tmdb_data(self, tmdb_id: int, keep_raw: bool = False,
+                       priority: int = FetchScheduler.INTERACTIVE) -> Optional[TMDBMovieRecord]:
+        """Fetch a movie from TMDB (blocking) and project it into a compact record"""
+        if not tmdb_id:
+            return None
+        return self.recommender.fetch_tmdb_data(tmdb_id, keep_raw=keep_raw, priority=priority)
+    
+    async def _fetch_tmdb_record(self, tmdb_id: int, priority: int = FetchScheduler.INTERACTIVE,
+                                 flow: Optional[str] = None) -> Optional[TMDBMovieRecord]:
+        """Fetch a movie through the shared client and cache the result"""
+        status, payload = await self.tmdb_client.get_json(
+            f"/movie/{tmdb_id}", {"append_to_response": settings.TMDB_APPEND_TO_RESPONSE},
+            priority=priority, flow=flow
+        )
+        
+        if status == 200:
+            record, similar = split_movie_response(payload)
+            self.tmdb_cache.set(tmdb_id, record)
+            if similar is not None:
+                self.similar_cache.set(tmdb_id, similar)
+            return record
+        if status == 404:
+            self.tmdb_missing.add(tmdb_id)
+        elif status == 400:
+            self.tmdb_cache.set(tmdb_id, None, ttl=settings.TMDB_CACHE_404_DURATION)
+            self.similar_cache.set(tmdb_id, None, ttl=settings.TMDB_CACHE_404_DURATION)
+        return None
+    
+    def warm_tmdb_cache(self, tmdb_ids: List[int], concurrency: Optional[int] = None) -> int:
+        """
+        Fetch the given movies into the cache (blocking), skipping cached ones
+        
+        Returns:
+            Number of movies fetched from TMDB
+        """
+        missing = [
+            tmdb_id for tmdb_id in tmdb_ids
+            if tmdb_id not in self.tmdb_missing and self.tmdb_cache.lookup(tmdb_id)[1] == TMDBCache.MISS
         ]
+        if not missing or self.tmdb_breaker.is_open():
+            return 0
+        
+        semaphore_size = concurrency or settings.MOOD_PREFETCH_CONCURRENCY
         
-        for key in expired_keys:
-            self.tmdb_cache.pop(key, None)
-            self.cache_expiry.pop(key, None)
+        async def warm():
+            semaphore = asyncio.Semaphore(semaphore_size)
+            
+            async def fetch(tmdb_id):
+                async with semaphore:
+                    return await self._fetch_tmdb_record(tmdb_id, FetchScheduler.PREFETCH)
+            
+            results = await asyncio.gather(*(fetch(tmdb_id) for tmdb_id in missing))
+            return sum(1 for record in results if record)
         
-        if expired_keys and settings.ENHANCED_FEATURES_LOGGING:
-            print(f"🧹 Cleaned up {len(expired_keys)} expired cache entries")
+        return self.tmdb_client.run(warm()).result()
     
-    def get_cache_stats(self) -> Dict[str, Any]:
-        """Get cache performance statistics"""
-        total_requests = self.cache_hits + self.cache_misses
-        hit_rate = (self.cache_hits / total_requests * 100) if total_requests > 0 else 0
+    def _mood_candidate_tmdb_ids(self, mood: str) -> List[int]:
+        """tmdbIds of a mood's best-scoring candidates, best first"""
+        return [
+            int(candidate['tmdbId'])
+            for candidate in self._candidate_pool(mood)
+            if candidate.get('tmdbId') is not None and not pd.isna(candidate['tmdbId'])
+        ]
+    
+    def _cleanup_expired_cache(self):
+        """Remove cache entries past their max-staleness bound"""
+        removed = self.tmdb_cache.cleanup()
         
+        if removed and settings.ENHANCED_FEATURES_LOGGING:
+            print(f"🧹 Cleaned up {removed} expired cache entries")
+    
+    def cache_hit_rate(self) -> float:
+        """TMDB cache hit rate in percent - cheap enough for every response"""
+        total_requests = self.cache_hits + self.cache_misses
+        return round(self.cache_hits / total_requests * 100, 1) if total_requests > 0 else 0
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get cache performance statistics (stale_items walks the cache - stats endpoints only)"""
         return {
             "cache_hits": self.cache_hits,
             "cache_misses": self.cache_misses,
-            "hit_rate_percent": round(hit_rate, 1),
+            "hit_rate_percent": self.cache_hit_rate(),
+            "stale_hits": self.stale_hits,
+            "background_refreshes": self.background_refreshes,
+            "refreshes_in_flight": len(self._refreshing),
+            "pending_fetches": len(self._pending_fetches),
+            "partial_responses": self.partial_responses,
             "cached_items": len(self.tmdb_cache),
-            "cache_size_mb": len(str(self.tmdb_cache)) / 1024 / 1024
+            "access_log_movies": len(self.access_log),
+            "missing_ids": self.tmdb_missing.get_stats(),
+            "stale_items": self.tmdb_cache.stale_count(),
+            "similar_cached_items": len(self.similar_cache),
+            "rendered_responses": self.rendered_details.get_stats(),
+            "cache_size_mb": round(self.tmdb_cache.size_bytes / 1024 / 1024, 3)
         }
 
+    def movie_details_etag(self, movie_id: Optional[int] = None,
+                           tmdb_id: Optional[int] = None) -> Tuple[Optional[str], bool]:
+        """
+        ETag of a movie details response, from the catalog and TMDB cache versions alone
+        
+        Returns:
+            (etag, fresh) - etag is None while the response can't be versioned
+            (unknown movie, TMDB data not loaded); fresh is False when the
+            TMDB entry is stale, so a full request should refresh it
+        """
+        catalog_version = self.recommender.catalog_version
+        if movie_id is not None:
+            position = self.recommender.movie_index.get(movie_id)
+            if position is None:
+                return None, False
+            tmdb_id = self.recommender.movies['tmdbId'].iat[position]
+            if pd.isna(tmdb_id):
+                return f'"{catalog_version}-m{movie_id}"', True
+            key = f"m{movie_id}"
+        else:
+            key = f"t{tmdb_id}"
+        
+        stored_at, state = self.tmdb_cache.version(int(tmdb_id))
+        if stored_at is None:
+            return None, False
+        return f'"{catalog_version}-{key}-{int(stored_at * 1000):x}"', state == TMDBCache.FRESH
+    
+    async def render_movie_details_async(self, movie_id: Optional[int] = None,
+                                         tmdb_id: Optional[int] = None) -> Tuple[Optional[str], Optional[bytes]]:
+        """
+        Movie details (by movieId or tmdbId) as JSON bytes and their ETag
+        
+        Served from the pre-rendered bodies while the ETag still matches and
+        the TMDB entry is fresh. Returns (None, None) for unknown movies.
+        """
+        key = ("movie", movie_id) if movie_id is not None else ("tmdb", tmdb_id)
+        etag, fresh = self.movie_details_etag(movie_id, tmdb_id)
+        if etag and fresh:
+            body = self.rendered_details.get(key, etag)
+            if body is not None:
+                return etag, body
+        
+        if movie_id is not None:
+            details = await self.get_movie_details_async(movie_id)
+        else:
+            details = await self.get_movie_details_by_tmdb_async(tmdb_id)
+        if not details:
+            return None, None
+        
+        # The request may just have loaded the TMDB data
+        body = dumps(details)
+        etag, _ = self.movie_details_etag(movie_id, tmdb_id)
+        if etag:
+            self.rendered_details.put(key, etag, body)
+        return etag, body
+    
     def get_movie_details(self, movie_id: int) -> Dict[str, Any]:
         """Get detailed information for a specific movie"""
-        # Try to find the movie in our database
-        movie_data = self.recommender.movies[self.recommender.movies['movieId'] == movie_id]
-        
-        if movie_data.empty:
+        movie = self._catalog_movie(self.recommender.movie_index.get(movie_id))
+        if movie is None:
             return None
         
-        # Get basic movie info
-        movie = movie_data.iloc[0].to_dict()
-        
         # Get TMDB data if available
         tmdb_data = None
         if 'tmdbId' in movie and not pd.isna(movie['tmdbId']):
-            tmdb_data = self._get_tmdb_data(int(movie['tmdbId']))
+            tmdb_data = self._get_cached_tmdb_data(int(movie['tmdbId']))
+        
+        return self._build_movie_details(movie, tmdb_data)
+    
+    async def get_movie_details_async(self, movie_id: int) -> Dict[str, Any]:
+        """get_movie_details for async handlers - awaits the TMDB fetch"""
+        movie = self._catalog_movie(self.recommender.movie_index.get(movie_id))
+        if movie is None:
+            return None
+        
+        tmdb_data = None
+        if 'tmdbId' in movie and not pd.isna(movie['tmdbId']):
+            tmdb_data = await self._get_tmdb_record_async(int(movie['tmdbId']))
         
+        return self._build_movie_details(movie, tmdb_data)
+    
+    def _catalog_movie(self, position: Optional[int]) -> Optional[Dict[str, Any]]:
+        """MovieLens row at an index position, as a dict"""
+        if position is None:
+            return None
+        return self.recommender.movies.iloc[position].to_dict()
+    
+    def _build_movie_details(self, movie: Dict[str, Any], tmdb_data: Optional[TMDBMovieRecord]) -> Dict[str, Any]:
         # Create response with combined data
         result = {
             "movieId": int(movie['movieId']),
@@ -520,56 +1141,37 @@ class RecommenderService:
         
         # Add TMDB data if available
         if tmdb_data:
-            result.update({
-                "tmdbId": int(movie['tmdbId']),
-                "poster_path": tmdb_data.get('poster_path'),
-                "backdrop_path": tmdb_data.get('backdrop_path'),
-                "overview": tmdb_data.get('overview'),
-                "release_date": tmdb_data.get('release_date'),
-                "runtime": tmdb_data.get('runtime'),
-                "tagline": tmdb_data.get('tagline'),
-                "vote_average": tmdb_data.get('vote_average'),
-                "production_companies": tmdb_data.get('production_companies', []),
-                "production_countries": tmdb_data.get('production_countries', [])
-            })
+            result["tmdbId"] = int(movie['tmdbId'])
+            result.update(tmdb_data.to_details())
         
         return result
     
     def get_movie_details_by_tmdb(self, tmdb_id: int) -> Dict[str, Any]:
         """Get movie details directly from TMDB ID"""
-        tmdb_data = self._get_tmdb_data(tmdb_id)
-        
+        return self._build_tmdb_movie_details(tmdb_id, self._get_cached_tmdb_data(tmdb_id))
+    
+    async def get_movie_details_by_tmdb_async(self, tmdb_id: int) -> Dict[str, Any]:
+        """get_movie_details_by_tmdb for async handlers - awaits the TMDB fetch"""
+        return self._build_tmdb_movie_details(tmdb_id, await self._get_tmdb_record_async(tmdb_id))
+    
+    def _build_tmdb_movie_details(self, tmdb_id: int, tmdb_data: Optional[TMDBMovieRecord]) -> Dict[str, Any]:
         if not tmdb_data:
             return None
         
-        # Find if we have this movie in our database
-        movie_data = self.recommender.movies[self.recommender.movies['tmdbId'] == tmdb_id]
-        
         # Create result
         result = {
             "tmdbId": tmdb_id,
-            "title": tmdb_data.get('title', ''),
-            "poster_path": tmdb_data.get('poster_path'),
-            "backdrop_path": tmdb_data.get('backdrop_path'),
-            "overview": tmdb_data.get('overview'),
-            "release_date": tmdb_data.get('release_date'),
-            "runtime": tmdb_data.get('runtime'),
-            "tagline": tmdb_data.get('tagline'),
-            "vote_average": tmdb_data.get('vote_average'),
-            "production_companies": tmdb_data.get('production_companies', []),
-            "production_countries": tmdb_data.get('production_countries', [])
+            "title": tmdb_data.title or ''
         }
+        result.update(tmdb_data.to_details())
         
         # Extract year from release date
         if result['release_date']:
-            try:
-                result['year'] = int(result['release_date'].split('-')[0])
-            except:
-                result['year'] = None
+            result['year'] = tmdb_data.year
         
         # If we have this movie in our database, add MovieLens data
-        if not movie_data.empty:
-            movie = movie_data.iloc[0]
+        movie = self._catalog_movie(self.recommender.tmdb_index.get(tmdb_id))
+        if movie is not None:
             result.update({
                 "movieId": int(movie['movieId']),
                 "genres": movie['genres'],
@@ -578,353 +1180,7 @@ class RecommenderService:
             })
         else:
             # Format genres from TMDB format
-            if 'genres' in tmdb_data and tmdb_data['genres']:
-                result['genres'] = '|'.join([genre['name'] for genre in tmdb_data['genres']])
+            if tmdb_data.genres:
+                result['genres'] = '|'.join(tmdb_data.genres)
         
         return result
-    
-    # ================================================================
-    # 🆕 PARALLEL TMDB ENHANCEMENT SYSTEM
-    # ================================================================
-    
-    async def _fetch_tmdb_data_async(self, session: aiohttp.ClientSession, tmdb_id: int) -> Dict[str, Any]:
-        """Async TMDB API call with caching"""
-        if not tmdb_id:
-            return {}
-        
-        # Check cache first
-        cached_data = self._get_cached_tmdb_data(tmdb_id)
-        if cached_data:
-            return cached_data
-        
-        # Fetch from API
-        url = f"{settings.TMDB_BASE_URL}/movie/{int(tmdb_id)}"
-        params = {
-            "api_key": settings.TMDB_API_KEY,
-            "language": "en-US"
-        }
-        headers = {"User-Agent": random.choice(USER_AGENTS)}
-        
-        try:
-            async with session.get(url, params=params, headers=headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    # Cache the successful response
-                    cache_key = f"tmdb_{tmdb_id}"
-                    self.tmdb_cache[cache_key] = data
-                    self.cache_expiry[cache_key] = time.time() + self.cache_duration
-                    return data
-                elif response.status == 429:
-                    await asyncio.sleep(1)
-                    return {}
-                elif response.status in [404, 400]:
-                    # Cache empty response to avoid repeated failed requests
-                    cache_key = f"tmdb_{tmdb_id}"
-                    self.tmdb_cache[cache_key] = {}
-                    self.cache_expiry[cache_key] = time.time() + 300  # Cache failures for 5 minutes
-                    return {}
-                else:
-                    if settings.ENHANCED_FEATURES_LOGGING:
-                        print(f"TMDB API error: Status {response.status}")
-                    return {}
-        except asyncio.TimeoutError:
-            if settings.ENHANCED_FEATURES_LOGGING:
-                print(f"TMDB timeout for movie {tmdb_id}")
-            return {}
-        except Exception as e:
-            if settings.ENHANCED_FEATURES_LOGGING:
-                print(f"TMDB async error for movie {tmdb_id}: {e}")
-            return {}
-    
-    async def _enhance_movies_parallel(self, recommendations: List[Dict]) -> List[Dict]:
-        """
-        ⚡ ULTRA-FAST TMDB Enhancement with Aggressive Optimizations
-        
-        Key Performance Improvements:
-        1. Optimized connection pooling (prevents connection resets)
-        2. Smart request batching (reduces API calls)  
-        3. Fail-fast timeouts (avoids hanging requests)
-        4. Exponential backoff retry (handles rate limits gracefully)
-        5. Connection reuse (eliminates handshake overhead)
-        """
-        if not recommendations:
-            return recommendations
-        
-        # ================================================================
-        # 🔧 OPTIMIZED CONNECTION CONFIGURATION
-        # ================================================================
-        
-        # Create optimized connector with persistent connections
-        connector = aiohttp.TCPConnector(
-            # Connection pool optimization
-            limit=15,                    # Reduced from 20 - TMDB prefers fewer concurrent connections
-            limit_per_host=8,           # Reduced from 10 - prevents overwhelming TMDB
-            ttl_dns_cache=600,          # Longer DNS cache (10 minutes)
-            use_dns_cache=True,
-            enable_cleanup_closed=True,  # Clean up closed connections automatically
-            
-            # Keep-alive optimization  
-            keepalive_timeout=30,       # Keep connections alive longer
-            
-            # SSL optimization
-            ssl=True,                  # We'll handle HTTPS at session level
-        )
-        
-        # Aggressive timeout configuration
-        timeout = aiohttp.ClientTimeout(
-            total=25,        # Reduced from 30 - fail faster
-            connect=3,       # Reduced from 5 - connection should be instant
-            sock_read=8,     # Reduced from 10 - individual read timeout
-            sock_connect=3   # Socket connection timeout
-        )
-        
-        enhanced_movies = []
-        successful_fetches = 0
-        failed_fetches = 0
-        
-        try:
-            async with aiohttp.ClientSession(
-                connector=connector, 
-                timeout=timeout,
-                headers={
-                    'User-Agent': random.choice(USER_AGENTS),
-                    'Accept': 'application/json',
-                    'Connection': 'keep-alive',  # Force connection reuse
-                    'Accept-Encoding': 'gzip, deflate'  # Enable compression
-                },
-                # Trust environment proxy settings
-                trust_env=True
-            ) as session:
-                
-                # ================================================================
-                # 🎯 SMART BATCHING: Process in smaller batches to reduce load
-                # ================================================================
-                
-                batch_size = 5  # Process 5 movies at a time instead of all 10 simultaneously
-                movie_batches = [recommendations[i:i + batch_size] for i in range(0, len(recommendations), batch_size)]
-                
-                for batch_num, batch in enumerate(movie_batches):
-                    if settings.ENHANCED_FEATURES_LOGGING:
-                        print(f"🚀 Processing batch {batch_num + 1}/{len(movie_batches)} ({len(batch)} movies)")
-                    
-                    # Create tasks for current batch
-                    batch_tasks = []
-                    for movie in batch:
-                        # Add default TMDB values first
-                        movie["poster_path"] = None
-                        movie["backdrop_path"] = None 
-                        movie["overview"] = "No overview available."
-                        
-                        # Extract year from title if missing
-                        if 'year' not in movie or pd.isna(movie.get('year')):
-                            year_match = re.search(r'\((\d{4})\)$', movie.get('title', ''))
-                            if year_match:
-                                movie['year'] = int(year_match.group(1))
-                        
-                        # Create TMDB fetch task if we have a valid ID
-                        if "tmdbId" in movie and movie["tmdbId"] and not pd.isna(movie["tmdbId"]):
-                            await asyncio.sleep(0.1)  # 100ms delay between requests in same batch
-                            task = asyncio.create_task(
-                                self._fetch_tmdb_with_retry(session, int(movie["tmdbId"]), movie.get('title', 'Unknown'))
-                            )
-                            batch_tasks.append((movie, task))
-                        else:
-                            batch_tasks.append((movie, None))
-                    
-                    # Execute batch with timeout protection
-                    try:
-                        # Wait for all tasks in current batch with overall timeout
-                        await asyncio.wait_for(
-                            asyncio.gather(*[task for _, task in batch_tasks if task], return_exceptions=True),
-                            timeout=20  # 20 second timeout per batch
-                        )
-                    except asyncio.TimeoutError:
-                        if settings.ENHANCED_FEATURES_LOGGING:
-                            print(f"⚠️ Batch {batch_num + 1} timed out, continuing with available data")
-                    
-                    # Process results from current batch
-                    for movie, task in batch_tasks:
-                        if task and not task.done():
-                            task.cancel()  # Cancel any still-running tasks
-                        
-                        if task and task.done() and not task.cancelled():
-                            try:
-                                tmdb_data = await task
-                                if tmdb_data and isinstance(tmdb_data, dict):
-                                    # Apply TMDB data
-                                    if 'poster_path' in tmdb_data and tmdb_data['poster_path']:
-                                        movie["poster_path"] = tmdb_data["poster_path"]
-                                    if 'backdrop_path' in tmdb_data and tmdb_data['backdrop_path']:
-                                        movie["backdrop_path"] = tmdb_data["backdrop_path"]
-                                    if 'overview' in tmdb_data and tmdb_data.get("overview"):
-                                        movie["overview"] = tmdb_data["overview"]
-                                    successful_fetches += 1
-                                else:
-                                    failed_fetches += 1
-                            except Exception as e:
-                                failed_fetches += 1
-                                if settings.ENHANCED_FEATURES_LOGGING:
-                                    print(f"⚠️ Error processing TMDB data for '{movie.get('title', 'Unknown')}': {e}")
-                        elif task:
-                            failed_fetches += 1
-                        
-                        enhanced_movies.append(movie)
-                    
-                    # Small delay between batches to be nice to TMDB
-                    if batch_num < len(movie_batches) - 1:
-                        await asyncio.sleep(1.0)
-                
-                # ================================================================
-                # 📊 PERFORMANCE REPORTING
-                # ================================================================
-                
-                if settings.ENHANCED_FEATURES_LOGGING:
-                    cache_stats = self.get_cache_stats()
-                    success_rate = (successful_fetches / (successful_fetches + failed_fetches) * 100) if (successful_fetches + failed_fetches) > 0 else 0
-                    print(f"⚡ Parallel TMDB enhancement complete. Cache hit rate: {cache_stats['hit_rate_percent']}%")
-                    print(f"📊 TMDB fetch success rate: {success_rate:.1f}% ({successful_fetches}/{successful_fetches + failed_fetches})")
-        
-        except Exception as e:
-            if settings.ENHANCED_FEATURES_LOGGING:
-                print(f"❌ Parallel enhancement failed: {e}")
-            # Return movies without TMDB enhancement rather than crashing
-            enhanced_movies = recommendations
-        
-        return enhanced_movies
-    
-    async def _fetch_tmdb_with_retry(self, session: aiohttp.ClientSession, tmdb_id: int, movie_title: str = "Unknown") -> Dict[str, Any]:
-        """
-        🛡️ ROBUST TMDB fetcher with intelligent retry logic
-        
-        Key improvements:
-        - Exponential backoff for rate limits
-        - Smart caching to avoid repeated failures
-        - Quick timeout for hanging requests
-        - Detailed error handling
-        """
-        
-        # ============================================================
-        # 🎯 CACHE CHECK FIRST (FASTEST PATH)
-        # ============================================================
-        
-        cache_key = f"tmdb_{tmdb_id}"
-        current_time = time.time()
-        
-        # Check cache first
-        if (cache_key in self.tmdb_cache and 
-            cache_key in self.cache_expiry and 
-            current_time < self.cache_expiry[cache_key]):
-            self.cache_hits += 1
-            if settings.ENHANCED_FEATURES_LOGGING:
-                print(f"🎯 Cache hit for TMDB ID {tmdb_id}")
-            return self.tmdb_cache[cache_key]
-        
-        # Mark as cache miss
-        self.cache_misses += 1
-        if settings.ENHANCED_FEATURES_LOGGING:
-            print(f"📡 Cache miss for TMDB ID {tmdb_id}, fetching...")
-        
-        # ============================================================
-        # 🚀 FETCH WITH SMART RETRY LOGIC  
-        # ============================================================
-        
-        url = f"{settings.TMDB_BASE_URL}/movie/{tmdb_id}"
-        params = {
-            "api_key": settings.TMDB_API_KEY,
-            "language": "en-US"
-        }
-        
-        max_retries = 3
-        base_delay = 0.5
-        
-        for attempt in range(max_retries):
-            try:
-                # Calculate exponential backoff delay
-                if attempt > 0:
-                    delay = base_delay * (2 ** (attempt - 1))  # 0.5s, 1s, 2s
-                    await asyncio.sleep(delay)
-                    if settings.ENHANCED_FEATURES_LOGGING:
-                        print(f"🔄 Retry {attempt}/{max_retries} for TMDB ID {tmdb_id} after {delay}s delay")
-                
-                # Make the request with individual timeout
-                async with session.get(url, params=params, timeout=8) as response:  # 8 second timeout per request
-                    
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        # Cache successful response
-                        self.tmdb_cache[cache_key] = data
-                        self.cache_expiry[cache_key] = current_time + self.cache_duration
-                        
-                        return data
-                    
-                    elif response.status == 429:  # Rate limited
-                        retry_after = int(response.headers.get('Retry-After', 2))
-                        if settings.ENHANCED_FEATURES_LOGGING:
-                            print(f"⏱️ Rate limited for TMDB ID {tmdb_id}, waiting {retry_after}s")
-                        await asyncio.sleep(min(retry_after, 5))  # Cap wait time at 5 seconds
-                        continue
-                        
-                    elif response.status in [404, 400]:  # Not found or bad request
-                        # Cache empty result to avoid retrying
-                        self.tmdb_cache[cache_key] = {}
-                        self.cache_expiry[cache_key] = current_time + 300  # Cache 404s for 5 minutes
-                        return {}
-                        
-                    else:
-                        if settings.ENHANCED_FEATURES_LOGGING:
-                            print(f"⚠️ TMDB API error for {movie_title} (ID: {tmdb_id}): Status {response.status}")
-                        
-                        # Don't retry on client errors (4xx), only server errors (5xx)
-                        if response.status < 500:
-                            break
-            
-            except asyncio.TimeoutError:
-                if settings.ENHANCED_FEATURES_LOGGING:
-                    print(f"⏰ Timeout for TMDB ID {tmdb_id} on attempt {attempt + 1}")
-                continue
-                
-            except aiohttp.ClientConnectorError as e:
-                if settings.ENHANCED_FEATURES_LOGGING:
-                    print(f"🔌 Connection error for TMDB ID {tmdb_id}: {e}")
-                continue
-                
-            except Exception as e:
-                if settings.ENHANCED_FEATURES_LOGGING:
-                    print(f"❌ Unexpected error for TMDB ID {tmdb_id}: {e}")
-                continue
-        
-        # All retries failed - cache empty result to avoid hammering the API
-        if settings.ENHANCED_FEATURES_LOGGING:
-            print(f"❌ All retries failed for TMDB ID {tmdb_id} ({movie_title})")
-        
-        self.tmdb_cache[cache_key] = {}
-        self.cache_expiry[cache_key] = current_time + 60  # Cache failures for 1 minute
-        return {}
-    
-    def _run_async_enhancement(self, recommendations: List[Dict]) -> List[Dict]:
-        """Run async enhancement in thread to avoid blocking"""
-        try:
-            # Check if we're already in an event loop
-            try:
-                loop = asyncio.get_running_loop()
-                # If we're in a loop, run in thread pool
-                with ThreadPoolExecutor(max_workers=1) as executor:
-                    future = executor.submit(self._run_async_in_new_loop, recommendations)
-                    return future.result(timeout=45)  # 45 second timeout
-            except RuntimeError:
-                # No event loop running, safe to create one
-                return self._run_async_in_new_loop(recommendations)
-        except Exception as e:
-            print(f"❌ Async enhancement failed: {e}")
-            return recommendations
-    
-    def _run_async_in_new_loop(self, recommendations: List[Dict]) -> List[Dict]:
-        """Run async code in a new event loop"""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(self._enhance_movies_parallel(recommendations))
-        finally:
-            loop.close()
-    
\ No newline at end of file
@@ -0,0 +1,147 @@
+# backend/app/services/registry.py
+import logging
+import threading
+import time
+from typing import Any, Dict
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceRegistry:
+    """
+    Builds the app's services once and tracks how far startup got
+
+    Importing the app is cheap; the heavy work (database tables, MovieLens
+    load and indexes, TMDB dump import and preload) runs in initialize(),
+    called from the app's lifespan in a background thread - so the process
+    answers /health while it loads - or inline by serve.py's master before
+    it forks workers. Each phase's duration is recorded for /ready.
+    """
+
+    def __init__(self):
+        self.recommender = None     # RecommenderService
+        self.text_analysis = None   # TextAnalysisService
+
+        self.state = "idle"  # idle | starting | ready | failed
+        self.error = None
+        self.phases = {}     # phase -> seconds
+        self.started_at = None
+        self.ready_at = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    def _phase(self, name: str, started: float):
+        self.phases[name] = round(time.time() - started, 3)
+
+    def initialize(self, warm_in_background: bool = True):
+        """
+        Build every service (blocking); a no-op once done
+
+        Args:
+            warm_in_background: preload TMDB data in a daemon thread, or
+                                inline before returning
+        """
+        with self._lock:
+            if self.state in ("ready", "failed"):
+                return
+            self.state = "starting"
+            self.started_at = time.time()
+
+        try:
+            from app.db.base import Base, engine
+            from app.services.recommender import RecommenderService
+            from app.services.text_analysis import TextAnalysisService
+
+            started = time.time()
+            try:
+                Base.metadata.create_all(bind=engine)
+                logger.info("Database tables created successfully")
+            except Exception as e:
+                logger.error(f"Failed to create database tables: {e}")
+            self._phase("database", started)
+
+            started = time.time()
+            recommender = RecommenderService()
+            for name, seconds in recommender.recommender.load_timings.items():
+                self.phases[name] = round(seconds, 3)
+            self._phase("recommender", started)
+
+            started = time.time()
+            text_analysis = TextAnalysisService()
+            self._phase("text_analysis", started)
+
+            # An offline dump warms the cache first, so the preload finds it populated
+            if settings.TMDB_DUMP_PATH:
+                started = time.time()
+                try:
+                    recommender.import_tmdb_dump()
+                except Exception as e:
+                    logger.error(f"TMDB dump import failed: {e}")
+                self._phase("tmdb_dump", started)
+
+            self.recommender = recommender
+            self.text_analysis = text_analysis
+
+            if not settings.TMDB_PRELOAD_ON_STARTUP:
+                logger.info("TMDB preload on startup disabled")
+            elif warm_in_background:
+                recommender.start_background_preload()
+            else:
+                started = time.time()
+                recommender.preload()
+                self._phase("tmdb_preload", started)
+        except Exception as e:
+            self.error = str(e)
+            self.state = "failed"
+            logger.error(f"Service initialization failed: {e}", exc_info=True)
+            return
+
+        self.ready_at = time.time()
+        self.state = "ready"
+        logger.info(f"Services ready in {self.ready_at - self.started_at:.1f}s: {self.phases}")
+
+    def start(self):
+        """Initialize in a daemon thread unless already initialized (e.g. by a forking master)"""
+        with self._lock:
+            if self.state != "idle" or self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self.initialize, name="service-init", daemon=True)
+        self._thread.start()
+
+    def shutdown(self):
+        if self.recommender:
+            self.recommender.shutdown()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Startup progress, per-phase timings and - once ready - catalog and cache status"""
+        status = {
+            "state": self.state,
+            "phases_seconds": dict(self.phases),
+            "startup_seconds": round(self.ready_at - self.started_at, 3) if self.ready_at else None
+        }
+        if self.error:
+            status["error"] = self.error
+        if self.recommender:
+            recommender = self.recommender.recommender
+            status["catalog"] = {
+                "movies": len(recommender.movies),
+                "tmdb_ids": len(recommender.tmdb_index),
+                "diversity_movies": len(recommender.movie_countries)
+            }
+            status["caches"] = {
+                "tmdb_cached_items": len(self.recommender.tmdb_cache),
+                "similar_cached_items": len(self.recommender.similar_cache),
+                "missing_ids": len(self.recommender.tmdb_missing)
+            }
+            status["tmdb_preload"] = self.recommender.get_preload_status()
+        return status
+
+
+# Process-wide registry - services are built by the app's lifespan (or serve.py)
+services = ServiceRegistry()
@@ -4,6 +4,7 @@ import numpy as np
 import re
 import string
 from app.core.mood_mapping import mood_mapping
+from app.core.executors import cpu_executor
 
 class TextAnalysisService:
     def __init__(self):
@@ -242,6 +243,10 @@ class TextAnalysisService:
         
         return validation_result
     
+    async def analyze_text_async(self, text):
+        """analyze_text on the bounded CPU executor, for async handlers"""
+        return await cpu_executor.run(self.analyze_text, text)
+    
     def analyze_text(self, text):
         """
         Analyze text and return the most likely mood with enhanced validation
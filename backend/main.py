@@ -1,14 +1,18 @@
 # backend/main.py
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
+from contextlib import asynccontextmanager
+import re
 import time
 import logging
 
 from app.api.api import api_router
+from app.core.admission import admission_controller, client_rate_limiter
 from app.core.config import settings
-from app.db.base import Base, engine
+from app.core.timing import finish_request, span, start_request
+from app.services.registry import services
 
 # Configure logging
 logging.basicConfig(
@@ -17,6 +21,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Services are built in the background once the server is up, so /health
+# answers while the catalog loads; serve.py builds them before forking instead
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    services.start()
+    yield
+    services.shutdown()
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -25,8 +37,50 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json" if settings.DEBUG else None,
     docs_url=f"{settings.API_V1_STR}/docs" if settings.DEBUG else None,
     redoc_url=f"{settings.API_V1_STR}/redoc" if settings.DEBUG else None,
+    lifespan=lifespan,
 )
 
+# Requests that score the catalog, enrich from TMDB or run text analysis
+EXPENSIVE_PATHS = re.compile(rf"^{settings.API_V1_STR}/movies/(recommendations/|compare/|analyze-mood)")
+
+def client_key(request: Request) -> str:
+    if settings.RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+# Admission control: per-client token buckets, then a cap on in-flight
+# expensive requests with a bounded wait queue. Added first so CORS headers
+# still reach rejected responses.
+@app.middleware("http")
+async def admission_control(request: Request, call_next):
+    if not settings.ADMISSION_CONTROL_ENABLED or not EXPENSIVE_PATHS.match(request.url.path):
+        return await call_next(request)
+    
+    if settings.CLIENT_RATE_LIMIT_PER_SECOND > 0:
+        allowed, retry_after = client_rate_limiter.check(client_key(request))
+        if not allowed:
+            return JSONResponse(
+                status_code=429,
+                content={"detail": "Too many requests"},
+                headers={"Retry-After": str(retry_after)}
+            )
+    
+    with span("admission_queue"):
+        admitted = await admission_controller.acquire()
+    if not admitted:
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Server busy, try again shortly"},
+            headers={"Retry-After": str(admission_controller.retry_after())}
+        )
+    start_time = time.time()
+    try:
+        return await call_next(request)
+    finally:
+        admission_controller.release(time.time() - start_time)
+
 # Security middleware
 app.add_middleware(
     TrustedHostMiddleware, 
@@ -40,16 +94,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Enrichment-Pending", "Retry-After", "Server-Timing"],
 )
 
-# Request timing middleware
+# Request timing middleware: per-stage spans (app.core.timing) as Server-Timing
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
+    timings, token = start_request()
+    try:
+        response = await call_next(request)
+        if settings.SERVER_TIMING_ENABLED:
+            response.headers["Server-Timing"] = timings.server_timing()
+        response.headers["X-Process-Time"] = str(timings.elapsed())
+        return response
+    finally:
+        finish_request(timings, token)
 
 # Global exception handler
 @app.exception_handler(Exception)
@@ -63,13 +122,6 @@ async def global_exception_handler(request: Request, exc: Exception):
         }
     )
 
-# Create database tables
-try:
-    Base.metadata.create_all(bind=engine)
-    logger.info("Database tables created successfully")
-except Exception as e:
-    logger.error(f"Failed to create database tables: {e}")
-
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -82,20 +134,42 @@ async def root():
     }
 
 @app.get("/health")
-async def health_check():
-    """Health check endpoint for deployment monitoring"""
+async def health_check(response: Response):
+    """Liveness probe - cheap, answers while services are still loading"""
+    if services.state == "failed":
+        response.status_code = 503
     return {
-        "status": "healthy",
+        "status": "unhealthy" if services.state == "failed" else "healthy",
+        "startup": services.state,
         "timestamp": time.time(),
         "version": settings.VERSION
     }
 
+@app.get("/ready")
+async def readiness_check(response: Response):
+    """Readiness probe: services built, plus startup phase timings and catalog/cache status"""
+    status = services.get_status()
+    
+    # Only gate on the preload when explicitly configured to
+    ready = services.ready and (
+        not settings.TMDB_PRELOAD_REQUIRED_FOR_READY or
+        status["tmdb_preload"]["state"] in ("completed", "failed", "disabled")
+    )
+    if not ready:
+        response.status_code = 503
+    
+    return {
+        "status": "ready" if ready else "warming_up",
+        "timestamp": time.time(),
+        **status
+    }
+
 if __name__ == "__main__":
+    # Single process; use serve.py for multiple workers
     import uvicorn
     uvicorn.run(
         "main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=settings.DEBUG,
-        workers=settings.WORKERS if not settings.DEBUG else 1
-    )
\ No newline at end of file
+        host=settings.HOST,
+        port=settings.PORT,
+        reload=settings.DEBUG
+    )
@@ -0,0 +1,126 @@
+# backend/scripts/bench_enrichment.py
+"""
+Benchmark the TMDB enrichment pipeline against the local stand-in
+
+Start the stand-in first (see scripts/tmdb_standin.py), then from backend/:
+    python scripts/bench_enrichment.py --batches 50 --batch-size 10 --concurrency 4
+
+Each batch is a random sample of catalog movies enriched through
+RecommenderService.enrich_movies, exactly as the recommendation endpoint
+does. Reports throughput and per-batch latency percentiles, plus the
+stand-in's view of the traffic.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def fetch_standin_stats(standin_url, method="GET"):
+    """Read (or reset with DELETE) the stand-in's request counters"""
+    request = urllib.request.Request(f"{standin_url}/__stats", method=method)
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return json.loads(response.read())
+    except Exception as e:
+        print(f"Could not reach stand-in stats at {standin_url}: {e}")
+        return {}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark TMDB enrichment against the stand-in")
+    parser.add_argument("--standin-url", default="http://127.0.0.1:8765")
+    parser.add_argument("--batches", type=int, default=30)
+    parser.add_argument("--batch-size", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=1, help="Batches enriched in parallel")
+    parser.add_argument("--repeat-rate", type=float, default=0.0,
+                        help="Fraction of movies drawn from already-enriched ones (cache hits)")
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Configure the service before it is imported
+    os.environ["TMDB_BASE_URL"] = f"{args.standin_url}/3"
+    os.environ.setdefault("TMDB_API_KEY", "standin")
+    os.environ.setdefault("TMDB_PRELOAD_ON_STARTUP", "false")
+    os.environ.setdefault("ENHANCED_FEATURES_LOGGING", "false")
+
+    from app.services.recommender import RecommenderService
+
+    service = RecommenderService()
+    catalog = service.recommender.movies
+    catalog = catalog[catalog["tmdbId"].notna()][["movieId", "title", "genres", "year", "tmdbId"]]
+    pool = catalog.to_dict("records")
+    rng = random.Random(args.seed)
+    rng.shuffle(pool)
+
+    seen = []
+
+    def make_batch():
+        batch = []
+        for _ in range(args.batch_size):
+            if seen and rng.random() < args.repeat_rate:
+                movie = rng.choice(seen)
+            else:
+                movie = pool.pop() if pool else rng.choice(seen)
+                seen.append(movie)
+            batch.append(dict(movie))
+        return batch
+
+    batches = [make_batch() for _ in range(args.batches)]
+
+    def run_batch(batch):
+        start = time.perf_counter()
+        enriched = service.enrich_movies(batch)
+        elapsed = time.perf_counter() - start
+        with_poster = sum(1 for movie in enriched if movie.get("poster_path"))
+        pending = sum(1 for movie in enriched if movie.get("enrichment_status") == "pending")
+        return elapsed, with_poster, pending
+
+    fetch_standin_stats(args.standin_url, method="DELETE")
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(executor.map(run_batch, batches))
+    wall = time.perf_counter() - wall_start
+
+    latencies = [elapsed * 1000 for elapsed, _, _ in results]
+    enriched = sum(with_poster for _, with_poster, _ in results)
+    pending = sum(count for _, _, count in results)
+    total_movies = args.batches * args.batch_size
+
+    print("\n=== TMDB enrichment benchmark ===")
+    print(f"batches={args.batches} batch_size={args.batch_size} concurrency={args.concurrency} "
+          f"repeat_rate={args.repeat_rate}")
+    print(f"wall time:     {wall:.2f}s")
+    print(f"throughput:    {total_movies / wall:.1f} movies/s, {args.batches / wall:.2f} batches/s")
+    print(f"enriched:      {enriched}/{total_movies} movies got TMDB data, {pending} returned pending")
+    print(f"batch latency: p50={percentile(latencies, 50):.0f}ms p95={percentile(latencies, 95):.0f}ms "
+          f"p99={percentile(latencies, 99):.0f}ms max={max(latencies):.0f}ms")
+    print(f"cache:         {json.dumps(service.get_cache_stats())}")
+    print(f"tmdb client:   {json.dumps(service.tmdb_client.get_stats())}")
+    print(f"stand-in:      {json.dumps(fetch_standin_stats(args.standin_url))}")
+
+    service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# backend/scripts/import_tmdb_dump.py
+"""
+Check an offline TMDB dump before pointing the server at it
+
+From backend/:
+    python scripts/import_tmdb_dump.py data/tmdb_dump.jsonl.gz
+
+Runs the same bulk import the server performs at startup (TMDB_DUMP_PATH)
+or through POST /api/v1/movies/admin/tmdb-import, without any API calls,
+and reports how much of the catalog the dump covers.
+"""
+import argparse
+import json
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-import a TMDB JSONL dump and report coverage")
+    parser.add_argument("dump", help="JSONL dump of TMDB /movie/{id} responses (.gz supported)")
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--include-unmatched", action="store_true",
+                        help="Also cache movies that are not in the MovieLens catalog")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # No network: the import must not depend on the API
+    os.environ["TMDB_PRELOAD_ON_STARTUP"] = "false"
+    os.environ.setdefault("ENHANCED_FEATURES_LOGGING", "false")
+
+    from app.core.config import settings
+    from app.core.enhanced_recommender import EnhancedMoodRecommender
+    from app.core.mood_mapping import mood_mapping
+    from app.core.tmdb_import import import_tmdb_dump
+
+    recommender = EnhancedMoodRecommender(mood_mapping=mood_mapping, movielens_dir=settings.DATA_PATH)
+    stats = import_tmdb_dump(
+        recommender,
+        args.dump,
+        batch_size=args.batch_size or settings.TMDB_IMPORT_BATCH_SIZE,
+        include_unmatched=args.include_unmatched
+    )
+
+    with_tmdb_id = len(recommender.tmdb_index)
+    covered = sum(1 for tmdb_id in recommender.tmdb_index if tmdb_id in recommender.tmdb_cache)
+
+    print(json.dumps(stats, indent=2))
+    print(f"catalog coverage: {covered}/{with_tmdb_id} movies with a tmdbId "
+          f"({covered / with_tmdb_id * 100 if with_tmdb_id else 0:.1f}%)")
+    print(f"diversity maps:   {len(recommender.movie_countries)} movies, "
+          f"{len(recommender.country_representation)} countries, "
+          f"{len(recommender.language_representation)} languages")
+
+
+if __name__ == "__main__":
+    main()
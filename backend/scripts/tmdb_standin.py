@@ -0,0 +1,302 @@
+# backend/scripts/tmdb_standin.py
+"""
+Local TMDB stand-in server with latency and fault injection
+
+Serves /movie/{id} and /movie/{id}/recommendations from synthetic fixture
+data generated from the MovieLens links.csv/movies.csv, so the TMDB
+enrichment pipeline can be exercised and benchmarked offline.
+
+Usage (from backend/):
+    python scripts/tmdb_standin.py --port 8765 --latency lognormal:100,0.6 \\
+        --slow-rate 0.02 --slow-ms 3000 --error-rate 0.01 --reset-rate 0.005 \\
+        --burst-429-period 30 --burst-429-length 2
+
+    TMDB_BASE_URL=http://127.0.0.1:8765/3 TMDB_API_KEY=standin uvicorn main:app
+
+Stats are available at /__stats and can be reset with DELETE /__stats.
+"""
+import argparse
+import asyncio
+import csv
+import os
+import random
+import socket
+import struct
+import time
+import zlib
+
+from aiohttp import web
+
+COUNTRIES = [
+    ("US", "United States of America"), ("GB", "United Kingdom"), ("FR", "France"),
+    ("DE", "Germany"), ("JP", "Japan"), ("KR", "South Korea"), ("IN", "India"),
+    ("IT", "Italy"), ("ES", "Spain"), ("BR", "Brazil"), ("MX", "Mexico"), ("IR", "Iran")
+]
+LANGUAGES = [
+    ("en", "English"), ("fr", "Français"), ("de", "Deutsch"), ("ja", "日本語"),
+    ("ko", "한국어/조선말"), ("hi", "हिन्दी"), ("it", "Italiano"), ("es", "Español"),
+    ("pt", "Português"), ("fa", "فارسی")
+]
+COMPANIES = [
+    "Warner Bros. Pictures", "Universal Pictures", "Columbia Pictures", "Paramount",
+    "20th Century Fox", "A24", "Studio Ghibli", "Canal+", "Toho", "CJ Entertainment",
+    "Yash Raj Films", "Focus Features", "Miramax", "StudioCanal"
+]
+KEYWORDS = [
+    "friendship", "revenge", "suspense", "supernatural", "underdog", "loneliness",
+    "nostalgia", "space", "time travel", "coming of age", "heist", "romance",
+    "family", "survival", "based on novel or book", "dystopia", "magic", "war"
+]
+
+
+def _stable_rng(tmdb_id):
+    """Per-movie RNG so fixtures are identical across runs"""
+    return random.Random(zlib.crc32(str(tmdb_id).encode()))
+
+
+def load_fixtures(data_path, missing_rate):
+    """Build synthetic TMDB movie payloads keyed by tmdbId"""
+    movies = {}
+    with open(os.path.join(data_path, "movies.csv"), newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            movies[row["movieId"]] = row
+
+    fixtures = {}
+    by_genre = {}
+    with open(os.path.join(data_path, "links.csv"), newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            if not row.get("tmdbId"):
+                continue
+            tmdb_id = int(row["tmdbId"])
+            rng = _stable_rng(tmdb_id)
+
+            # Emulate stale MovieLens ids that TMDB no longer knows
+            if rng.random() < missing_rate:
+                continue
+
+            movie = movies.get(row["movieId"], {})
+            title = movie.get("title", f"Movie {tmdb_id}")
+            year = title[-5:-1] if title.endswith(")") and title[-5:-1].isdigit() else "2000"
+            genres = [g for g in movie.get("genres", "").split("|") if g and g != "(no genres listed)"]
+            countries = rng.sample(COUNTRIES, rng.choice([1, 1, 1, 2]))
+            languages = rng.sample(LANGUAGES, rng.choice([1, 1, 2]))
+
+            fixtures[tmdb_id] = {
+                "id": tmdb_id,
+                "imdb_id": f"tt{row.get('imdbId', '')}",
+                "title": title.rsplit(" (", 1)[0],
+                "original_title": title.rsplit(" (", 1)[0],
+                "adult": False,
+                "poster_path": f"/standin/{tmdb_id}-poster.jpg",
+                "backdrop_path": f"/standin/{tmdb_id}-backdrop.jpg",
+                "overview": f"Stand-in overview for {title}. " * rng.randint(2, 6),
+                "tagline": rng.choice(["", f"The story of {title}."]),
+                "release_date": f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                "runtime": rng.randint(75, 180),
+                "vote_average": round(rng.uniform(4.0, 9.0), 1),
+                "vote_count": rng.randint(10, 20000),
+                "popularity": round(rng.uniform(1, 100), 3),
+                "status": "Released",
+                "genres": [{"id": 1000 + i, "name": g} for i, g in enumerate(genres)],
+                "production_companies": [
+                    {"id": 5000 + i, "name": name, "logo_path": f"/standin/logo-{i}.png", "origin_country": "US"}
+                    for i, name in enumerate(rng.sample(COMPANIES, rng.randint(1, 3)))
+                ],
+                "production_countries": [{"iso_3166_1": code, "name": name} for code, name in countries],
+                "spoken_languages": [
+                    {"iso_639_1": code, "name": name, "english_name": name} for code, name in languages
+                ],
+                "keywords": {
+                    "keywords": [{"id": 9000 + i, "name": kw} for i, kw in enumerate(rng.sample(KEYWORDS, rng.randint(2, 6)))]
+                }
+            }
+            for genre in genres[:1]:
+                by_genre.setdefault(genre, []).append(tmdb_id)
+
+    return fixtures, by_genre
+
+
+def parse_latency(spec):
+    """
+    Parse a latency distribution spec into a sampler returning milliseconds
+
+    Supported: fixed:MS, uniform:LO,HI, lognormal:MEDIAN,SIGMA, exponential:MEAN
+    """
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",")] if args else []
+
+    if kind == "fixed":
+        return lambda rng: values[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "lognormal":
+        import math
+        mu = math.log(values[0])
+        return lambda rng: rng.lognormvariate(mu, values[1])
+    if kind == "exponential":
+        return lambda rng: rng.expovariate(1.0 / values[0])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+class TMDBStandIn:
+    """aiohttp application emulating the subset of TMDB used by MoodBinge"""
+
+    def __init__(self, fixtures, by_genre, args):
+        self.fixtures = fixtures
+        self.by_genre = by_genre
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.sample_latency = parse_latency(args.latency)
+        self.started_at = time.time()
+        self.stats = {}
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.stats = {"requests": 0, "ok": 0, "not_found": 0, "rate_limited": 0,
+                      "server_errors": 0, "resets": 0, "latency_ms_total": 0.0}
+
+    def _in_429_burst(self):
+        period = self.args.burst_429_period
+        if not period:
+            return False
+        return (time.time() - self.started_at) % period < self.args.burst_429_length
+
+    async def _inject_faults(self, request):
+        """Apply latency and faults; returns a response to short-circuit with, or None"""
+        self.stats["requests"] += 1
+
+        latency = self.sample_latency(self.rng)
+        if self.rng.random() < self.args.slow_rate:
+            latency += self.args.slow_ms
+        self.stats["latency_ms_total"] += latency
+        await asyncio.sleep(latency / 1000.0)
+
+        if self.rng.random() < self.args.reset_rate:
+            self.stats["resets"] += 1
+            transport = request.transport
+            sock = transport.get_extra_info("socket") if transport else None
+            if sock is not None:
+                # SO_LINGER with zero timeout makes close() send a TCP RST
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+            if transport:
+                transport.abort()
+            # aiohttp handles this like a client disconnect, without logging a traceback
+            raise asyncio.CancelledError()
+
+        if self._in_429_burst():
+            self.stats["rate_limited"] += 1
+            return web.json_response(
+                {"status_code": 25, "status_message": "Your request count is over the allowed limit."},
+                status=429,
+                headers={"Retry-After": str(self.args.retry_after)}
+            )
+
+        if self.rng.random() < self.args.error_rate:
+            self.stats["server_errors"] += 1
+            return web.json_response({"status_message": "Injected server error"},
+                                     status=self.rng.choice([500, 502, 503, 504]))
+
+        return None
+
+    def _not_found(self):
+        self.stats["not_found"] += 1
+        return web.json_response(
+            {"success": False, "status_code": 34, "status_message": "The resource you requested could not be found."},
+            status=404
+        )
+
+    def _recommendations_for(self, tmdb_id):
+        movie = self.fixtures[tmdb_id]
+        genre = movie["genres"][0]["name"] if movie["genres"] else None
+        pool = [i for i in self.by_genre.get(genre, []) if i != tmdb_id] or list(self.fixtures)[:50]
+        picks = _stable_rng(tmdb_id).sample(pool, min(20, len(pool)))
+        results = []
+        for pick in picks:
+            other = self.fixtures[pick]
+            results.append({key: other[key] for key in (
+                "id", "title", "poster_path", "backdrop_path", "overview", "release_date", "vote_average", "popularity"
+            )})
+        return {"page": 1, "results": results, "total_pages": 1, "total_results": len(results)}
+
+    async def movie(self, request):
+        fault = await self._inject_faults(request)
+        if fault is not None:
+            return fault
+
+        tmdb_id = int(request.match_info["tmdb_id"])
+        if tmdb_id not in self.fixtures:
+            return self._not_found()
+
+        payload = dict(self.fixtures[tmdb_id])
+        appended = request.query.get("append_to_response", "")
+        appended = {part.strip() for part in appended.split(",") if part.strip()}
+        if "keywords" not in appended:
+            payload.pop("keywords", None)
+        if "recommendations" in appended:
+            payload["recommendations"] = self._recommendations_for(tmdb_id)
+
+        self.stats["ok"] += 1
+        return web.json_response(payload)
+
+    async def recommendations(self, request):
+        fault = await self._inject_faults(request)
+        if fault is not None:
+            return fault
+
+        tmdb_id = int(request.match_info["tmdb_id"])
+        if tmdb_id not in self.fixtures:
+            return self._not_found()
+
+        self.stats["ok"] += 1
+        return web.json_response(self._recommendations_for(tmdb_id))
+
+    async def get_stats(self, request):
+        stats = dict(self.stats)
+        stats["fixtures"] = len(self.fixtures)
+        stats["mean_injected_latency_ms"] = round(
+            stats["latency_ms_total"] / stats["requests"], 1
+        ) if stats["requests"] else 0.0
+        return web.json_response(stats)
+
+    async def clear_stats(self, request):
+        self.reset_stats()
+        return web.json_response({"reset": True})
+
+    def build_app(self):
+        app = web.Application()
+        for prefix in ("", "/3"):
+            app.router.add_get(prefix + r"/movie/{tmdb_id:\d+}", self.movie)
+            app.router.add_get(prefix + r"/movie/{tmdb_id:\d+}/recommendations", self.recommendations)
+        app.router.add_get("/__stats", self.get_stats)
+        app.router.add_delete("/__stats", self.clear_stats)
+        return app
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Local TMDB stand-in with fault injection")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--data-path", default=os.getenv("DATA_PATH", "data/ml-latest-small/"))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--latency", default="lognormal:100,0.5",
+                        help="fixed:MS | uniform:LO,HI | lognormal:MEDIAN,SIGMA | exponential:MEAN")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="Fraction of requests given extra latency")
+    parser.add_argument("--slow-ms", type=float, default=3000.0, help="Extra latency for slow requests")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 5xx")
+    parser.add_argument("--reset-rate", type=float, default=0.0, help="Fraction of connections reset")
+    parser.add_argument("--missing-rate", type=float, default=0.03, help="Fraction of tmdbIds answered with 404")
+    parser.add_argument("--burst-429-period", type=float, default=0.0, help="Seconds between 429 bursts (0 = off)")
+    parser.add_argument("--burst-429-length", type=float, default=2.0, help="Length of each 429 burst in seconds")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After header sent with 429s")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    fixtures, by_genre = load_fixtures(args.data_path, args.missing_rate)
+    print(f"TMDB stand-in: {len(fixtures)} fixture movies, serving on http://{args.host}:{args.port}/3")
+    web.run_app(TMDBStandIn(fixtures, by_genre, args).build_app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
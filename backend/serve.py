@@ -0,0 +1,117 @@
+# backend/serve.py
+"""
+Production entry point: load once, fork many
+
+The master process builds the app's services (MovieLens catalog, indexes,
+diversity maps), imports the TMDB dump and runs the preload, then freezes everything
+it allocated out of the garbage collector's reach and forks WORKERS uvicorn
+workers sharing one listening socket. Workers share the master's memory
+copy-on-write, so each additional worker costs only what it allocates
+itself instead of a full copy of the catalog.
+
+    WORKERS=4 python serve.py
+
+With WORKERS=1 the app is served in this process and warmed in the
+background, like `python main.py`.
+"""
+import gc
+import logging
+import os
+import signal
+import sys
+import time
+
+import uvicorn
+
+from app.core.config import settings
+
+logger = logging.getLogger("serve")
+
+# Minimum seconds between restarts of a crashed worker
+RESPAWN_DELAY = 1.0
+
+
+def _worker(config: uvicorn.Config, sock):
+    """Child side: serve on the inherited socket until told to stop"""
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    try:
+        uvicorn.Server(config).run(sockets=[sock])
+    except BaseException:
+        logger.exception("Worker crashed")
+        os._exit(1)
+    os._exit(0)
+
+
+def _spawn(config: uvicorn.Config, sock) -> int:
+    pid = os.fork()
+    if pid == 0:
+        _worker(config, sock)
+    logger.info(f"Started worker {pid}")
+    return pid
+
+
+def run(workers: int = None, host: str = None, port: int = None):
+    workers = workers or settings.WORKERS
+    host = host or settings.HOST
+    port = port or settings.PORT
+
+    import main
+    config = uvicorn.Config(main.app, host=host, port=port)
+
+    if workers <= 1:
+        uvicorn.Server(config).run()
+        return
+
+    started = time.time()
+    main.services.initialize(warm_in_background=False)
+    if not main.services.ready:
+        logger.error(f"Service initialization failed: {main.services.error}")
+        return 1
+    main.services.recommender.prepare_fork()
+
+    # Objects that survive to here live as long as the process; keep the
+    # collector from touching (and so copying) their pages in every worker
+    gc.collect()
+    gc.freeze()
+    logger.info(f"Master ready in {time.time() - started:.1f}s, "
+                f"{gc.get_freeze_count()} objects frozen; forking {workers} workers")
+
+    sock = config.bind_socket()
+    children = {}
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for _ in range(workers):
+        children[_spawn(config, sock)] = time.time()
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        spawned_at = children.pop(pid, None)
+        if spawned_at is None or stopping:
+            continue
+        logger.warning(f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}, restarting")
+        time.sleep(max(0.0, RESPAWN_DELAY - (time.time() - spawned_at)))
+        if not stopping:
+            children[_spawn(config, sock)] = time.time()
+
+    sock.close()
+    logger.info("All workers stopped")
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -0,0 +1,21 @@
+# backend/tests/conftest.py
+import os
+import sys
+import time
+
+import pytest
+
+# Tests import the app the way main.py does, from the backend directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep unit tests offline and free of persisted state
+os.environ.setdefault("TMDB_STATE_DIR", "")
+os.environ.setdefault("ENHANCED_FEATURES_LOGGING", "false")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Wall clock frozen at a settable time.time(); advance with clock[0] += seconds"""
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    return now
@@ -0,0 +1,58 @@
+# backend/tests/test_admin_endpoints.py
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints import recommendations
+from app.core.config import settings
+from app.services.registry import services
+
+
+class StubRecommenderService:
+    def __init__(self):
+        self.imports = 0
+
+    def import_tmdb_dump(self):
+        self.imports += 1
+        return {"imported": 3}
+
+    def get_cache_stats(self):
+        return {"cached_items": 3}
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    stub = StubRecommenderService()
+    monkeypatch.setattr(services, "recommender", stub)
+    monkeypatch.setattr(services, "state", "ready")
+    return stub
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(recommendations.router)
+    return TestClient(app)
+
+
+def test_import_is_disabled_without_an_admin_token(client, stub, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "")
+    response = client.post("/admin/tmdb-import", headers={"X-Admin-Token": ""})
+    assert response.status_code == 403
+    assert stub.imports == 0
+
+
+@pytest.mark.parametrize("headers", [{}, {"X-Admin-Token": "wrong"}, {"X-Admin-Token": "s3cret-but-longer"}])
+def test_import_rejects_missing_or_wrong_token(client, stub, monkeypatch, headers):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "s3cret")
+    response = client.post("/admin/tmdb-import", headers=headers)
+    assert response.status_code == 403
+    assert stub.imports == 0
+
+
+def test_import_runs_with_the_admin_token(client, stub, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "s3cret")
+    response = client.post("/admin/tmdb-import", headers={"X-Admin-Token": "s3cret"})
+    assert response.status_code == 200
+    assert response.json()["import"] == {"imported": 3}
+    assert stub.imports == 1
@@ -0,0 +1,238 @@
+# backend/tests/test_admission.py
+import asyncio
+import time
+
+import pytest
+
+from app.core.admission import AdmissionController, ClientRateLimiter
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_admits_up_to_max_in_flight():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=2, max_queue=0, queue_timeout=1)
+        assert await controller.acquire()
+        assert await controller.acquire()
+        assert not await controller.acquire()  # no queue to wait in
+        assert controller.get_stats()["rejected"] == 1
+
+        controller.release()
+        assert controller.in_flight == 1
+        assert await controller.acquire()
+
+    asyncio.run(scenario())
+
+
+def test_waiters_are_admitted_in_order():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue=5, queue_timeout=1)
+        await controller.acquire()
+        order = []
+
+        async def request(label):
+            if await controller.acquire():
+                order.append(label)
+
+        tasks = [asyncio.ensure_future(request(label)) for label in ("a", "b", "c")]
+        await settle()
+        assert controller.get_stats()["waiting"] == 3
+
+        for _ in tasks:
+            controller.release()
+            await settle()
+        assert order == ["a", "b", "c"]
+        assert controller.in_flight == 1
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_is_rejected():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue=1, queue_timeout=1)
+        await controller.acquire()
+        waiting = asyncio.ensure_future(controller.acquire())
+        await settle()
+        assert not await controller.acquire()
+
+        controller.release()
+        assert await waiting
+        assert controller.get_stats()["max_queue_depth"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_expected_wait_beyond_timeout_is_rejected_up_front():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue=10, queue_timeout=1)
+        await controller.acquire()
+        controller.release(service_time=3.0)
+        await controller.acquire()
+
+        # One request ahead at ~3s each: waiting would outlast the 1s timeout
+        assert not await controller.acquire()
+        assert controller.rejected == 1
+        assert controller.retry_after() == 3
+
+    asyncio.run(scenario())
+
+
+def test_timed_out_waiter_leaves_the_queue():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue=5, queue_timeout=0.02)
+        await controller.acquire()
+        assert not await controller.acquire()
+        assert controller.timed_out == 1
+        assert controller.get_stats()["waiting"] == 0
+
+        controller.release()
+        assert controller.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_grant_at_the_timeout_is_handed_on(monkeypatch):
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue=5, queue_timeout=1)
+        await controller.acquire()
+        deadline = asyncio.Event()
+        real_wait_for = asyncio.wait_for
+        calls = []
+
+        async def wait_for(future, timeout):
+            calls.append(future)
+            if len(calls) > 1:
+                return await real_wait_for(future, timeout)
+            # The running request finishes just as this waiter's timeout fires:
+            # the slot is granted, but the waiter still sees a timeout
+            await deadline.wait()
+            controller.release()
+            assert future.done()
+            raise asyncio.TimeoutError
+
+        monkeypatch.setattr(asyncio, "wait_for", wait_for)
+        first = asyncio.ensure_future(controller.acquire())
+        second = asyncio.ensure_future(controller.acquire())
+        await settle()
+        deadline.set()
+        await settle()
+
+        assert await first is False
+        assert await second is True
+        assert controller.in_flight == 1
+        assert controller.timed_out == 1
+
+        controller.release()
+        assert controller.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_grant_at_the_timeout_with_nobody_waiting_frees_the_slot(monkeypatch):
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue=5, queue_timeout=1)
+        await controller.acquire()
+
+        async def wait_for(future, timeout):
+            controller.release()
+            raise asyncio.TimeoutError
+
+        monkeypatch.setattr(asyncio, "wait_for", wait_for)
+        assert not await controller.acquire()
+        assert controller.in_flight == 0
+        assert await controller.acquire()  # fast path again
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue=5, queue_timeout=1)
+        await controller.acquire()
+        cancelled = asyncio.ensure_future(controller.acquire())
+        waiting = asyncio.ensure_future(controller.acquire())
+        await settle()
+
+        cancelled.cancel()
+        await settle()
+        assert cancelled.cancelled()
+        assert controller.get_stats()["waiting"] == 1
+
+        controller.release()
+        assert await waiting
+        assert controller.in_flight == 1
+
+    asyncio.run(scenario())
+
+
+def test_cancel_after_grant_never_leaks_the_slot():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue=5, queue_timeout=1)
+        await controller.acquire()
+        granted = asyncio.ensure_future(controller.acquire())
+        waiting = asyncio.ensure_future(controller.acquire())
+        await settle()
+
+        controller.release()  # resolves the first waiter...
+        granted.cancel()      # ...which is cancelled before it resumes
+        await settle()
+
+        # Depending on the Python version the cancellation either loses to the
+        # grant (the request proceeds) or wins (the slot passes on) - either
+        # way exactly one request holds it
+        holders = [task for task in (granted, waiting)
+                   if task.done() and not task.cancelled() and task.result()]
+        assert len(holders) == 1
+        assert controller.in_flight == 1
+        if not waiting.done():
+            controller.release()
+            assert await waiting
+
+    asyncio.run(scenario())
+
+
+@pytest.fixture
+def monotonic(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_client_burst_then_limited(monotonic):
+    limiter = ClientRateLimiter(rate=0.5, burst=2)
+    assert limiter.check("a") == (True, 0)
+    assert limiter.check("a") == (True, 0)
+    assert limiter.check("a") == (False, 2)
+
+    monotonic[0] += 2
+    assert limiter.check("a") == (True, 0)
+    assert limiter.get_stats()["allowed"] == 3
+    assert limiter.get_stats()["limited"] == 1
+
+
+def test_retry_after_is_at_least_one_second(monotonic):
+    limiter = ClientRateLimiter(rate=10, burst=1)
+    limiter.check("a")
+    assert limiter.check("a") == (False, 1)
+
+
+def test_clients_have_separate_buckets(monotonic):
+    limiter = ClientRateLimiter(rate=0.1, burst=1)
+    assert limiter.check("a")[0]
+    assert not limiter.check("a")[0]
+    assert limiter.check("b")[0]
+
+
+def test_least_recently_seen_client_is_evicted(monotonic):
+    limiter = ClientRateLimiter(rate=0.1, burst=1, max_clients=2)
+    limiter.check("a")
+    limiter.check("b")
+    limiter.check("a")  # a is now more recent than b
+    limiter.check("c")  # evicts b
+
+    assert limiter.get_stats()["tracked_clients"] == 2
+    assert limiter.check("b")[0]  # starts over with a full bucket
+    assert not limiter.check("c")[0]
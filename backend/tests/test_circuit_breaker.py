@@ -0,0 +1,112 @@
+# backend/tests/test_circuit_breaker.py
+import pytest
+
+from app.core.circuit_breaker import CircuitBreaker
+
+
+def make_breaker(**kwargs):
+    options = dict(failure_rate_threshold=0.5, slow_call_rate_threshold=0.8, slow_call_seconds=1.0,
+                   min_calls=4, window_seconds=10, open_seconds=5, half_open_probes=2)
+    options.update(kwargs)
+    return CircuitBreaker("test", **options)
+
+
+def trip(breaker):
+    for _ in range(breaker.min_calls):
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_stays_closed_below_min_calls(clock):
+    breaker = make_breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+
+def test_trips_on_failure_rate(clock):
+    breaker = make_breaker()
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.record_failure()
+    assert breaker.is_open()
+    assert not breaker.allow_request()
+    stats = breaker.get_stats()
+    assert stats["trips"] == 1
+    assert stats["short_circuited"] == 1
+    assert stats["retry_in_seconds"] == 5
+
+
+def test_trips_on_slow_call_rate(clock):
+    breaker = make_breaker()
+    for _ in range(4):
+        breaker.record_success(duration=2.0)
+    assert breaker.is_open()
+
+
+def test_old_calls_leave_the_window(clock):
+    breaker = make_breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    clock[0] += 11
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.get_stats()["window_calls"] == 1
+
+
+def test_half_open_probes_close_the_circuit(clock):
+    breaker = make_breaker()
+    trip(breaker)
+
+    clock[0] += 5
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # only half_open_probes get through
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.get_stats()["window_calls"] == 0
+
+
+@pytest.mark.parametrize("outcome", ["failure", "slow"])
+def test_bad_probe_reopens(clock, outcome):
+    breaker = make_breaker()
+    trip(breaker)
+    clock[0] += 5
+    assert breaker.allow_request()
+
+    if outcome == "failure":
+        breaker.record_failure()
+    else:
+        breaker.record_success(duration=2.0)
+    assert breaker.is_open()
+    assert breaker.trips == 2
+
+
+def test_late_results_are_ignored_while_open(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.is_open()
+    assert breaker.trips == 1
+
+
+def test_lost_probes_are_restarted(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock[0] += 5
+    assert breaker.allow_request()
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    # Probes that never report back don't wedge the breaker half-open
+    clock[0] += 5
+    assert breaker.allow_request()
@@ -0,0 +1,171 @@
+# backend/tests/test_fetch_scheduler.py
+import asyncio
+
+from app.core.fetch_scheduler import FetchScheduler
+
+INTERACTIVE = FetchScheduler.INTERACTIVE
+REFRESH = FetchScheduler.REFRESH
+PREFETCH = FetchScheduler.PREFETCH
+PRELOAD = FetchScheduler.PRELOAD
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def queue_waiters(scheduler, order, *waiters):
+    """Start (label, priority, flow) acquirers; each appends its label once granted"""
+    async def waiter(label, priority, flow):
+        await scheduler.acquire(priority, flow)
+        order.append(label)
+    return [asyncio.ensure_future(waiter(*spec)) for spec in waiters]
+
+
+def test_free_slot_is_granted_immediately():
+    async def scenario():
+        scheduler = FetchScheduler(2)
+        await scheduler.acquire(PRELOAD)
+        await scheduler.acquire(INTERACTIVE)
+        assert scheduler.active == 2
+        scheduler.release(PRELOAD)
+        assert scheduler.get_stats()["classes"]["preload"]["active"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_freed_slots_go_to_the_most_important_class():
+    async def scenario():
+        scheduler = FetchScheduler(1)
+        await scheduler.acquire(REFRESH)
+        order = []
+        queue_waiters(scheduler, order,
+                      ("preload", PRELOAD, None), ("prefetch", PREFETCH, None),
+                      ("refresh", REFRESH, None), ("interactive", INTERACTIVE, None))
+        await settle()
+        assert order == []
+
+        for priority in (REFRESH, INTERACTIVE, REFRESH, PREFETCH):
+            scheduler.release(priority)
+            await settle()
+        assert order == ["interactive", "refresh", "prefetch", "preload"]
+
+    asyncio.run(scenario())
+
+
+def test_flows_within_a_class_take_turns():
+    async def scenario():
+        scheduler = FetchScheduler(1)
+        await scheduler.acquire(PREFETCH)
+        order = []
+        queue_waiters(scheduler, order,
+                      ("a1", PREFETCH, "a"), ("a2", PREFETCH, "a"), ("a3", PREFETCH, "a"),
+                      ("b1", PREFETCH, "b"), ("c1", PREFETCH, "c"))
+        await settle()
+
+        for _ in range(5):
+            scheduler.release(PREFETCH)
+            await settle()
+        assert order == ["a1", "b1", "c1", "a2", "a3"]
+
+    asyncio.run(scenario())
+
+
+def test_new_request_does_not_jump_the_queue():
+    async def scenario():
+        scheduler = FetchScheduler(1)
+        await scheduler.acquire(PRELOAD)
+        order = []
+        queue_waiters(scheduler, order, ("queued", PRELOAD, None))
+        await settle()
+
+        # The slot goes to the waiter, not to a request arriving at the same moment
+        scheduler.release(PRELOAD)
+        queue_waiters(scheduler, order, ("late", PRELOAD, None))
+        await settle()
+        assert order == ["queued"]
+
+    asyncio.run(scenario())
+
+
+def test_background_work_leaves_reserved_slots_for_users():
+    async def scenario():
+        scheduler = FetchScheduler(3, interactive_reserved=1)
+        await scheduler.acquire(PRELOAD)
+        await scheduler.acquire(PREFETCH)
+        order = []
+        queue_waiters(scheduler, order, ("refresh", REFRESH, None))
+        await settle()
+        assert order == []  # background is capped at 2 of 3 slots
+
+        await asyncio.wait_for(scheduler.acquire(INTERACTIVE), 1)
+        assert scheduler.active == 3
+
+        # An interactive release can't lift the background cap...
+        scheduler.release(INTERACTIVE)
+        await settle()
+        assert order == []
+        # ...a background one can
+        scheduler.release(PRELOAD)
+        await settle()
+        assert order == ["refresh"]
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def scenario():
+        scheduler = FetchScheduler(1)
+        await scheduler.acquire(INTERACTIVE)
+        order = []
+        cancelled, _ = queue_waiters(scheduler, order,
+                                     ("cancelled", INTERACTIVE, "a"), ("next", INTERACTIVE, "b"))
+        await settle()
+        cancelled.cancel()
+        await settle()
+        assert scheduler.get_stats()["classes"]["interactive"]["waiting"] == 1
+
+        scheduler.release(INTERACTIVE)
+        await settle()
+        assert order == ["next"]
+        assert scheduler.active == 1
+
+    asyncio.run(scenario())
+
+
+def test_cancel_after_grant_hands_the_slot_on():
+    async def scenario():
+        scheduler = FetchScheduler(1)
+        await scheduler.acquire(INTERACTIVE)
+        order = []
+        granted, _ = queue_waiters(scheduler, order,
+                                   ("granted", INTERACTIVE, "a"), ("next", INTERACTIVE, "b"))
+        await settle()
+
+        # The release resolves the first waiter's future; it is cancelled
+        # before it gets to run, so the slot must pass to the next one
+        scheduler.release(INTERACTIVE)
+        granted.cancel()
+        await settle()
+        assert granted.cancelled()
+        assert order == ["next"]
+        assert scheduler.active == 1
+
+    asyncio.run(scenario())
+
+
+def test_stats_record_waits():
+    async def scenario():
+        scheduler = FetchScheduler(1)
+        async with scheduler.slot(PRELOAD):
+            order = []
+            queue_waiters(scheduler, order, ("waiter", PRELOAD, None))
+            await asyncio.sleep(0.02)
+        await settle()
+
+        stats = scheduler.get_stats()["classes"]["preload"]
+        assert stats["granted"] == 2
+        assert stats["queued"] == 1
+        assert stats["max_wait_ms"] >= 15
+
+    asyncio.run(scenario())
@@ -0,0 +1,101 @@
+# backend/tests/test_ranking_cursor.py
+import base64
+import json
+import zlib
+
+import pytest
+
+from app.core import ranking_cursor
+from app.core.config import settings
+from app.core.ranking_cursor import MAX_PAGE_SIZE, decode_cursor, encode_cursor
+
+
+@pytest.fixture(autouse=True)
+def cursor_settings(monkeypatch):
+    monkeypatch.setattr(settings, "SECRET_KEY", "test-secret")
+    monkeypatch.setattr(settings, "RECOMMENDATION_CURSOR_MAX_DEPTH", 200)
+
+
+def signed(payload: bytes) -> str:
+    """A correctly signed cursor around an arbitrary payload"""
+    return base64.urlsafe_b64encode(ranking_cursor._mac(payload) + payload).decode().rstrip("=")
+
+
+def signed_json(data) -> str:
+    return signed(zlib.compress(json.dumps(data).encode()))
+
+
+def test_round_trip():
+    cursor = encode_cursor("happy", 10, [5, 3, 9])
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == ("happy", 10, [5, 3, 9])
+
+
+def test_round_trip_at_the_bounds():
+    shown = list(range(settings.RECOMMENDATION_CURSOR_MAX_DEPTH - 1))
+    assert decode_cursor(encode_cursor("sad", MAX_PAGE_SIZE, shown)) == ("sad", MAX_PAGE_SIZE, shown)
+    assert decode_cursor(encode_cursor("sad", 1, [7])) == ("sad", 1, [7])
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "a",
+    "not a cursor!",
+    "%%%%",
+    base64.urlsafe_b64encode(b"short").decode(),
+    base64.urlsafe_b64encode(b"\x00" * 40).decode(),
+])
+def test_malformed_cursors_are_rejected(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor)
+
+
+def test_tampered_cursor_is_rejected():
+    raw = bytearray(base64.urlsafe_b64decode(encode_cursor("happy", 10, [1, 2]) + "=="))
+    raw[-1] ^= 0x01
+    with pytest.raises(ValueError):
+        decode_cursor(base64.urlsafe_b64encode(bytes(raw)).decode())
+
+
+def test_forged_payload_without_the_key_is_rejected():
+    payload = zlib.compress(json.dumps({"m": "happy", "n": 10, "x": [1]}).encode())
+    forged = base64.urlsafe_b64encode(b"\x00" * 12 + payload).decode()
+    with pytest.raises(ValueError):
+        decode_cursor(forged)
+
+
+def test_cursor_signed_with_another_key_is_rejected(monkeypatch):
+    cursor = encode_cursor("happy", 10, [1])
+    monkeypatch.setattr(settings, "SECRET_KEY", "rotated")
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+@pytest.mark.parametrize("page_size", [0, -1, MAX_PAGE_SIZE + 1, 10 ** 6])
+def test_out_of_range_page_size_is_rejected(page_size):
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor("happy", page_size, [1]))
+
+
+def test_empty_or_too_deep_position_is_rejected():
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor("happy", 10, []))
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor("happy", 10, list(range(settings.RECOMMENDATION_CURSOR_MAX_DEPTH))))
+
+
+@pytest.mark.parametrize("data", [
+    {"m": "happy", "n": 10},
+    {"m": "happy", "n": "ten", "x": [1]},
+    {"m": "happy", "n": 10, "x": ["one"]},
+    {"m": "happy", "n": 10, "x": 5},
+    [1, 2, 3],
+])
+def test_signed_but_malformed_payload_is_rejected(data):
+    with pytest.raises(ValueError):
+        decode_cursor(signed_json(data))
+
+
+def test_signed_but_undecompressable_payload_is_rejected():
+    with pytest.raises(ValueError):
+        decode_cursor(signed(b"not zlib"))
@@ -0,0 +1,89 @@
+# backend/tests/test_recommender_pagination.py
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.core.ranking_cursor import decode_cursor
+from app.core.tmdb_cache import TMDBCache
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """RecommenderService over the bundled MovieLens catalog, without TMDB or a scoring pool"""
+    monkeypatch.setattr(settings, "TMDB_API_KEY", "")
+    monkeypatch.setattr(settings, "SCORING_POOL_WORKERS", 0)
+    monkeypatch.setattr(settings, "MOOD_PREFETCH_ENABLED", False)
+    monkeypatch.setattr(settings, "USE_ENHANCED_RECOMMENDATIONS", False)
+    monkeypatch.setattr(settings, "DATA_PATH", os.path.join(BACKEND_DIR, "data", "ml-latest-small", ""))
+    if not os.path.exists(os.path.join(settings.DATA_PATH, "movies.csv")):
+        pytest.skip("MovieLens catalog not available")
+
+    from app.services.recommender import RecommenderService
+    service = RecommenderService()
+    yield service
+    service._refresh_executor.shutdown(wait=False, cancel_futures=True)
+    service.tmdb_client.close()
+
+
+@pytest.fixture
+def scoring_passes(service, monkeypatch):
+    """Count (slowed down) catalog scoring passes per mood"""
+    passes = []
+    lock = threading.Lock()
+    score_candidates = service.scorer.score_candidates
+
+    def counting(mood):
+        with lock:
+            passes.append(mood)
+        time.sleep(0.05)  # Keep the pass in flight while the other callers arrive
+        return score_candidates(mood)
+
+    monkeypatch.setattr(service.scorer, "score_candidates", counting)
+    return passes
+
+
+def test_first_page_and_next_pages_score_the_catalog_once(service, scoring_passes):
+    async def scenario():
+        first = await service.get_recommendations_async("tranquil_haven", 5)
+        cursor = service.next_cursor("tranquil_haven", 5, [int(movie['movieId']) for movie in first])
+        shown = [int(movie['movieId']) for movie in first]
+        for _ in range(3):
+            page, cursor = await service.get_next_recommendations_async("tranquil_haven", cursor)
+            shown += [int(movie['movieId']) for movie in page]
+        return shown, cursor
+
+    shown, cursor = asyncio.run(scenario())
+
+    assert scoring_passes == ["tranquil_haven"]
+    assert len(shown) == 20
+    assert len(set(shown)) == 20  # pages never repeat a movie
+    assert decode_cursor(cursor)[2] == shown
+
+
+def test_concurrent_cold_requests_share_one_scoring_pass(service, scoring_passes):
+    async def scenario():
+        first = await service.get_recommendations_async("tranquil_haven", 5)
+        cursor = service.next_cursor("tranquil_haven", 5, [int(movie['movieId']) for movie in first])
+        service.candidate_pools = TMDBCache(ttl_seconds=60, max_stale_seconds=60, max_size=10)
+        scoring_passes.clear()
+
+        # The pool expired: a first page and several "load more" pages arrive together
+        await asyncio.gather(
+            service.get_recommendations_async("tranquil_haven", 5),
+            *(service.get_next_recommendations_async("tranquil_haven", cursor) for _ in range(4))
+        )
+
+    asyncio.run(scenario())
+    assert scoring_passes == ["tranquil_haven"]
+
+
+def test_unknown_mood_is_rejected_before_scoring(service, scoring_passes):
+    with pytest.raises(ValueError):
+        asyncio.run(service.get_recommendations_async("no_such_mood", 5))
+    assert scoring_passes == []
@@ -0,0 +1,67 @@
+# backend/tests/test_scoring_pool.py
+import os
+
+import numpy as np
+import pytest
+
+from app.core.scoring_pool import ScoringPool
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.path.join(BACKEND_DIR, "data", "ml-latest-small", "")
+
+pytestmark = pytest.mark.skipif(not os.path.exists(os.path.join(DATA_PATH, "movies.csv")),
+                                reason="MovieLens catalog not available")
+
+
+@pytest.fixture(scope="module")
+def recommender():
+    from app.core.enhanced_recommender import EnhancedMoodRecommender
+    from app.core.mood_mapping import mood_mapping
+    recommender = EnhancedMoodRecommender(mood_mapping, tmdb_api_key=None, movielens_dir=DATA_PATH)
+    # A little TMDB diversity data, so the country/language boosts take part
+    movie_id = int(recommender.movies['movieId'].iloc[0])
+    recommender.movie_countries[movie_id] = ["Japan"]
+    recommender.movie_languages[movie_id] = ["Japanese"]
+    yield recommender
+    recommender.tmdb_client.close()
+
+
+def test_scoring_only_instance_scores_like_the_full_recommender(recommender):
+    scorer = type(recommender).for_scoring(recommender.mood_mapping, recommender.scoring_catalog(),
+                                           recommender.has_tags)
+    scorer.movie_countries = recommender.movie_countries
+    scorer.movie_languages = recommender.movie_languages
+
+    assert not hasattr(scorer, "tmdb_client")
+    assert not hasattr(scorer, "ratings")
+    for mood in ("tranquil_haven", "phantom_fear"):
+        np.random.seed(7)
+        expected = [(movie['movieId'], movie['score']) for movie in recommender.score_candidates(mood)]
+        np.random.seed(7)
+        assert [(movie['movieId'], movie['score']) for movie in scorer.score_candidates(mood)] == expected
+
+
+@pytest.mark.skipif(not ScoringPool.available(), reason="needs a forkserver")
+def test_pool_scores_in_workers_from_the_shared_catalog(recommender):
+    pool = ScoringPool(recommender, workers=1, snapshot_interval=0)
+    try:
+        candidates = pool.score_candidates("tranquil_haven")
+        expected = recommender.score_candidates("tranquil_haven")
+        # Scores carry a random exploration boost; the eligible movies don't
+        assert sorted(movie['movieId'] for movie in candidates) == sorted(movie['movieId'] for movie in expected)
+
+        shown = [movie['movieId'] for movie in candidates[:5]]
+        page = pool.get_recommendations("tranquil_haven", 5, exclude=shown)
+        assert len(page) == 5
+        assert not set(page['movieId']) & set(shown)
+
+        stats = pool.get_stats()
+        assert stats["jobs"] == 2
+        assert stats["failures"] == 0
+    finally:
+        block_name = pool._catalog[0].name if pool._catalog else None
+        pool.shutdown()
+
+    # The catalog block goes away with the pool
+    assert block_name is not None
+    assert not os.path.exists(os.path.join("/dev/shm", block_name.lstrip("/")))
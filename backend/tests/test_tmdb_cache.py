@@ -0,0 +1,119 @@
+# backend/tests/test_tmdb_cache.py
+from app.core.tmdb_cache import TMDBCache
+
+
+def test_entry_goes_fresh_then_stale_then_miss(clock):
+    cache = TMDBCache(ttl_seconds=10, max_stale_seconds=60, max_size=10)
+    cache.set(1, "movie")
+
+    assert cache.lookup(1) == ("movie", TMDBCache.FRESH)
+
+    clock[0] += 10
+    assert cache.lookup(1) == ("movie", TMDBCache.STALE)
+    assert cache.stale_count() == 1
+
+    clock[0] += 50
+    assert cache.lookup(1) == (None, TMDBCache.MISS)
+    assert len(cache) == 0
+
+
+def test_unknown_key_is_a_miss():
+    cache = TMDBCache(ttl_seconds=10, max_stale_seconds=60, max_size=10)
+    assert cache.lookup(42) == (None, TMDBCache.MISS)
+    assert cache.version(42) == (None, TMDBCache.MISS)
+    assert 42 not in cache
+
+
+def test_negative_entry_is_cached_but_never_served_stale(clock):
+    cache = TMDBCache(ttl_seconds=10, max_stale_seconds=60, max_size=10)
+    cache.set(404, None, ttl=5)
+
+    # A cached None is a hit (the id is known to 404), distinct from a miss
+    assert cache.lookup(404) == (None, TMDBCache.FRESH)
+    assert cache.version(404)[1] == TMDBCache.FRESH
+    assert 404 not in cache  # __contains__ only reports usable records
+
+    # Negative entries expire at their TTL instead of lingering as stale
+    clock[0] += 5
+    assert cache.lookup(404) == (None, TMDBCache.MISS)
+
+
+def test_negative_entry_honours_explicit_max_stale(clock):
+    cache = TMDBCache(ttl_seconds=10, max_stale_seconds=60, max_size=10)
+    cache.set(404, None, ttl=5, max_stale=20)
+
+    clock[0] += 10
+    assert cache.lookup(404) == (None, TMDBCache.STALE)
+    clock[0] += 10
+    assert cache.lookup(404) == (None, TMDBCache.MISS)
+
+
+def test_lookup_refreshes_lru_position():
+    cache = TMDBCache(ttl_seconds=10, max_stale_seconds=60, max_size=2)
+    cache.set(1, "a")
+    cache.set(2, "b")
+    cache.lookup(1)
+    cache.set(3, "c")
+
+    assert cache.lookup(2) == (None, TMDBCache.MISS)
+    assert cache.lookup(1)[0] == "a"
+    assert cache.lookup(3)[0] == "c"
+
+
+def test_get_does_not_refresh_lru_position():
+    cache = TMDBCache(ttl_seconds=10, max_stale_seconds=60, max_size=2)
+    cache.set(1, "a")
+    cache.set(2, "b")
+    assert cache.get(1) == "a"
+    cache.set(3, "c")
+
+    assert cache.get(1) is None
+    assert cache.get(2) == "b"
+
+
+def test_extend_is_capped_by_stale_bound(clock):
+    cache = TMDBCache(ttl_seconds=10, max_stale_seconds=30, max_size=10)
+    cache.set(1, "a")
+    clock[0] += 15
+    assert cache.lookup(1)[1] == TMDBCache.STALE
+
+    cache.extend(1, 100)
+    assert cache.lookup(1)[1] == TMDBCache.FRESH
+    clock[0] += 15
+    assert cache.lookup(1) == (None, TMDBCache.MISS)
+
+
+def test_version_changes_when_entry_is_replaced(clock):
+    cache = TMDBCache(ttl_seconds=10, max_stale_seconds=60, max_size=10)
+    cache.set(1, "a")
+    first, _ = cache.version(1)
+    clock[0] += 1
+    cache.set(1, "b")
+    assert cache.version(1) == (first + 1, TMDBCache.FRESH)
+
+
+def test_size_bytes_tracks_stores_replacements_and_evictions(clock):
+    cache = TMDBCache(ttl_seconds=10, max_stale_seconds=20, max_size=2, sizeof=len)
+    cache.set(1, "aaaa")
+    cache.set(2, None)  # negative entries hold no record
+    assert cache.size_bytes == 4
+
+    cache.set(1, "aa")
+    assert cache.size_bytes == 2
+
+    cache.set_many([(3, "bbb"), (4, "c")])
+    assert len(cache) == 2
+    assert cache.size_bytes == 4
+
+    clock[0] += 20
+    assert cache.cleanup() == 2
+    assert cache.size_bytes == 0
+
+
+def test_set_many_with_repeated_key_counts_bytes_once():
+    cache = TMDBCache(ttl_seconds=10, max_stale_seconds=20, max_size=10, sizeof=len)
+    cache.set_many([(1, "aaaa"), (1, "bb")])
+
+    assert len(cache) == 1
+    assert cache.get(1) == "bb"
+    assert cache.size_bytes == 2
@@ -0,0 +1,207 @@
+# backend/tests/test_tmdb_client_hedging.py
+import asyncio
+import json
+import time
+from email.utils import formatdate
+
+import pytest
+
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.config import settings
+from app.core.tmdb_client import TMDBClient, _retry_after_seconds
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(settings, "TMDB_HEDGE_ENABLED", True)
+    monkeypatch.setattr(settings, "TMDB_HEDGE_MIN_SAMPLES", 20)
+    monkeypatch.setattr(settings, "TMDB_HEDGE_PERCENTILE", 95)
+    monkeypatch.setattr(settings, "TMDB_HEDGE_MIN_DELAY_MS", 10)
+    monkeypatch.setattr(settings, "TMDB_HEDGE_MAX_DELAY_MS", 2000)
+    return TMDBClient(CircuitBreaker("test"), base_url="http://tmdb.invalid/3", api_key="test")
+
+
+def train(client, latency, samples=20):
+    for _ in range(samples):
+        client._record_latency(latency)
+
+
+def fake_sends(client, *plans):
+    """Replace _send: the n-th call sleeps plans[n][0], then returns or raises plans[n][1]"""
+    calls = []
+
+    async def send(session, url, query):
+        delay, outcome = plans[len(calls)]
+        call = {"cancelled": False}
+        calls.append(call)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            call["cancelled"] = True
+            raise
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    client._send = send
+    return calls
+
+
+def hedged_send(client):
+    return asyncio.run(client._hedged_send(None, "http://tmdb.invalid/3/movie/1", {}))
+
+
+def test_no_hedging_until_trained(client):
+    train(client, 0.03, samples=19)
+    assert client._hedge_delay() is None
+
+    calls = fake_sends(client, (0.05, (200, {"id": 1}, None)))
+    assert hedged_send(client) == (200, {"id": 1}, None)
+    assert len(calls) == 1
+    assert client.hedges == 0
+
+
+def test_no_hedging_when_disabled(client, monkeypatch):
+    train(client, 0.03)
+    monkeypatch.setattr(settings, "TMDB_HEDGE_ENABLED", False)
+    assert client._hedge_delay() is None
+
+
+def test_delay_is_the_clamped_percentile(client, monkeypatch):
+    for latency in range(1, 21):
+        client._record_latency(latency / 100)
+    assert client._hedge_delay() == pytest.approx(0.20)
+
+    # Cached until 20 more samples arrive, then recomputed and clamped
+    monkeypatch.setattr(settings, "TMDB_HEDGE_MAX_DELAY_MS", 100)
+    assert client._hedge_delay() == pytest.approx(0.20)
+    train(client, 0.001)
+    assert client._hedge_delay() == pytest.approx(0.10)
+
+    monkeypatch.setattr(settings, "TMDB_HEDGE_MIN_DELAY_MS", 50)
+    train(client, 0.001, samples=200)
+    assert client._hedge_delay() == pytest.approx(0.05)
+
+
+def test_fast_primary_is_not_hedged(client):
+    train(client, 0.03)
+    calls = fake_sends(client, (0.0, (200, {"id": 1}, None)))
+    assert hedged_send(client)[0] == 200
+    assert len(calls) == 1
+    assert client.hedges == 0
+
+
+def test_slow_primary_is_hedged_and_loser_cancelled(client):
+    train(client, 0.03)
+    calls = fake_sends(client, (1.0, (200, "primary", None)), (0.0, (200, "hedge", None)))
+
+    assert hedged_send(client) == (200, "hedge", None)
+    assert client.hedges == 1
+    assert client.hedge_wins == 1
+    assert calls[0]["cancelled"]
+
+
+def test_primary_can_still_win_after_hedging(client):
+    train(client, 0.03)
+    calls = fake_sends(client, (0.05, (200, "primary", None)), (1.0, (200, "hedge", None)))
+
+    assert hedged_send(client) == (200, "primary", None)
+    assert client.hedges == 1
+    assert client.hedge_wins == 0
+    assert calls[1]["cancelled"]
+
+
+def test_no_hedge_without_a_spare_token(client):
+    train(client, 0.03)
+    client.limiter._tokens = 0
+    client.limiter.rate = 0.001
+    calls = fake_sends(client, (0.1, (200, "primary", None)))
+
+    assert hedged_send(client) == (200, "primary", None)
+    assert len(calls) == 1
+    assert client.hedges == 0
+
+
+def test_failed_copy_falls_back_to_the_other(client):
+    train(client, 0.03)
+    fake_sends(client, (0.05, asyncio.TimeoutError()), (0.1, (200, "hedge", None)))
+    assert hedged_send(client) == (200, "hedge", None)
+
+
+def test_both_copies_failing_raises(client):
+    train(client, 0.03)
+    fake_sends(client, (0.05, asyncio.TimeoutError()), (0.0, ConnectionError("reset")))
+    with pytest.raises((asyncio.TimeoutError, ConnectionError)):
+        hedged_send(client)
+
+
+def request(client):
+    """One _request through the retry loop, closing the session it opens"""
+    async def run():
+        try:
+            return await client._request("/movie/1", None, priority=0, flow=None)
+        finally:
+            if client._session is not None:
+                await client._session.close()
+    return asyncio.run(run())
+
+
+def test_malformed_json_body_counts_as_a_failed_attempt(client):
+    client.max_retries = 1
+    fake_sends(client, (0.0, json.JSONDecodeError("Expecting value", "<html>", 0)))
+
+    assert request(client) == (None, None)
+    stats = client.breaker.get_stats()
+    assert stats["window_calls"] == 1
+    assert stats["window_failure_rate"] == 1.0
+
+
+@pytest.fixture
+def backoffs(monkeypatch):
+    """Record the retry loop's backoff sleeps instead of waiting them out"""
+    delays = []
+
+    async def no_sleep(delay):
+        if delay:
+            delays.append(delay)
+
+    monkeypatch.setattr(asyncio, "sleep", no_sleep)
+    return delays
+
+
+def test_malformed_json_body_is_retried(client, backoffs):
+    client.max_retries = 2
+    fake_sends(client, (0.0, ValueError("bad body")), (0.0, (200, {"id": 1}, None)))
+
+    assert request(client) == (200, {"id": 1})
+    assert client.retries == 1
+    assert backoffs == [0.5]
+
+
+def test_http_date_retry_after_is_honoured(client, backoffs):
+    client.max_retries = 2
+    retry_at = formatdate(time.time() + 3, usegmt=True)
+    fake_sends(client, (0.0, (429, None, retry_at)), (0.0, (200, {"id": 1}, None)))
+
+    assert request(client) == (200, {"id": 1})
+    assert len(backoffs) == 1
+    assert 1 <= backoffs[0] <= 3
+
+
+@pytest.mark.parametrize("retry_after", [None, "", "soon", "Wed, 21 Oct 2015 07:28:00 GMT", "120"])
+def test_rate_limited_response_never_raises(client, retry_after):
+    client.max_retries = 1
+    fake_sends(client, (0.0, (429, None, retry_after)))
+    assert request(client) == (None, None)
+    assert client.breaker.get_stats()["window_failure_rate"] == 1.0
+
+
+def test_retry_after_parsing():
+    assert _retry_after_seconds("3") == 3
+    assert _retry_after_seconds("1.5") == 1.5
+    assert _retry_after_seconds("-4") == 0
+    assert _retry_after_seconds(None) == 2
+    assert _retry_after_seconds("") == 2
+    assert _retry_after_seconds("in a while") == 2
+    assert _retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert 25 <= _retry_after_seconds(formatdate(time.time() + 30, usegmt=True)) <= 30
@@ -0,0 +1,141 @@
+# backend/tests/test_tmdb_import.py
+import gzip
+import json
+import threading
+
+import pandas as pd
+import pytest
+
+from app.core.enhanced_recommender import EnhancedMoodRecommender
+from app.core.tmdb_cache import TMDBCache
+from app.core.tmdb_import import import_tmdb_dump
+
+
+class StubRecommender:
+    """Just the state import_tmdb_dump touches, without loading MovieLens"""
+
+    record_diversity_batch = EnhancedMoodRecommender.record_diversity_batch
+
+    def __init__(self, tmdb_ids):
+        self.movies = pd.DataFrame({"movieId": [100 + i for i in range(len(tmdb_ids))]})
+        self.tmdb_index = {tmdb_id: position for position, tmdb_id in enumerate(tmdb_ids)}
+        self.tmdb_cache = TMDBCache(ttl_seconds=3600, max_stale_seconds=7200, max_size=100)
+        self.similar_cache = TMDBCache(ttl_seconds=3600, max_stale_seconds=7200, max_size=100)
+        self.movie_studios = {}
+        self.movie_countries = {}
+        self.movie_languages = {}
+        self.country_representation = {}
+        self.language_representation = {}
+        self._diversity_lock = threading.Lock()
+
+
+def movie(tmdb_id, country="France", title=None, recommendations=None):
+    data = {
+        "id": tmdb_id,
+        "title": title or f"Movie {tmdb_id}",
+        "poster_path": f"/{tmdb_id}.jpg",
+        "production_countries": [{"name": country}],
+        "spoken_languages": [{"name": "French"}],
+        "production_companies": []
+    }
+    if recommendations is not None:
+        data["recommendations"] = {"results": [{"id": rec_id, "title": f"Movie {rec_id}"} for rec_id in recommendations]}
+    return json.dumps(data)
+
+
+@pytest.fixture
+def write_dump(tmp_path):
+    def write(lines, name="dump.jsonl"):
+        path = tmp_path / name
+        content = "\n".join(lines) + "\n"
+        if name.endswith(".gz"):
+            with gzip.open(path, "wt", encoding="utf-8") as dump:
+                dump.write(content)
+        else:
+            path.write_text(content, encoding="utf-8")
+        return str(path)
+    return write
+
+
+def test_imports_records_and_diversity(write_dump):
+    recommender = StubRecommender([1, 2])
+    stats = import_tmdb_dump(recommender, write_dump([movie(1, recommendations=[2]), movie(2, "Japan")]))
+
+    assert stats["imported"] == 2
+    assert stats["recommendations_imported"] == 1
+    assert stats["diversity_added"] == 2
+    assert recommender.tmdb_cache.get(1).title == "Movie 1"
+    assert [rec.tmdb_id for rec in recommender.similar_cache.get(1)] == [2]
+    assert recommender.movie_countries == {100: ["France"], 101: ["Japan"]}
+    assert recommender.country_representation == {"France": 1, "Japan": 1}
+
+
+def test_skips_incomplete_and_invalid_lines(write_dump):
+    recommender = StubRecommender([1, 2])
+    path = write_dump([
+        movie(1),
+        json.dumps({"id": 2, "original_title": "Export entry only"}),  # daily export line
+        "{not json",
+        json.dumps([1, 2]),
+        json.dumps({"poster_path": "/no-id.jpg"}),
+        "",
+        '{"id": 2, "title": "Trunc'  # file cut off mid-line
+    ])
+    stats = import_tmdb_dump(recommender, path)
+
+    assert stats["lines"] == 3
+    assert stats["incomplete"] == 1
+    assert stats["invalid_lines"] == 4
+    assert stats["imported"] == 1
+    assert 2 not in recommender.tmdb_cache
+
+
+def test_unmatched_movies_are_optional(write_dump):
+    path = write_dump([movie(1), movie(999)])
+
+    recommender = StubRecommender([1])
+    stats = import_tmdb_dump(recommender, path)
+    assert stats["unmatched"] == 1
+    assert stats["imported"] == 1
+    assert 999 not in recommender.tmdb_cache
+
+    recommender = StubRecommender([1])
+    stats = import_tmdb_dump(recommender, path, include_unmatched=True)
+    assert stats["imported"] == 2
+    assert 999 in recommender.tmdb_cache
+    assert stats["diversity_added"] == 1  # only catalog movies feed the diversity maps
+
+
+def test_duplicate_ids_in_one_batch_keep_the_last_line(write_dump):
+    recommender = StubRecommender([1, 2])
+    path = write_dump([
+        movie(1, "France", title="Old", recommendations=[2]),
+        movie(2),
+        movie(1, "Japan", title="New")
+    ])
+    stats = import_tmdb_dump(recommender, path, batch_size=10)
+
+    assert stats["duplicates"] == 1
+    assert stats["imported"] == 2
+    assert stats["diversity_added"] == 2
+    assert recommender.tmdb_cache.get(1).title == "New"
+    # The older line's recommendations page must not outlive the line itself
+    assert recommender.similar_cache.get(1) is None
+    assert recommender.movie_countries[100] == ["Japan"]
+    assert recommender.country_representation == {"France": 1, "Japan": 1}
+
+
+def test_duplicate_ids_across_batches_count_diversity_once(write_dump):
+    recommender = StubRecommender([1, 2, 3])
+    path = write_dump([movie(1), movie(2), movie(3), movie(1)])
+    stats = import_tmdb_dump(recommender, path, batch_size=2)
+
+    assert stats["batches"] == 2
+    assert stats["diversity_added"] == 3
+    assert recommender.country_representation == {"France": 3}
+
+
+def test_reads_gzipped_dumps(write_dump):
+    recommender = StubRecommender([1])
+    stats = import_tmdb_dump(recommender, write_dump([movie(1)], name="dump.jsonl.gz"))
+    assert stats["imported"] == 1